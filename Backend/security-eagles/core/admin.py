@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
-from .models import User
+from .models import StoredFile, User
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -21,3 +21,11 @@ class UserAdmin(BaseUserAdmin):
     autocomplete_fields = ["created_by"]
     readonly_fields = ("created_at", "updated_at")
 
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ("id", "original_name", "content_type", "size", "text_status", "uploaded_by", "created_at")
+    list_filter = ("content_type", "text_status")
+    search_fields = ("original_name", "sha256", "extracted_text")
+    readonly_fields = ("sha256", "file", "size", "content_type", "uploaded_by", "extracted_text", "text_status", "created_at")
@@ -0,0 +1,130 @@
+"""
+Counter columns.
+
+CounterFieldsMixin keeps counters that are maintained with F() updates out
+of ordinary saves. Otherwise saving an instance loaded a while ago would
+write its stale in-memory count over the increments made since.
+
+Hot counters such as download counts are bumped in memory and written in
+batches: every COUNTER_FLUSH_SECONDS (checked on the next increment) a
+background worker issues one ``UPDATE … SET field = field + n`` per
+distinct n. Each process keeps its own buffer and only ever adds to the
+stored value, so several workers can flush without losing counts. Counts
+still buffered when a process exits are written by an atexit hook; a
+killed process loses at most one interval of increments. Subclasses
+override ``write`` for rows keyed by something other than the primary key.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SECONDS = getattr(settings, 'COUNTER_FLUSH_SECONDS', 10)
+
+_executor = None
+_counters = []
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='counter-flush')
+    return _executor
+
+
+class CounterFieldsMixin:
+    """
+    Model mixin: a full save() of an existing row leaves COUNTER_FIELDS alone.
+    Counters are only written by F() updates, or by saves that list them in
+    update_fields explicitly.
+    """
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and not args
+        ):
+            skipped = set(self.COUNTER_FIELDS) | self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped and field.attname not in skipped
+            ]
+        return super().save(*args, **kwargs)
+
+
+class BufferedCounter:
+    """Buffered increments of one integer field, keyed by primary key (or what ``write`` expects)"""
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.last_flush = time.monotonic()
+        _counters.append(self)
+
+    def increment(self, pk, amount=1):
+        with self.lock:
+            self.pending[pk] += amount
+            due = time.monotonic() - self.last_flush >= FLUSH_SECONDS
+            if due:
+                self.last_flush = time.monotonic()
+        if due:
+            get_executor().submit(self._flush_in_worker)
+
+    def flush(self):
+        """Write the buffered increments; returns the number of rows updated"""
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        if not pending:
+            return 0
+
+        by_amount = {}
+        for pk, amount in pending.items():
+            by_amount.setdefault(amount, []).append(pk)
+        batches = list(by_amount.items())
+        updated = 0
+        for position, (amount, pks) in enumerate(batches):
+            try:
+                updated += self.write(pks, amount)
+            except Exception:
+                # Put back what wasn't written so the next flush retries it
+                with self.lock:
+                    for unwritten_amount, unwritten_pks in batches[position:]:
+                        for pk in unwritten_pks:
+                            self.pending[pk] += unwritten_amount
+                raise
+        return updated
+
+    def write(self, pks, amount):
+        """Add `amount` to the field of every row in `pks`; returns the number of rows updated"""
+        return self.model.objects.filter(pk__in=pks).update(**{self.field: F(self.field) + amount})
+
+    def _flush_in_worker(self):
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f"Failed to flush {self.model.__name__}.{self.field} increments")
+        finally:
+            close_old_connections()
+
+
+@atexit.register
+def flush_all():
+    for counter in _counters:
+        try:
+            counter.flush()
+        except Exception:
+            logger.exception(f"Failed to flush {counter.model.__name__}.{counter.field} increments on exit")
@@ -0,0 +1,140 @@
+"""
+Serving stored files as downloads.
+
+``serve_file`` answers a GET/HEAD for a FileField with:
+- a strong ETag built from the file's name, size and modification time, and
+  304 responses to a matching ``If-None-Match``
+- single-range ``Range`` requests (206 / 416), honoured only while an
+  ``If-Range`` validator still matches, so in-browser PDF viewers can fetch
+  the pages they show instead of the whole file
+- offload to the web server when FILE_DOWNLOAD_BACKEND is ``x-sendfile`` or
+  ``x-accel-redirect``; the server then handles ranges itself
+
+Without offload the bytes are streamed from storage in chunks. Storages
+without local paths (e.g. object stores) are answered with a redirect to
+the file's URL.
+"""
+import hashlib
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags
+
+READ_SIZE = 64 * 1024
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(path, stat):
+    digest = hashlib.sha256(f'{path}:{stat.st_size}:{stat.st_mtime_ns}'.encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def parse_range(header, size):
+    """
+    (start, end inclusive) for a single-range header, None to send the whole
+    file (absent, malformed, multi-range, or last byte before first), or
+    False when unsatisfiable (starts past the end of the file).
+    """
+    match = RANGE.match((header or '').strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # Syntactically invalid, so the header is ignored (RFC 9110 14.1.1)
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def starts_download(request, response):
+    """Whether a response begins a download, as opposed to a later range or a revalidation"""
+    if request.method != 'GET':
+        return False
+    if response.has_header('X-Sendfile') or response.has_header('X-Accel-Redirect'):
+        # The web server applies the Range header itself
+        match = RANGE.match(request.headers.get('Range', '').strip())
+        return not match or match.group(1) == '0'
+    if response.status_code in (200, 302):
+        return True
+    return response.status_code == 206 and response['Content-Range'].startswith('bytes 0-')
+
+
+def _read(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = handle.read(min(READ_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def serve_file(request, field_file, filename=None, content_type='application/pdf', inline=True):
+    """Response for downloading `field_file`, or None when the file is missing from storage"""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        return HttpResponseRedirect(field_file.url)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    etag = file_etag(field_file.name, stat)
+    filename = filename or os.path.basename(field_file.name)
+    disposition = 'inline' if inline else 'attachment'
+
+    def with_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Accept-Ranges'] = 'bytes'
+        response['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in client_etags or '*' in client_etags:
+        return with_headers(HttpResponseNotModified())
+
+    backend = getattr(settings, 'FILE_DOWNLOAD_BACKEND', None)
+    if backend in ('x-sendfile', 'x-accel-redirect'):
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-sendfile':
+            response['X-Sendfile'] = path
+        else:
+            prefix = getattr(settings, 'FILE_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(field_file.name)
+        response['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+        return with_headers(response)
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and (not if_range or if_range.strip() == etag):
+        byte_range = parse_range(request.headers['Range'], stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return with_headers(response)
+
+    start, end = byte_range or (0, stat.st_size - 1)
+    length = max(end - start + 1, 0)
+    body = _read(path, start, length) if request.method != 'HEAD' else []
+    response = StreamingHttpResponse(body, status=206 if byte_range else 200, content_type=content_type)
+    response['Content-Length'] = str(length)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Content-Disposition'] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+    return with_headers(response)
@@ -0,0 +1,215 @@
+"""
+Responsive image renditions for uploaded images.
+
+Each registered ImageField gets resized variants (thumbnail/card/full) plus
+WebP copies, generated in a background worker pool after the upload is
+committed. Rendition files are named after the SHA-256 of the source image so
+identical uploads share the same files. The generated paths are stored in a
+JSONField next to the image, so serializers can build a srcset without
+touching storage.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> max width in pixels
+RENDITION_WIDTHS = {
+    'thumbnail': 150,
+    'card': 400,
+    'full': 1600,
+}
+
+RENDITION_DIR = 'renditions'
+
+# (model, image field, renditions field) for every registered image
+REGISTERED_FIELDS = []
+
+_executor = None
+
+
+def get_executor():
+    """Lazily create the shared rendition worker pool"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_RENDITION_WORKERS', 2),
+            thread_name_prefix='image-renditions',
+        )
+    return _executor
+
+
+def _hash_file(field_file):
+    digest = hashlib.sha256()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+    elif fmt == 'WEBP':
+        image.save(buffer, 'WEBP', quality=80, method=4)
+    else:
+        image.save(buffer, fmt, optimize=True)
+    return buffer.getvalue()
+
+
+def _save_once(path, data):
+    """Content-hashed names never change meaning, so an existing file is reused"""
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(data))
+    return path
+
+
+def generate_renditions(field_file):
+    """
+    Build all size variants and WebP copies for an image.
+    Returns the rendition map stored on the model.
+    """
+    content_hash = _hash_file(field_file)
+    prefix = f"{RENDITION_DIR}/{content_hash[:2]}/{content_hash}"
+
+    field_file.open('rb')
+    try:
+        source = Image.open(field_file)
+        source = ImageOps.exif_transpose(source)
+        source.load()
+    finally:
+        field_file.close()
+
+    fmt = 'PNG' if source.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+    ext = 'png' if fmt == 'PNG' else 'jpg'
+    if fmt == 'PNG' and source.mode == 'P':
+        source = source.convert('RGBA')
+
+    variants = {}
+    for name, max_width in RENDITION_WIDTHS.items():
+        image = source
+        if source.width > max_width:
+            height = round(source.height * max_width / source.width)
+            image = source.resize((max_width, height), Image.LANCZOS)
+
+        variants[name] = {
+            'width': image.width,
+            'height': image.height,
+            'src': _save_once(f"{prefix}-{name}.{ext}", _encode(image, fmt)),
+            'webp': _save_once(f"{prefix}-{name}.webp", _encode(image, 'WEBP')),
+        }
+
+    return {
+        'source': field_file.name,
+        'hash': content_hash,
+        'variants': variants,
+    }
+
+
+def process_renditions(model_label, pk, field_name, renditions_field):
+    """Worker entry point: render variants and store the map without re-triggering save signals"""
+    close_old_connections()
+    try:
+        model = apps.get_model(model_label)
+        instance = model.objects.filter(pk=pk).only('pk', field_name).first()
+        if instance is None:
+            return
+        field_file = getattr(instance, field_name)
+        if not field_file:
+            return
+
+        renditions = generate_renditions(field_file)
+        # Only store if the image wasn't replaced while we were working
+        model.objects.filter(pk=pk, **{field_name: field_file.name}).update(**{renditions_field: renditions})
+    except Exception:
+        logger.exception(f"Failed to generate renditions for {model_label} {pk} ({field_name})")
+    finally:
+        close_old_connections()
+
+
+def schedule_renditions(instance, field_name, renditions_field):
+    """Queue rendition generation once the surrounding transaction commits"""
+    model_label = instance._meta.label
+    pk = instance.pk
+    transaction.on_commit(
+        lambda: get_executor().submit(process_renditions, model_label, pk, field_name, renditions_field)
+    )
+
+
+def register_renditions(model, field_name, renditions_field):
+    """Generate renditions whenever a new image is saved to ``model.field_name``"""
+    REGISTERED_FIELDS.append((model, field_name, renditions_field))
+
+    def handler(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw:
+            return
+        if update_fields is not None and field_name not in update_fields:
+            return
+
+        field_file = getattr(instance, field_name)
+        renditions = getattr(instance, renditions_field) or {}
+        if not field_file:
+            if renditions:
+                sender.objects.filter(pk=instance.pk).update(**{renditions_field: {}})
+            return
+        if renditions.get('source') == field_file.name:
+            return
+
+        schedule_renditions(instance, field_name, renditions_field)
+
+    post_save.connect(
+        handler,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"renditions:{model._meta.label}.{field_name}",
+    )
+
+
+def build_srcset(request, renditions, fallback=None):
+    """
+    Serialize a rendition map for API clients.
+    Falls back to the original image while renditions are still being generated.
+    """
+    def absolute(path):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request else url
+
+    variants = (renditions or {}).get('variants')
+    if not variants:
+        if not fallback:
+            return None
+        url = absolute(fallback.name)
+        return {'src': url, 'srcset': '', 'webp_srcset': '', 'sizes': {}}
+
+    ordered = sorted(variants.items(), key=lambda item: item[1]['width'])
+    sizes = {
+        name: {
+            'url': absolute(variant['src']),
+            'webp_url': absolute(variant['webp']),
+            'width': variant['width'],
+            'height': variant['height'],
+        }
+        for name, variant in ordered
+    }
+    # Small sources produce identical widths; srcset descriptors must be unique
+    by_width = {size['width']: size for size in sizes.values()}
+    return {
+        'src': sizes['card']['url'] if 'card' in sizes else sizes[ordered[-1][0]]['url'],
+        'srcset': ', '.join(f"{size['url']} {width}w" for width, size in by_width.items()),
+        'webp_srcset': ', '.join(f"{size['webp_url']} {width}w" for width, size in by_width.items()),
+        'sizes': sizes,
+    }
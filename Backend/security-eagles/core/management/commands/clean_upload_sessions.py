@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import UploadSession
+from core.uploads import discard_partial
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned and finished upload sessions and their temp files (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Age after which sessions are removed')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+        removed = 0
+        for session in stale.filter(status='pending').only('pk').iterator():
+            discard_partial(session)
+            removed += 1
+        deleted, _ = stale.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} upload sessions, removed {removed} partial files'
+        ))
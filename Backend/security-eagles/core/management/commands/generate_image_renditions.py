@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.images import REGISTERED_FIELDS, process_renditions
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive image renditions for existing uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate renditions that are already up to date')
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, field_name, renditions_field in REGISTERED_FIELDS:
+            queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            processed = 0
+            for pk, name, renditions in queryset.values_list('pk', field_name, renditions_field).iterator():
+                if not options['force'] and (renditions or {}).get('source') == name:
+                    continue
+                process_renditions(model._meta.label, pk, field_name, renditions_field)
+                processed += 1
+
+            self.stdout.write(f"  {model._meta.label}.{field_name}: {processed} images processed")
+            total += processed
+
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {total} images'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_pointsreward_remove_user_cv_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_pic_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated size variants and WebP copies'),
+        ),
+    ]
@@ -1,8 +1,13 @@
 
+import uuid
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 
+from .images import register_renditions
+
 
 
 class User(AbstractUser):
@@ -17,6 +22,7 @@ class User(AbstractUser):
 
     cv = models.FileField(upload_to='user_cvs/', blank=True, null=True)
     profile_pic = models.ImageField(upload_to='user_pics/', blank=True, null=True)
+    profile_pic_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     github = models.URLField(blank=True, null=True)
     linkedin = models.URLField(blank=True, null=True)
     portfolio_url = models.URLField(blank=True, null=True)
@@ -162,3 +168,60 @@ class PointsReward(models.Model):
 
     def __str__(self):
         return f"{self.get_activity_type_display()} - {self.points_amount} points"
+
+
+
+class StoredFile(models.Model):
+    """Uploaded document stored once per content hash and shared by every row that uses it"""
+    TEXT_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Extracted'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    ]
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to='files/', max_length=255)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100)
+    original_name = models.CharField(max_length=255, blank=True)
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='stored_files')
+    extracted_text = models.TextField(blank=True, editable=False, help_text="Plain text for search, filled in the background")
+    text_status = models.CharField(max_length=20, choices=TEXT_STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.original_name or self.file.name} ({self.sha256[:12]})"
+
+
+class UploadSession(models.Model):
+    """A chunked upload in progress; chunks are appended to a temp file until completed"""
+    STATUS_CHOICES = [
+        ('pending', 'Receiving chunks'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    received_size = models.PositiveBigIntegerField(default=0)
+    content_type = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    error = models.CharField(max_length=255, blank=True)
+    stored_file = models.ForeignKey(StoredFile, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_sessions')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received_size}/{self.total_size})"
+
+
+register_renditions(User, 'profile_pic', 'profile_pic_renditions')
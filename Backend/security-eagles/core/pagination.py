@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination that can be switched on per request.
+
+Paginators mixing in KeysetPaginationMixin keep their page-number behaviour
+by default. When the request carries ``?cursor=`` (empty for the first page)
+the queryset is ordered by ``cursor_ordering`` and sliced with a WHERE clause
+on the last row seen instead of OFFSET, and no COUNT(*) is issued. The final
+ordering field should be unique (normally ``id``) to break ties.
+
+``?approximate_total=true`` adds the planner's row estimate for the filtered
+queryset, which is cheap but only approximate.
+"""
+import base64
+import json
+import logging
+
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_count(queryset):
+    """Row estimate from the PostgreSQL planner; None when unavailable"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        # .none() or a filter that can never match: known to be empty
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        logger.exception("Could not estimate queryset size")
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPaginationMixin:
+    cursor_query_param = 'cursor'
+    approximate_total_query_param = 'approximate_total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Default keyset ordering; views can override it with a `cursor_ordering` attribute
+    cursor_ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = tuple(getattr(view, 'cursor_ordering', None) or self.cursor_ordering)
+        page_size = self.get_page_size(request)
+
+        self.approximate_total = None
+        if request.query_params.get(self.approximate_total_query_param) == 'true':
+            self.approximate_total = estimate_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(queryset.model, position))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page_rows = rows[:page_size]
+        return self.page_rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        payload = {'next': self.get_next_cursor_link()}
+        if self.approximate_total is not None:
+            payload['approximate_count'] = self.approximate_total
+        payload['results'] = data
+        return Response(payload)
+
+    # Cursor helpers
+    def _field_names(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def encode_cursor(self, obj):
+        values = []
+        for name in self._field_names():
+            value = getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, default=str).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def keyset_filter(self, model, position):
+        """
+        Rows strictly after `position` in the keyset ordering:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for name, raw_value in zip(self.ordering, position):
+            field_name = name.lstrip('-')
+            try:
+                value = model._meta.get_field(field_name).to_python(raw_value)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal_prefix & Q(**{f'{field_name}__{lookup}': value})
+            equal_prefix &= Q(**{field_name: value})
+        return condition
+
+    def get_next_cursor_link(self):
+        if not self.has_next or not self.page_rows:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, getattr(self, 'page_query_param', 'page'))
+        return replace_query_param(url, self.cursor_query_param, force_str(self.encode_cursor(self.page_rows[-1])))
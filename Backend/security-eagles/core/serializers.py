@@ -1,11 +1,14 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from .images import build_srcset
 from .models import PointsTransaction, PointsReward
 
 User = get_user_model()
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_pic_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         #todo : add only the needed fields !!
@@ -22,6 +25,7 @@ class UserSerializer(serializers.ModelSerializer):
             'available_points',
             'cv_url',
             'profile_pic',
+            'profile_pic_srcset',
             'github',
             'linkedin',
             'portfolio_url',
@@ -46,6 +50,9 @@ class UserSerializer(serializers.ModelSerializer):
         user = super().create(validated_data)
         return user
 
+    def get_profile_pic_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.profile_pic_renditions, obj.profile_pic)
+
 
 class PointsTransactionSerializer(serializers.ModelSerializer):
     """Serializer for points transactions"""
@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
@@ -101,6 +102,18 @@ DATABASES = {
 }
 
 
+# Cache
+# Swap for a shared backend (Redis/Memcached) when running several workers,
+# otherwise cached snapshots are invalidated per process only.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'eagles-default',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -169,6 +182,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent  # if not defined already
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Background workers generating responsive image renditions (core/images.py)
+IMAGE_RENDITION_WORKERS = 2
+
+# How far ahead recurring events are expanded into occurrences (events/recurrence.py)
+EVENT_OCCURRENCE_HORIZON_DAYS = 365
+
+# Chunked resume/CV uploads (core/uploads.py)
+UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024
+UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, 'uploads', 'partial')
+TEXT_EXTRACTION_WORKERS = 1
+
+# File downloads (core/downloads.py). Set FILE_DOWNLOAD_BACKEND to 'x-sendfile'
+# (Apache mod_xsendfile) or 'x-accel-redirect' (nginx, with an internal location
+# at FILE_DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT) to let the web server send
+# the bytes; by default Django streams them itself.
+FILE_DOWNLOAD_BACKEND = None
+FILE_DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+# Download counters are buffered in memory and written at most this often (core/counters.py)
+COUNTER_FLUSH_SECONDS = 10
+
 # region cors origin
 ALLOWED_HOSTS = ['*','all']
 
@@ -0,0 +1,117 @@
+"""
+Unique slug allocation.
+
+Instead of probing ``slug``, ``slug-1``, ``slug-2`` ... with one query each,
+all existing ``base`` / ``base-<n>`` slugs are fetched in a single indexed
+prefix query and the next free suffix is picked in Python. Concurrent
+creates can still pick the same slug, so saves retry on IntegrityError with
+a freshly allocated slug.
+
+SlugAllocator does the same for bulk imports: existing slugs for a whole
+batch of titles are fetched together and suffixes are handed out from
+memory, so creating thousands of similarly titled rows costs a handful of
+queries instead of one per collision.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+SAVE_ATTEMPTS = 3
+# Prefix lookups OR'ed together per query when preloading a batch
+PRELOAD_BATCH_SIZE = 100
+
+
+def slug_base(model, value, field_name='slug'):
+    """Slugified value, trimmed so a numeric suffix still fits the column"""
+    max_length = model._meta.get_field(field_name).max_length or 50
+    base = slugify(value) or model._meta.model_name
+    return base[:max_length - 8].rstrip('-')
+
+
+def _suffix(base, slug):
+    """0 for the bare base, n for base-n, None for unrelated slugs sharing the prefix"""
+    if slug == base:
+        return 0
+    match = re.fullmatch(re.escape(base) + r'-(\d+)', slug)
+    return int(match.group(1)) if match else None
+
+
+def _next_slug(base, taken_suffixes):
+    if not taken_suffixes:
+        return base, 0
+    suffix = max(taken_suffixes) + 1
+    return f'{base}-{suffix}', suffix
+
+
+def allocate_slug(model, value, field_name='slug', exclude_pk=None):
+    """Pick a free slug for `value` with a single query"""
+    base = slug_base(model, value, field_name)
+    queryset = model._default_manager.filter(
+        Q(**{field_name: base}) | Q(**{f'{field_name}__startswith': f'{base}-'})
+    )
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    suffixes = [_suffix(base, slug) for slug in queryset.values_list(field_name, flat=True)]
+    return _next_slug(base, [s for s in suffixes if s is not None])[0]
+
+
+def save_with_unique_slug(instance, save, source, *args, slug_field='slug', **kwargs):
+    """
+    Call `save(*args, **kwargs)` (normally the model's super().save), first
+    allocating a slug from `source` when the instance has none, and retrying
+    with a new slug if a concurrent insert took it.
+    """
+    if getattr(instance, slug_field):
+        return save(*args, **kwargs)
+
+    for attempt in range(SAVE_ATTEMPTS):
+        setattr(instance, slug_field, allocate_slug(type(instance), source, slug_field, exclude_pk=instance.pk))
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            if attempt == SAVE_ATTEMPTS - 1:
+                raise
+            setattr(instance, slug_field, '')
+
+
+class SlugAllocator:
+    """Hands out unique slugs for many new rows of one model"""
+
+    def __init__(self, model, field_name='slug'):
+        self.model = model
+        self.field_name = field_name
+        # base -> suffixes in use; a base missing here hasn't been loaded yet
+        self.taken = {}
+
+    def preload(self, values):
+        """Fetch existing slugs for every base in `values` in a few queries"""
+        bases = {slug_base(self.model, value, self.field_name) for value in values} - self.taken.keys()
+        if not bases:
+            return
+        for base in bases:
+            self.taken[base] = set()
+
+        manager = self.model._default_manager
+        ordered = sorted(bases)
+        for start in range(0, len(ordered), PRELOAD_BATCH_SIZE):
+            batch = ordered[start:start + PRELOAD_BATCH_SIZE]
+            condition = Q(**{f'{self.field_name}__in': batch})
+            for base in batch:
+                condition |= Q(**{f'{self.field_name}__startswith': f'{base}-'})
+            for slug in manager.filter(condition).values_list(self.field_name, flat=True):
+                for base in batch:
+                    suffix = _suffix(base, slug)
+                    if suffix is not None:
+                        self.taken[base].add(suffix)
+
+    def allocate(self, value):
+        base = slug_base(self.model, value, self.field_name)
+        if base not in self.taken:
+            self.preload([value])
+        slug, suffix = _next_slug(base, self.taken[base])
+        self.taken[base].add(suffix)
+        return slug
@@ -0,0 +1,33 @@
+"""
+Streaming JSON arrays.
+
+``stream_json_array`` renders a queryset the way ``Response(serializer.data)``
+would for ``many=True``, but one object at a time: rows come from
+``.iterator(chunk_size)`` and each is encoded and sent as soon as it is
+serialized. Memory stays flat and the first bytes go out before the last
+row is read, which matters for endpoints that return whole tables.
+"""
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_CHUNK_SIZE = 200
+
+
+def iter_json_array(queryset, serializer, chunk_size=STREAM_CHUNK_SIZE):
+    """`serializer` is an unbound serializer instance; its to_representation is applied per row"""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield '['
+    separator = ''
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield separator + encoder.encode(serializer.to_representation(instance))
+        separator = ','
+    yield ']'
+
+
+def stream_json_array(queryset, serializer, chunk_size=STREAM_CHUNK_SIZE):
+    response = StreamingHttpResponse(
+        iter_json_array(queryset, serializer, chunk_size), content_type='application/json'
+    )
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,335 @@
+"""
+Chunked, resumable document uploads (resumes and CVs).
+
+A client opens an UploadSession with the file name and size, then sends
+the file in chunks (``Content-Range: bytes start-end/total``). Each chunk
+is streamed onto a temp file, so no request holds a whole document in
+memory and a dropped connection resumes from ``received_size``. The first
+chunk is sniffed, so a file of the wrong type is rejected before the rest
+is sent.
+
+Completing the session hashes the assembled file in one streaming pass and
+stores it under its SHA-256 (``files/ab/abcd….pdf``). If the same content
+was uploaded before, the existing StoredFile is reused, so a CV attached
+to thirty applications is stored once. FileFields such as
+``JobApplication.resume_file`` and ``User.cv`` simply point at the shared
+path. Text is then extracted in a background worker for search.
+"""
+import hashlib
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, transaction
+
+from .models import StoredFile, UploadSession
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_SIZE = getattr(settings, 'UPLOAD_MAX_SIZE', 20 * 1024 * 1024)
+CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+TEMP_DIR = getattr(settings, 'UPLOAD_TEMP_DIR', os.path.join(settings.MEDIA_ROOT, 'uploads', 'partial'))
+STORED_DIR = 'files'
+READ_SIZE = 64 * 1024
+MAX_EXTRACTED_CHARS = 200_000
+
+# Extension -> (content type, leading magic bytes)
+DOCUMENT_TYPES = {
+    '.pdf': ('application/pdf', b'%PDF-'),
+    '.docx': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', b'PK\x03\x04'),
+    '.doc': ('application/msword', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),
+}
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UploadError(Exception):
+    """An upload request that can't be accepted"""
+
+    def __init__(self, detail, status_code=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def partial_path(session):
+    return os.path.join(TEMP_DIR, f'{session.pk}.part')
+
+
+def discard_partial(session):
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def _mark_failed(session, detail):
+    session.status = 'failed'
+    session.error = detail
+    session.save(update_fields=['status', 'error', 'updated_at'])
+
+
+def _raise_if_failed(session):
+    # Called after the transaction that recorded the failure has committed
+    if session.status == 'failed':
+        discard_partial(session)
+        raise UploadError(session.error)
+
+
+def start(user, filename, total_size):
+    """Open an upload session after checking the declared name and size"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in DOCUMENT_TYPES:
+        raise UploadError(f'Unsupported file type. Allowed: {", ".join(sorted(DOCUMENT_TYPES))}')
+    if total_size <= 0:
+        raise UploadError('File is empty.')
+    if total_size > MAX_UPLOAD_SIZE:
+        raise UploadError(f'File is larger than {MAX_UPLOAD_SIZE // (1024 * 1024)} MB.', status_code=413)
+
+    session = UploadSession.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255],
+        total_size=total_size,
+        content_type=DOCUMENT_TYPES[extension][0],
+    )
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    open(partial_path(session), 'wb').close()
+    return session
+
+
+def parse_content_range(header):
+    """(start, end inclusive, total) from 'bytes start-end/total'"""
+    try:
+        unit, _, spec = header.partition(' ')
+        span, _, total = spec.partition('/')
+        start, _, end = span.partition('-')
+        start, end, total = int(start), int(end), int(total)
+    except ValueError:
+        raise UploadError('Content-Range must look like "bytes 0-1048575/5242880".')
+    if unit != 'bytes' or start < 0 or end < start:
+        raise UploadError('Content-Range must look like "bytes 0-1048575/5242880".')
+    return start, end, total
+
+
+def append_chunk(session_id, user, content_range, stream):
+    """
+    Stream one chunk onto the session's temp file.
+    Chunks must arrive in order; a chunk at the wrong offset gets a 409 so
+    the client can resume from the returned ``received_size``.
+    """
+    start_at, end_at, total = parse_content_range(content_range)
+    length = end_at - start_at + 1
+    if length > CHUNK_SIZE:
+        raise UploadError(f'Chunks may be at most {CHUNK_SIZE} bytes.', status_code=413)
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(pk=session_id, user=user).first()
+        if session is None:
+            raise UploadError('Upload not found.', status_code=404)
+        if session.status != 'pending':
+            raise UploadError(f'Upload is {session.status}.', status_code=409)
+        if total != session.total_size or end_at >= session.total_size:
+            raise UploadError('Chunk does not fit the declared file size.')
+        if start_at != session.received_size:
+            raise UploadError(
+                f'Expected a chunk starting at byte {session.received_size}.', status_code=409
+            )
+
+        written = 0
+        with open(partial_path(session), 'r+b') as partial:
+            # Drop bytes left over from a chunk that failed half way
+            partial.truncate(start_at)
+            partial.seek(start_at)
+            head = b''
+            while written < length:
+                data = stream.read(min(READ_SIZE, length - written))
+                if not data:
+                    break
+                if start_at == 0 and len(head) < 16:
+                    head += data[:16]
+                partial.write(data)
+                written += len(data)
+
+            if written != length:
+                partial.truncate(start_at)
+                raise UploadError('Chunk body is shorter than its Content-Range.')
+
+        extension = os.path.splitext(session.filename)[1].lower()
+        if start_at == 0 and not head.startswith(DOCUMENT_TYPES[extension][1]):
+            _mark_failed(session, 'File content does not match its extension.')
+        else:
+            session.received_size = end_at + 1
+            session.save(update_fields=['received_size', 'updated_at'])
+
+    _raise_if_failed(session)
+    return session
+
+
+def _hash_partial(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as partial:
+        for data in iter(lambda: partial.read(READ_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def _check_docx(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return 'word/document.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def complete(session_id, user):
+    """
+    Assemble a fully received upload into a StoredFile, reusing an existing
+    one with the same content. Returns (session, deduplicated).
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(pk=session_id, user=user).first()
+        if session is None:
+            raise UploadError('Upload not found.', status_code=404)
+        if session.status == 'complete':
+            return session, False
+        if session.status != 'pending':
+            raise UploadError(f'Upload is {session.status}.', status_code=409)
+        if session.received_size != session.total_size:
+            raise UploadError(
+                f'Upload is incomplete: {session.received_size} of {session.total_size} bytes received.',
+                status_code=409,
+            )
+
+        path = partial_path(session)
+        extension = os.path.splitext(session.filename)[1].lower()
+        deduplicated = False
+        if extension == '.docx' and not _check_docx(path):
+            _mark_failed(session, 'File is not a valid .docx document.')
+        else:
+            sha256 = _hash_partial(path)
+            stored = StoredFile.objects.filter(sha256=sha256).first()
+            deduplicated = stored is not None
+            if stored is None:
+                stored = _store(path, sha256, extension, session)
+
+            session.status = 'complete'
+            session.stored_file = stored
+            session.save(update_fields=['status', 'stored_file', 'updated_at'])
+
+    _raise_if_failed(session)
+    discard_partial(session)
+    return session, deduplicated
+
+
+def _store(path, sha256, extension, session):
+    name = f'{STORED_DIR}/{sha256[:2]}/{sha256}{extension}'
+    if not default_storage.exists(name):
+        with open(path, 'rb') as partial:
+            name = default_storage.save(name, File(partial))
+    try:
+        with transaction.atomic():
+            stored = StoredFile.objects.create(
+                sha256=sha256,
+                file=name,
+                size=session.total_size,
+                content_type=session.content_type,
+                original_name=session.filename,
+                uploaded_by_id=session.user_id,
+            )
+    except IntegrityError:
+        # Same content finished uploading concurrently
+        return StoredFile.objects.get(sha256=sha256)
+    schedule_text_extraction(stored)
+    return stored
+
+
+def completed_file(session_id, user):
+    """The StoredFile of one of the user's completed uploads, or None"""
+    session = UploadSession.objects.filter(
+        pk=session_id, user=user, status='complete'
+    ).select_related('stored_file').first()
+    return session.stored_file if session else None
+
+
+# Text extraction
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'TEXT_EXTRACTION_WORKERS', 1),
+            thread_name_prefix='text-extraction',
+        )
+    return _executor
+
+
+def _docx_text(handle):
+    with zipfile.ZipFile(handle) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+def _pdf_text(handle):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    pages = []
+    length = 0
+    for page in PdfReader(handle).pages:
+        text = page.extract_text() or ''
+        pages.append(text)
+        length += len(text)
+        if length >= MAX_EXTRACTED_CHARS:
+            break
+    return '\n'.join(pages)
+
+
+def extract_text(stored):
+    """Plain text of a stored document, or None when its type can't be read"""
+    with stored.file.open('rb') as handle:
+        if stored.content_type == DOCUMENT_TYPES['.docx'][0]:
+            return _docx_text(handle)
+        if stored.content_type == DOCUMENT_TYPES['.pdf'][0]:
+            return _pdf_text(handle)
+    return None
+
+
+def process_text_extraction(pk):
+    """Worker entry point"""
+    close_old_connections()
+    try:
+        stored = StoredFile.objects.filter(pk=pk).first()
+        if stored is None:
+            return
+        try:
+            text = extract_text(stored)
+        except Exception:
+            logger.exception(f"Failed to extract text from stored file {pk}")
+            StoredFile.objects.filter(pk=pk).update(text_status='failed')
+            return
+        if text is None:
+            StoredFile.objects.filter(pk=pk).update(text_status='unsupported')
+        else:
+            StoredFile.objects.filter(pk=pk).update(
+                extracted_text=text[:MAX_EXTRACTED_CHARS].replace('\x00', ''), text_status='done'
+            )
+    finally:
+        close_old_connections()
+
+
+def schedule_text_extraction(stored):
+    """Queue text extraction once the surrounding transaction commits"""
+    pk = stored.pk
+    transaction.on_commit(lambda: get_executor().submit(process_text_extraction, pk))
@@ -1,8 +1,8 @@
 # events/admin.py
 from django.contrib import admin
 from django.utils.html import format_html
-from django.utils import timezone
-from .models import Event, EventImage, EventCategory, EventRegistration, EventView
+from .bulk import bulk_archive, bulk_publish
+from .models import Event, EventImage, EventCategory, EventRegistration, EventView, EventOccurrence
 
 class EventImageInline(admin.TabularInline):
     model = EventImage
@@ -68,7 +68,7 @@ class EventAdmin(admin.ModelAdmin):
         ('Registration', {
             'fields': (
                 'max_attendees', 'registration_required', 'registration_deadline',
-                'registration_url', 'attendee_count', 'registration_open', 'spots_remaining'
+                'registration_url', 'waitlist_enabled', 'attendee_count', 'registration_open', 'spots_remaining'
             )
         }),
         ('Organizer Information', {
@@ -115,15 +115,12 @@ class EventAdmin(admin.ModelAdmin):
     attendee_count.short_description = "Attendees"
 
     def publish_events(self, request, queryset):
-        updated = queryset.filter(status__in=['draft', 'review']).update(
-            status='published',
-            published_at=timezone.now()
-        )
+        updated = bulk_publish(queryset)
         self.message_user(request, f'{updated} events published successfully.')
     publish_events.short_description = "Publish selected events"
 
     def archive_events(self, request, queryset):
-        updated = queryset.update(status='archived')
+        updated = bulk_archive(queryset)
         self.message_user(request, f'{updated} events archived successfully.')
     archive_events.short_description = "Archive selected events"
 
@@ -139,10 +136,11 @@ class EventAdmin(admin.ModelAdmin):
 
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
-    list_display = ['user', 'event', 'is_canceled', 'created_at']
-    list_filter = ['is_canceled', 'created_at', 'event__category']
+    list_display = ['user', 'event', 'is_canceled', 'is_waitlisted', 'created_at']
+    list_filter = ['is_canceled', 'is_waitlisted', 'created_at', 'event__category']
     search_fields = ['user__username', 'event__title']
-    readonly_fields = ['created_at', 'updated_at']
+    # Status changes go through events.registration so seat counters stay correct
+    readonly_fields = ['is_canceled', 'is_waitlisted', 'promoted_at', 'created_at', 'updated_at']
 
 @admin.register(EventView)
 class EventViewAdmin(admin.ModelAdmin):
@@ -150,3 +148,13 @@ class EventViewAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['event__title', 'user__username', 'ip_address']
     readonly_fields = ['created_at']
+
+@admin.register(EventOccurrence)
+class EventOccurrenceAdmin(admin.ModelAdmin):
+    list_display = ['event', 'start_time', 'end_time']
+    list_filter = ['start_time']
+    search_fields = ['event__title']
+    readonly_fields = ['event', 'start_time', 'end_time', 'created_at']
+
+    def has_add_permission(self, request):
+        return False  # Occurrences are generated from the event's recurrence settings
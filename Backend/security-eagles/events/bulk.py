@@ -0,0 +1,216 @@
+"""
+Bulk event import, publish and archive.
+
+An import validates every row up front and reports errors per row, then
+creates the valid events with a few set-based queries:
+- slugs for the whole batch come from one SlugAllocator preload
+- events and images are inserted with ``bulk_create``
+- search vectors are filled with a single UPDATE
+- occurrences are expanded in memory and bulk inserted
+
+Publishing and archiving many events are single UPDATE statements.
+"""
+import csv
+import io
+import json
+import logging
+import posixpath
+from urllib.parse import urlparse
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+
+from core.images import schedule_renditions
+from core.slugs import SlugAllocator
+
+from .models import Event, EventCategory, EventImage, EventOccurrence
+from .recurrence import expand_occurrences
+from .search import update_search_vector
+from .serializers import EventCreateUpdateSerializer
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+# Static part of EventImage.image's upload_to ('events/images/%Y/%m/')
+IMAGE_PREFIX = EventImage._meta.get_field('image').upload_to.split('%')[0]
+
+# CSV cells holding several values separated by commas
+CSV_LIST_FIELDS = ('tags', 'platforms', 'images')
+CSV_JSON_FIELDS = ('platform_urls',)
+
+
+class EventImportSerializer(EventCreateUpdateSerializer):
+    """
+    One import row. Categories are given by slug and resolved from a map in
+    the serializer context, so validating a batch doesn't query per row.
+    """
+    category = serializers.CharField(required=False, allow_blank=True)
+    images = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+    class Meta(EventCreateUpdateSerializer.Meta):
+        fields = EventCreateUpdateSerializer.Meta.fields + ['images']
+
+    def validate_category(self, value):
+        if not value:
+            return None
+        category = self.context['categories'].get(value.strip().lower())
+        if category is None:
+            raise serializers.ValidationError(f'Unknown category "{value}"')
+        return category
+
+
+def parse_rows(content, fmt):
+    """Rows from a CSV or JSON document (a list of objects, or {"events": [...]})"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    if fmt == 'json':
+        data = json.loads(content)
+        if isinstance(data, dict):
+            data = data.get('events', [])
+        if not isinstance(data, list):
+            raise ValueError('Expected a list of events')
+        return data
+
+    rows = []
+    for row in csv.DictReader(io.StringIO(content)):
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        for field in CSV_LIST_FIELDS:
+            if field in row:
+                row[field] = [item.strip() for item in row[field].split(',') if item.strip()]
+        for field in CSV_JSON_FIELDS:
+            if row.get(field):
+                try:
+                    row[field] = json.loads(row[field])
+                except ValueError:
+                    pass  # left for the serializer to reject
+        # Empty cells mean "not given", so model defaults apply
+        rows.append({key: value for key, value in row.items() if value not in ('', [])})
+    return rows
+
+
+def _image_path(source):
+    """
+    Storage path for an image given as an existing media path under
+    EventImage's upload directory. Images are not downloaded from URLs, so an
+    import can't make the server fetch arbitrary (e.g. internal) addresses.
+    Raises ValueError with a message for the row's errors.
+    """
+    if urlparse(source).scheme:
+        raise ValueError(f'Images must be media paths, not URLs: {source}')
+    path = posixpath.normpath(source.strip().lstrip('/'))
+    if not path.startswith(IMAGE_PREFIX) or not path.lower().endswith(IMAGE_EXTENSIONS):
+        raise ValueError(f'Images must be stored under {IMAGE_PREFIX}: {source}')
+    try:
+        exists = default_storage.exists(path)
+    except SuspiciousFileOperation:
+        exists = False
+    if not exists:
+        raise ValueError(f'Image not found: {source}')
+    return path
+
+
+def import_events(rows, user, dry_run=False, atomic=False):
+    """
+    Validate and create events from parsed rows.
+    Returns {'created': [...], 'errors': [...]}; rows are numbered from 1.
+    With `atomic`, nothing is created if any row fails.
+    """
+    categories = {}
+    for category in EventCategory.objects.filter(is_active=True):
+        categories[category.slug.lower()] = category
+        categories[category.name.lower()] = category
+
+    valid = []
+    errors = []
+    for number, row in enumerate(rows, start=1):
+        serializer = EventImportSerializer(data=row, context={'categories': categories})
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({'row': number, 'errors': serializer.errors})
+
+    if dry_run or (atomic and errors):
+        return {'created': [], 'errors': errors, 'valid_rows': len(valid)}
+
+    prepared = []
+    for number, data in valid:
+        data = dict(data)
+        try:
+            image_paths = [_image_path(source) for source in data.pop('images', [])]
+        except ValueError as exc:
+            errors.append({'row': number, 'errors': {'images': [str(exc)]}})
+            continue
+        prepared.append((number, data, image_paths))
+
+    if atomic and errors:
+        return {'created': [], 'errors': errors, 'valid_rows': len(prepared)}
+
+    created = _create_events(prepared, user)
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'errors': errors, 'valid_rows': len(prepared)}
+
+
+def _create_events(prepared, user):
+    now = timezone.now()
+    allocator = SlugAllocator(Event)
+    allocator.preload(data['title'] for _, data, _ in prepared)
+
+    events = []
+    for number, data, _ in prepared:
+        event = Event(created_by=user, **data)
+        event.slug = allocator.allocate(event.title)
+        if event.status == 'published' and not event.published_at:
+            event.published_at = now
+        events.append(event)
+
+    with transaction.atomic():
+        Event.objects.bulk_create(events, batch_size=BATCH_SIZE)
+        ids = [event.pk for event in events]
+
+        # bulk_create skips save() and post_save, so derived data is filled in here
+        update_search_vector(Event.objects.filter(pk__in=ids))
+        EventOccurrence.objects.bulk_create(
+            [
+                EventOccurrence(event=event, start_time=start, end_time=end)
+                for event in events
+                for start, end in expand_occurrences(event)
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+        images = [
+            EventImage(event=event, image=path, is_featured=(position == 0), order=position)
+            for event, (_, _, paths) in zip(events, prepared)
+            for position, path in enumerate(paths)
+        ]
+        EventImage.objects.bulk_create(images, batch_size=BATCH_SIZE)
+        for image in images:
+            schedule_renditions(image, 'image', 'image_renditions')
+
+    return [
+        {'row': number, 'id': event.pk, 'slug': event.slug}
+        for (number, _, _), event in zip(prepared, events)
+    ]
+
+
+def bulk_publish(queryset):
+    """Publish drafts and events under review in one UPDATE; returns the count"""
+    now = timezone.now()
+    return queryset.filter(status__in=['draft', 'review']).update(
+        status='published',
+        published_at=Coalesce(F('published_at'), now),
+        updated_at=now,
+    )
+
+
+def bulk_archive(queryset):
+    """Archive events in one UPDATE; returns the count"""
+    return queryset.exclude(status='archived').update(status='archived', updated_at=timezone.now())
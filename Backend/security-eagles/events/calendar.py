@@ -0,0 +1,174 @@
+"""
+iCalendar (RFC 5545) feeds for events.
+
+Feeds are rendered from EventOccurrence rows, so recurring events appear as
+one VEVENT per materialized repetition. Rows are read with ``.iterator()``
+and written out one VEVENT at a time, which keeps memory flat for large
+feeds. Each feed also has a cheap fingerprint query (max ``updated_at`` and
+row count) used as its ETag, so polling clients get a 304 without the feed
+being rendered.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Event, EventOccurrence, EventRegistration
+
+PRODID = '-//Security Eagles//Events//EN'
+UID_DOMAIN = 'events.security-eagles'
+# Occurrences that ended longer ago than this are left out of feeds
+FEED_PAST_DAYS = 90
+FEED_TOKEN_SALT = 'events.calendar.registrations'
+
+
+def escape_text(value):
+    """Escape a TEXT property value"""
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line to 75 octets, without splitting UTF-8 sequences"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Step back to the start of a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def published_feed_occurrences():
+    """Occurrences of listed events within the feed window"""
+    return EventOccurrence.objects.filter(
+        event__status='published',
+        event__is_active=True,
+        end_time__gte=timezone.now() - timedelta(days=FEED_PAST_DAYS),
+    )
+
+
+def render_event(occurrence, status='CONFIRMED'):
+    event = occurrence.event
+    categories = [event.category.name] if event.category else []
+    categories += event.tags or []
+    location = event.location if event.is_physical else ', '.join(event.platforms or [])
+
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{event.pk}-{format_datetime(occurrence.start_time)}@{UID_DOMAIN}',
+        f'DTSTAMP:{format_datetime(event.updated_at)}',
+        f'LAST-MODIFIED:{format_datetime(event.updated_at)}',
+        f'DTSTART:{format_datetime(occurrence.start_time)}',
+        f'DTEND:{format_datetime(occurrence.end_time)}',
+        f'SUMMARY:{escape_text(event.title)}',
+        f'DESCRIPTION:{escape_text(event.description)}',
+        f'STATUS:{status}',
+    ]
+    if location:
+        lines.append(f'LOCATION:{escape_text(location)}')
+    if categories:
+        lines.append('CATEGORIES:' + ','.join(escape_text(name) for name in categories))
+    if event.organizer_email:
+        organizer = event.organizer.replace('"', '')
+        lines.append(f'ORGANIZER;CN="{organizer}":mailto:{event.organizer_email}')
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+def stream_calendar(occurrences, name, statuses=None, chunk_size=500):
+    """
+    Yield the calendar piece by piece.
+    `statuses` optionally maps event id -> VEVENT STATUS (defaults to CONFIRMED).
+    """
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+    ]
+    yield ''.join(fold(line) for line in header)
+
+    queryset = occurrences.select_related('event', 'event__category').order_by('start_time', 'id')
+    for occurrence in queryset.iterator(chunk_size=chunk_size):
+        status = statuses.get(occurrence.event_id, 'CONFIRMED') if statuses else 'CONFIRMED'
+        yield render_event(occurrence, status)
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def make_etag(*parts):
+    # The date is part of every fingerprint so the past-occurrence window rolls daily
+    fingerprint = ':'.join(str(part) for part in (*parts, timezone.localdate()))
+    return '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+
+
+def feed_etag(scope, events):
+    """
+    Strong ETag from the newest change and the row count of the feed's events.
+    The count catches events leaving the feed.
+    """
+    state = events.aggregate(last_modified=Max('updated_at'), total=Count('id'))
+    return make_etag(scope, state['last_modified'], state['total'])
+
+
+def listed_events():
+    return Event.objects.filter(status='published', is_active=True)
+
+
+# Per-user feeds are fetched by calendar clients that can't send a JWT, so
+# the URL carries a signed user id instead.
+def make_feed_token(user):
+    return signing.dumps(user.pk, salt=FEED_TOKEN_SALT)
+
+
+def read_feed_token(token):
+    """User id from a feed token, or None if it was tampered with"""
+    try:
+        return signing.loads(token, salt=FEED_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+
+
+def registration_statuses(user_id):
+    """Event id -> VEVENT STATUS for the user's active registrations"""
+    return {
+        event_id: 'TENTATIVE' if waitlisted else 'CONFIRMED'
+        for event_id, waitlisted in EventRegistration.objects.filter(
+            user_id=user_id, is_canceled=False
+        ).values_list('event_id', 'is_waitlisted')
+    }
+
+
+def registration_feed_etag(user_id):
+    registrations = EventRegistration.objects.filter(user_id=user_id, is_canceled=False)
+    state = registrations.aggregate(
+        last_registration=Max('updated_at'),
+        last_event=Max('event__updated_at'),
+        total=Count('id'),
+    )
+    return make_etag(
+        f'registrations:{user_id}', state['last_registration'], state['last_event'], state['total']
+    )
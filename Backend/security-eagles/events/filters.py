@@ -1,7 +1,14 @@
 # events/filters.py
 import django_filters
+from datetime import timedelta
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
-from .models import Event, EventCategory
+from .models import Event, EventCategory, EventOccurrence
+
+
+def has_occurrence(**lookups):
+    """Events with at least one occurrence matching the lookups (index range scan)"""
+    return Exists(EventOccurrence.objects.filter(event=OuterRef('pk'), **lookups))
 
 class EventFilter(django_filters.FilterSet):
     """Filter for events with various criteria"""
@@ -109,50 +116,49 @@ class EventFilter(django_filters.FilterSet):
             )
         return queryset
 
+    # Time-based filters match on occurrences, so recurring events are included
+    # whenever any of their repetitions falls in the window
     def filter_upcoming(self, queryset, name, value):
         if value:
             now = timezone.now()
-            return queryset.filter(start_time__gt=now)
+            return queryset.filter(has_occurrence(start_time__gt=now))
         return queryset
 
     def filter_ongoing(self, queryset, name, value):
         if value:
             now = timezone.now()
-            return queryset.filter(
-                start_time__lte=now,
-                end_time__gte=now
-            )
+            return queryset.filter(has_occurrence(start_time__lte=now, end_time__gte=now))
         return queryset
 
     def filter_past(self, queryset, name, value):
         if value:
             now = timezone.now()
-            return queryset.filter(end_time__lt=now)
+            return queryset.filter(has_occurrence(end_time__lt=now))
         return queryset
 
     def filter_this_week(self, queryset, name, value):
         if value:
-            now = timezone.now()
-            start_of_week = now - timezone.timedelta(days=now.weekday())
-            end_of_week = start_of_week + timezone.timedelta(days=6)
-            return queryset.filter(
+            today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            start_of_week = today - timedelta(days=today.weekday())
+            end_of_week = start_of_week + timedelta(days=7)
+            return queryset.filter(has_occurrence(
                 start_time__gte=start_of_week,
-                start_time__lte=end_of_week
-            )
+                start_time__lt=end_of_week
+            ))
         return queryset
 
     def filter_this_month(self, queryset, name, value):
         if value:
-            now = timezone.now()
-            start_of_month = now.replace(day=1)
+            now = timezone.localtime()
+            start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             if now.month == 12:
-                end_of_month = now.replace(year=now.year + 1, month=1, day=1)
+                end_of_month = start_of_month.replace(year=now.year + 1, month=1)
             else:
-                end_of_month = now.replace(month=now.month + 1, day=1)
-            return queryset.filter(
+                end_of_month = start_of_month.replace(month=now.month + 1)
+            return queryset.filter(has_occurrence(
                 start_time__gte=start_of_month,
                 start_time__lt=end_of_month
-            )
+            ))
         return queryset
 
     def filter_tags(self, queryset, name, value):
@@ -161,7 +167,9 @@ class EventFilter(django_filters.FilterSet):
             return queryset.filter(tags__overlap=tags)
         return queryset
 
+    # Array lookups use the GIN indexes on tags/platforms
     def filter_platform(self, queryset, name, value):
         if value:
-            return queryset.filter(platforms__icontains=value)
+            platforms = [platform.strip() for platform in value.split(',')]
+            return queryset.filter(platforms__overlap=platforms)
         return queryset
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event
+from events.recurrence import extend_horizon
+
+
+class Command(BaseCommand):
+    help = 'Materialize event occurrences up to the rolling horizon (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-sync every event, including one-off and finished ones (initial backfill)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Event.objects.order_by('id') if options['all'] else None
+        created, deleted = extend_horizon(queryset)
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} occurrences, removed {deleted} stale occurrences'
+        ))
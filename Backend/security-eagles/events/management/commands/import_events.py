@@ -0,0 +1,41 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from events.bulk import import_events, parse_rows
+
+
+class Command(BaseCommand):
+    help = 'Import events from a CSV or JSON file (e.g. a conference agenda)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file; the format is taken from the extension')
+        parser.add_argument('--user', required=True, help='Username recorded as the creator of the events')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, create nothing')
+        parser.add_argument('--atomic', action='store_true', help='Create nothing if any row is invalid')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        fmt = 'json' if options['path'].lower().endswith('.json') else 'csv'
+        try:
+            with open(options['path'], 'rb') as handle:
+                rows = parse_rows(handle.read(), fmt)
+        except (OSError, ValueError, UnicodeDecodeError) as exc:
+            raise CommandError(f'Could not read {options["path"]}: {exc}')
+
+        result = import_events(rows, user, dry_run=options['dry_run'], atomic=options['atomic'])
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'], default=str)}")
+
+        if options['dry_run']:
+            message = f"{result['valid_rows']} of {len(rows)} rows are valid"
+        else:
+            message = f"Created {len(result['created'])} events, {len(result['errors'])} rows failed"
+        style = self.style.SUCCESS if not result['errors'] else self.style.WARNING
+        self.stdout.write(style(message))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event
+from events.registration import promote_waitlist, recount_registrations
+
+
+class Command(BaseCommand):
+    help = 'Recompute event seat counters from registrations and fill freed seats from waitlists'
+
+    def handle(self, *args, **options):
+        fixed = recount_registrations()
+        promoted = 0
+        waiting = Event.objects.filter(
+            waitlist_enabled=True,
+            registrations__is_waitlisted=True,
+            registrations__is_canceled=False,
+        ).values_list('id', flat=True).distinct()
+        for event_id in waiting:
+            promoted += len(promote_waitlist(event_id))
+        self.stdout.write(self.style.SUCCESS(
+            f'Corrected {fixed} event counters, promoted {promoted} waitlisted registrations'
+        ))
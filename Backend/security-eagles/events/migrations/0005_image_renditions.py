@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_auto_20250706_1433'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventimage',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated size variants and WebP copies'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:36
+
+import calendar
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of events.recurrence as of this migration, so later changes
+# there can't alter what the backfill does on a fresh database.
+
+
+def _add_months(value, months):
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def _nth_start(start, recurrence_type, step):
+    if recurrence_type == 'daily':
+        return start + timedelta(days=step)
+    if recurrence_type == 'weekly':
+        return start + timedelta(weeks=step)
+    if recurrence_type == 'monthly':
+        return _add_months(start, step)
+    return _add_months(start, 12 * step)
+
+
+def _expand(event, horizon):
+    if not event.start_time or not event.end_time:
+        return
+    if not event.is_recurring or event.recurrence_type not in ('daily', 'weekly', 'monthly', 'yearly'):
+        yield event.start_time, event.end_time
+        return
+
+    until = horizon
+    if event.recurrence_end_date and event.recurrence_end_date < until:
+        until = event.recurrence_end_date
+    duration = event.end_time - event.start_time
+    interval = max(1, event.recurrence_interval or 1)
+    count = 0
+    start = event.start_time
+    while start <= until:
+        yield start, start + duration
+        count += interval
+        start = _nth_start(event.start_time, event.recurrence_type, count)
+
+
+def backfill_occurrences(apps, schema_editor):
+    """Expand every existing event up to the current horizon"""
+    Event = apps.get_model('events', 'Event')
+    EventOccurrence = apps.get_model('events', 'EventOccurrence')
+    horizon = timezone.now() + timedelta(days=getattr(settings, 'EVENT_OCCURRENCE_HORIZON_DAYS', 365))
+    batch = []
+    for event in Event.objects.order_by('id').iterator(chunk_size=200):
+        batch.extend(
+            EventOccurrence(event_id=event.pk, start_time=start, end_time=end)
+            for start, end in _expand(event, horizon)
+        )
+        if len(batch) >= 500:
+            EventOccurrence.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    EventOccurrence.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='events.event')),
+            ],
+            options={
+                'ordering': ['start_time'],
+                'indexes': [models.Index(fields=['start_time', 'event'], name='events_even_start_t_63d220_idx'), models.Index(fields=['end_time', 'event'], name='events_even_end_tim_02793a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'start_time'), name='unique_event_occurrence_start')],
+            },
+        ),
+        migrations.RunPython(backfill_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_registrations(apps, schema_editor):
+    """Seed seat counters from existing non-canceled registrations"""
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+
+    registrations = EventRegistration.objects.filter(
+        event=OuterRef('pk'), is_canceled=False
+    ).order_by().values('event').annotate(total=Count('id')).values('total')
+    Event.objects.update(active_registrations=Coalesce(Subquery(registrations), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_eventoccurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='active_registrations',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_enabled',
+            field=models.BooleanField(default=True, help_text='Queue registrations once the event is full'),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='is_waitlisted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='promoted_at',
+            field=models.DateTimeField(blank=True, help_text='When the registration left the waitlist', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(condition=models.Q(('is_canceled', False), ('is_waitlisted', True)), fields=['event', 'created_at'], name='event_reg_waitlist_idx'),
+        ),
+        migrations.RunPython(backfill_active_registrations, migrations.RunPython.noop),
+    ]
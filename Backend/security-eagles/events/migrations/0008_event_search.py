@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:44
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+
+def backfill_search_vectors(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    Event.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector(tags, weight='B', config='english')
+        + SearchVector('organizer', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+        + SearchVector('long_description', weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_registration_capacity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_even_tags_80dee6_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='event_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['platforms'], name='event_platforms_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_gin'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,27 @@
 # events/models.py
-from django.db import models
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
 from datetime import timedelta
 import uuid
 
+from core.counters import CounterFieldsMixin
+from core.images import register_renditions
+from core.slugs import save_with_unique_slug
+
+class EventCategoryQuerySet(models.QuerySet):
+
+    def with_event_count(self):
+        return self.annotate(
+            published_event_count=Count('events', filter=Q(events__status='published', events__is_active=True))
+        )
+
 class EventCategory(models.Model):
     """Categories for organizing events"""
     name = models.CharField(max_length=100, unique=True)
@@ -17,6 +32,8 @@ class EventCategory(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = EventCategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Event Categories"
         ordering = ['name']
@@ -31,9 +48,46 @@ class EventCategory(models.Model):
 
     @property
     def event_count(self):
+        # Listing views annotate this (EventCategoryQuerySet.with_event_count)
+        annotated = getattr(self, 'published_event_count', None)
+        if annotated is not None:
+            return annotated
         return self.events.filter(status='published', is_active=True).count()
 
-class Event(models.Model):
+def active_registration_count(event_ref):
+    """Subquery counting confirmed (not canceled, not waitlisted) registrations for the event at `event_ref`"""
+    registrations = EventRegistration.objects.filter(
+        event=OuterRef(event_ref), is_canceled=False, is_waitlisted=False
+    ).order_by().values('event').annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(registrations), 0)
+
+def listing_images_prefetch(lookup='images'):
+    """Images ordered with the featured image first, stored as `listing_images`"""
+    return models.Prefetch(
+        lookup,
+        queryset=EventImage.objects.order_by('-is_featured', 'order', 'created_at'),
+        to_attr='listing_images',
+    )
+
+class EventQuerySet(models.QuerySet):
+    """Query helpers for event listings"""
+
+    def for_listing(self):
+        """
+        Prefetch images ordered with the featured image first, so preview
+        serializers run no per-event queries (attendee_count is a stored counter).
+        """
+        return self.select_related('category', 'created_by').prefetch_related(listing_images_prefetch())
+
+class EventOccurrenceQuerySet(models.QuerySet):
+
+    def for_listing(self):
+        """Same as EventQuerySet.for_listing, applied to each occurrence's event"""
+        return self.select_related(
+            'event', 'event__category', 'event__created_by'
+        ).prefetch_related(listing_images_prefetch('event__images'))
+
+class Event(CounterFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
         ('review', 'Under Review'),
@@ -111,6 +165,9 @@ class Event(models.Model):
     registration_required = models.BooleanField(default=False)
     registration_deadline = models.DateTimeField(blank=True, null=True)
     registration_url = models.URLField(blank=True, help_text="External registration URL")
+    waitlist_enabled = models.BooleanField(default=True, help_text="Queue registrations once the event is full")
+    # Maintained by events.registration; only ever changed with conditional UPDATEs
+    active_registrations = models.PositiveIntegerField(default=0, editable=False)
 
     # Organizer Information
     organizer = models.CharField(max_length=255)
@@ -131,31 +188,33 @@ class Event(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='events')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Weighted full-text document, maintained by events.search
+    search_vector = SearchVectorField(null=True, editable=False)
     published_at = models.DateTimeField(blank=True, null=True)
 
+    objects = EventQuerySet.as_manager()
+
+    # Written only by F() updates (events.registration, record_view)
+    COUNTER_FIELDS = ('active_registrations', 'views')
+
     class Meta:
         ordering = ['-start_time']
         indexes = [
             models.Index(fields=['status', 'start_time']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['is_featured', 'status']),
-            models.Index(fields=['tags']),
+            GinIndex(fields=['tags'], name='event_tags_gin'),
+            GinIndex(fields=['platforms'], name='event_platforms_gin'),
+            GinIndex(fields=['search_vector'], name='event_search_vector_gin'),
         ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while Event.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
 
-        super().save(*args, **kwargs)
+        # Allocates a unique slug from the title when none is set
+        save_with_unique_slug(self, super().save, self.title, *args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -164,54 +223,66 @@ class Event(models.Model):
     def is_highlighted(self):
         return self.in_lights_date is not None
 
+    def timing(self, now=None):
+        """
+        Time-based status flags evaluated against a single `now`.
+        Serializers pass one `now` per request instead of calling timezone.now() per field.
+        """
+        now = now or timezone.now()
+        published = self.status == 'published'
+        has_times = bool(self.start_time and self.end_time)
+
+        is_upcoming = bool(self.start_time) and now < self.start_time and published
+        is_ongoing = has_times and self.start_time <= now <= self.end_time and published
+        is_passed = bool(self.end_time) and now > self.end_time and published
+
+        if not published or not has_times:
+            status_display = self.get_status_display()
+        elif now < self.start_time:
+            status_display = 'Upcoming'
+        elif now <= self.end_time:
+            status_display = 'Ongoing'
+        else:
+            status_display = 'Passed'
+
+        registration_open = False
+        if self.registration_required:
+            registration_open = is_upcoming
+            if self.registration_deadline:
+                registration_open = is_upcoming and now < self.registration_deadline
+
+        return {
+            'status_display': status_display,
+            'is_upcoming': is_upcoming,
+            'is_ongoing': is_ongoing,
+            'is_passed': is_passed,
+            'registration_open': registration_open,
+        }
+
     @property
     def status_display(self):
         """Get human-readable status with timing info"""
-        if self.status != 'published':
-            return self.get_status_display()
-
-        if not self.start_time or not self.end_time:
-            return self.get_status_display()
-
-        now = timezone.now()
-        if now < self.start_time:
-            return 'Upcoming'
-        elif self.start_time <= now <= self.end_time:
-            return 'Ongoing'
-        else:
-            return 'Passed'
+        return self.timing()['status_display']
 
     @property
     def is_upcoming(self):
-        if not self.start_time:
-            return False
-        return timezone.now() < self.start_time and self.status == 'published'
+        return self.timing()['is_upcoming']
 
     @property
     def is_ongoing(self):
-        if not self.start_time or not self.end_time:
-            return False
-        now = timezone.now()
-        return self.start_time <= now <= self.end_time and self.status == 'published'
+        return self.timing()['is_ongoing']
 
     @property
     def is_passed(self):
-        if not self.end_time:
-            return False
-        return timezone.now() > self.end_time and self.status == 'published'
+        return self.timing()['is_passed']
 
     @property
     def registration_open(self):
-        if not self.registration_required:
-            return False
-        now = timezone.now()
-        if self.registration_deadline:
-            return now < self.registration_deadline and self.is_upcoming
-        return self.is_upcoming
+        return self.timing()['registration_open']
 
     @property
     def attendee_count(self):
-        return self.registrations.filter(is_canceled=False).count()
+        return self.active_registrations
 
     @property
     def spots_remaining(self):
@@ -219,6 +290,14 @@ class Event(models.Model):
             return None
         return max(0, self.max_attendees - self.attendee_count)
 
+    @property
+    def featured_image(self):
+        """Featured image, falling back to the first image"""
+        images = getattr(self, 'listing_images', None)
+        if images is not None:
+            return images[0] if images else None
+        return self.images.filter(is_featured=True).first() or self.images.first()
+
     @property
     def duration_hours(self):
         """Event duration in hours"""
@@ -227,10 +306,33 @@ class Event(models.Model):
         delta = self.end_time - self.start_time
         return round(delta.total_seconds() / 3600, 1)
 
+class EventOccurrence(models.Model):
+    """Materialized instance of an event in time; recurring events get one row per repetition"""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='occurrences')
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = EventOccurrenceQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['start_time']
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'start_time'], name='unique_event_occurrence_start'),
+        ]
+        indexes = [
+            models.Index(fields=['start_time', 'event']),
+            models.Index(fields=['end_time', 'event']),
+        ]
+
+    def __str__(self):
+        return f"{self.event.title} @ {self.start_time:%Y-%m-%d %H:%M}"
+
 class EventImage(models.Model):
     """Images associated with events"""
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='events/images/%Y/%m/')
+    image_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     alt_text = models.CharField(max_length=255, blank=True, help_text="Alt text for accessibility")
     caption = models.CharField(max_length=255, blank=True)
     is_featured = models.BooleanField(default=False, help_text="Use as main event image")
@@ -263,11 +365,47 @@ class EventView(models.Model):
             models.Index(fields=['event', 'created_at']),
         ]
 
+    @classmethod
+    def record(cls, event, user, ip_address, user_agent=''):
+        """
+        Record a unique view and bump Event.views only if the row is new.
+        Returns True when the view was counted.
+        """
+        user_id = user.pk if user and user.is_authenticated else None
+        connection = connections[router.db_for_write(cls)]
+
+        if connection.vendor == 'postgresql':
+            # INSERT ... ON CONFLICT DO NOTHING and the counter UPDATE in one statement
+            qn = connection.ops.quote_name
+            sql = f"""
+                WITH inserted AS (
+                    INSERT INTO {qn(cls._meta.db_table)} (event_id, user_id, ip_address, user_agent, created_at)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (event_id, user_id, ip_address) DO NOTHING
+                    RETURNING event_id
+                )
+                UPDATE {qn(Event._meta.db_table)} SET views = views + 1
+                WHERE id IN (SELECT event_id FROM inserted)
+            """
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [event.pk, user_id, ip_address, user_agent, timezone.now()])
+                return cursor.rowcount == 1
+
+        try:
+            with transaction.atomic(using=connection.alias):
+                cls.objects.create(event=event, user_id=user_id, ip_address=ip_address, user_agent=user_agent)
+        except IntegrityError:
+            return False
+        Event.objects.filter(pk=event.pk).update(views=models.F('views') + 1)
+        return True
+
 class EventRegistration(models.Model):
     """User registrations for events (optional feature)"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='event_registrations')
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='registrations')
     is_canceled = models.BooleanField(default=False)
+    is_waitlisted = models.BooleanField(default=False)
+    promoted_at = models.DateTimeField(blank=True, null=True, help_text="When the registration left the waitlist")
     registration_data = models.JSONField(blank=True, default=dict, help_text="Additional registration info")
     notes = models.TextField(blank=True, help_text="User notes or special requirements")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -276,6 +414,23 @@ class EventRegistration(models.Model):
     class Meta:
         unique_together = ['user', 'event']
         ordering = ['-created_at']
+        indexes = [
+            # Waitlist queue, oldest first
+            models.Index(
+                fields=['event', 'created_at'],
+                name='event_reg_waitlist_idx',
+                condition=Q(is_waitlisted=True, is_canceled=False),
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.event.title} ({'Canceled' if self.is_canceled else 'Active'})"
\ No newline at end of file
+        if self.is_canceled:
+            state = 'Canceled'
+        elif self.is_waitlisted:
+            state = 'Waitlisted'
+        else:
+            state = 'Active'
+        return f"{self.user.username} - {self.event.title} ({state})"
+
+
+register_renditions(EventImage, 'image', 'image_renditions')
@@ -0,0 +1,120 @@
+"""
+Recurrence expansion for events.
+
+Every event is materialized into EventOccurrence rows: a single row for
+one-off events and one row per repetition for recurring events, up to
+``recurrence_end_date`` or a rolling horizon (EVENT_OCCURRENCE_HORIZON_DAYS
+from now). Time-window queries then run as range scans over the occurrence
+table instead of date math per event.
+
+Occurrences are re-synced when an event is saved (see events/signals.py)
+and the horizon is rolled forward by the ``extend_event_occurrences``
+management command.
+"""
+import calendar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Event, EventOccurrence
+
+DEFAULT_HORIZON_DAYS = 365
+
+
+def get_horizon():
+    days = getattr(settings, 'EVENT_OCCURRENCE_HORIZON_DAYS', DEFAULT_HORIZON_DAYS)
+    return timezone.now() + timedelta(days=days)
+
+
+def _add_months(value, months):
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def _nth_start(start, recurrence_type, step):
+    if recurrence_type == 'daily':
+        return start + timedelta(days=step)
+    if recurrence_type == 'weekly':
+        return start + timedelta(weeks=step)
+    if recurrence_type == 'monthly':
+        return _add_months(start, step)
+    if recurrence_type == 'yearly':
+        return _add_months(start, 12 * step)
+    raise ValueError(f"Unknown recurrence type: {recurrence_type}")
+
+
+def is_expandable(event):
+    return event.is_recurring and event.recurrence_type != 'none'
+
+
+def expand_occurrences(event, until=None):
+    """Yield (start, end) pairs for an event, stopping at its end date or the horizon"""
+    if not event.start_time or not event.end_time:
+        return
+
+    if not is_expandable(event):
+        yield event.start_time, event.end_time
+        return
+
+    until = until or get_horizon()
+    if event.recurrence_end_date and event.recurrence_end_date < until:
+        until = event.recurrence_end_date
+
+    duration = event.end_time - event.start_time
+    interval = max(1, event.recurrence_interval or 1)
+    count = 0
+    # Always step from the original start so month-end clamping doesn't drift
+    start = event.start_time
+    while start <= until:
+        yield start, start + duration
+        count += interval
+        start = _nth_start(event.start_time, event.recurrence_type, count)
+
+
+def sync_occurrences(event, until=None):
+    """
+    Bring the event's occurrence rows in line with its current rule.
+    Only rows that changed are touched: stale starts are deleted and
+    missing ones inserted, so re-syncing an unchanged event is one SELECT.
+    """
+    wanted = dict(expand_occurrences(event, until))
+
+    with transaction.atomic():
+        existing = dict(
+            EventOccurrence.objects.filter(event=event).values_list('start_time', 'end_time')
+        )
+        stale = [start for start, end in existing.items() if wanted.get(start) != end]
+        if stale:
+            EventOccurrence.objects.filter(event=event, start_time__in=stale).delete()
+
+        missing = [
+            EventOccurrence(event=event, start_time=start, end_time=end)
+            for start, end in wanted.items()
+            if existing.get(start) != end
+        ]
+        if missing:
+            EventOccurrence.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+
+    return len(missing), len(stale)
+
+
+def extend_horizon(queryset=None):
+    """Materialize occurrences that entered the rolling horizon since the last run"""
+    if queryset is None:
+        now = timezone.now()
+        queryset = Event.objects.filter(is_recurring=True).exclude(recurrence_type='none').exclude(
+            recurrence_end_date__lt=now
+        )
+
+    until = get_horizon()
+    created = deleted = 0
+    for event in queryset.iterator(chunk_size=200):
+        added, removed = sync_occurrences(event, until)
+        created += added
+        deleted += removed
+    return created, deleted
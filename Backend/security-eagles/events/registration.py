@@ -0,0 +1,129 @@
+"""
+Capacity-safe event registration.
+
+Seats are claimed against the ``Event.active_registrations`` counter with a
+conditional ``UPDATE ... WHERE active_registrations < max_attendees``. The
+database serializes concurrent updates on the event row and re-checks the
+condition, so an event can never be oversold no matter how many requests
+race for the last seat. When the event is full, registrations go to a
+waitlist that is promoted in sign-up order as seats free up.
+
+Registering is idempotent: there is one row per (user, event), and a retry
+of a registration that already went through returns that registration.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Event, EventRegistration, active_registration_count
+
+
+class RegistrationError(Exception):
+    """A registration request that can't be fulfilled"""
+
+    def __init__(self, detail, status_code=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def _claim_seat(event_id):
+    """Take one seat if the event has room; True when a seat was claimed"""
+    return Event.objects.filter(
+        Q(max_attendees__isnull=True) | Q(active_registrations__lt=F('max_attendees')),
+        pk=event_id,
+    ).update(active_registrations=F('active_registrations') + 1) == 1
+
+
+def _release_seat(event_id):
+    Event.objects.filter(pk=event_id, active_registrations__gt=0).update(
+        active_registrations=F('active_registrations') - 1
+    )
+
+
+def register(event, user, registration_data=None, notes=''):
+    """
+    Register `user` for `event`, or put them on the waitlist when it is full.
+    Returns (registration, created); `created` is False for a repeated request.
+    """
+    try:
+        with transaction.atomic():
+            registration = EventRegistration.objects.select_for_update().filter(user=user, event=event).first()
+            if registration is not None and not registration.is_canceled:
+                return registration, False
+
+            seated = _claim_seat(event.pk)
+            if not seated and not event.waitlist_enabled:
+                raise RegistrationError('Event is full')
+
+            fields = {
+                'is_canceled': False,
+                'is_waitlisted': not seated,
+                'promoted_at': None,
+                'registration_data': registration_data or {},
+                'notes': notes or '',
+            }
+            if registration is None:
+                registration = EventRegistration.objects.create(user=user, event=event, **fields)
+            else:
+                # Re-registering after a cancellation reuses the row and joins the back of the queue
+                for name, value in fields.items():
+                    setattr(registration, name, value)
+                registration.created_at = timezone.now()
+                registration.save()
+            return registration, True
+    except IntegrityError:
+        # A concurrent retry of the same request inserted the row first; the
+        # seat claimed above was rolled back with this transaction.
+        registration = EventRegistration.objects.filter(user=user, event=event, is_canceled=False).first()
+        if registration is None:
+            raise
+        return registration, False
+
+
+def cancel(event, user):
+    """
+    Cancel the user's registration and hand a freed seat to the waitlist.
+    Returns the promoted registrations.
+    """
+    with transaction.atomic():
+        registration = EventRegistration.objects.select_for_update().filter(
+            user=user, event=event, is_canceled=False
+        ).first()
+        if registration is None:
+            raise RegistrationError('No active registration found', status_code=404)
+
+        was_seated = not registration.is_waitlisted
+        registration.is_canceled = True
+        registration.is_waitlisted = False
+        registration.save(update_fields=['is_canceled', 'is_waitlisted', 'updated_at'])
+
+        if not was_seated:
+            return []
+        _release_seat(event.pk)
+        return promote_waitlist(event.pk)
+
+
+def promote_waitlist(event_id):
+    """Move waitlisted registrations into free seats, oldest first"""
+    promoted = []
+    with transaction.atomic():
+        while True:
+            candidate = EventRegistration.objects.select_for_update(skip_locked=True).filter(
+                event_id=event_id, is_waitlisted=True, is_canceled=False
+            ).order_by('created_at', 'id').first()
+            if candidate is None or not _claim_seat(event_id):
+                break
+            candidate.is_waitlisted = False
+            candidate.promoted_at = timezone.now()
+            candidate.save(update_fields=['is_waitlisted', 'promoted_at', 'updated_at'])
+            promoted.append(candidate)
+    return promoted
+
+
+def recount_registrations(queryset=None):
+    """Reset counters from the registration table; returns the number of events fixed"""
+    queryset = Event.objects.all() if queryset is None else queryset
+    return queryset.exclude(
+        active_registrations=active_registration_count('pk')
+    ).update(active_registrations=active_registration_count('pk'))
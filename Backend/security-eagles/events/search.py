@@ -0,0 +1,80 @@
+"""
+Full-text and faceted search for events.
+
+Each event keeps a weighted ``search_vector`` (title > tags/organizer >
+description > long description), refreshed after save (see
+events/signals.py) and matched through a GIN index. ``?search=`` accepts
+web-search syntax ("quoted phrases", -exclusions, OR). Results are ranked
+unless the client passes an explicit ``?ordering=``.
+"""
+from collections import Counter
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Count, F, Func, TextField, Value
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_CONFIG = 'english'
+
+# Fields that feed the search vector; saving any of them refreshes it
+SEARCH_FIELDS = ('title', 'tags', 'organizer', 'description', 'long_description')
+
+
+def search_vector_expression():
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(tags, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('organizer', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('long_description', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(queryset):
+    """Recompute stored search vectors in a single UPDATE"""
+    return queryset.update(search_vector=search_vector_expression())
+
+
+class EventSearchFilter(BaseFilterBackend):
+    """Full-text ?search= over the stored search vector, ranked by relevance"""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query)
+        if request.query_params.get('ordering'):
+            return queryset
+        return queryset.annotate(rank=SearchRank(F('search_vector'), query)).order_by('-rank', '-start_time')
+
+
+def facet_counts(queryset):
+    """
+    Counts by category, event type and physical/online for the filtered events.
+    One grouped query over all three dimensions, folded into separate facets.
+    """
+    rows = queryset.order_by().values(
+        'category__slug', 'category__name', 'event_type', 'is_physical'
+    ).annotate(total=Count('id'))
+
+    categories = {}
+    event_types = Counter()
+    formats = Counter()
+    for row in rows:
+        if row['category__slug']:
+            entry = categories.setdefault(
+                row['category__slug'],
+                {'slug': row['category__slug'], 'name': row['category__name'], 'count': 0}
+            )
+            entry['count'] += row['total']
+        event_types[row['event_type']] += row['total']
+        formats['physical' if row['is_physical'] else 'online'] += row['total']
+
+    return {
+        'category': sorted(categories.values(), key=lambda entry: -entry['count']),
+        'event_type': [{'value': value, 'count': count} for value, count in event_types.most_common()],
+        'format': [{'value': value, 'count': count} for value, count in formats.most_common()],
+    }
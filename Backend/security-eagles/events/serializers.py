@@ -1,7 +1,36 @@
 # events/serializers.py
 from rest_framework import serializers
 from django.utils import timezone
-from .models import Event, EventImage, EventCategory, EventRegistration
+from core.images import build_srcset
+from .models import Event, EventImage, EventCategory, EventRegistration, EventOccurrence
+
+class EventTimingMixin:
+    """
+    Time-based status fields evaluated once per object against one `now` per request.
+    The `now` is kept in the serializer context, which list children share.
+    """
+
+    def _timing(self, obj):
+        timing = getattr(obj, '_timing', None)
+        if timing is None:
+            now = self.context.setdefault('now', timezone.now()) if isinstance(self.context, dict) else timezone.now()
+            timing = obj._timing = obj.timing(now)
+        return timing
+
+    def get_status_display(self, obj):
+        return self._timing(obj)['status_display']
+
+    def get_is_upcoming(self, obj):
+        return self._timing(obj)['is_upcoming']
+
+    def get_is_ongoing(self, obj):
+        return self._timing(obj)['is_ongoing']
+
+    def get_is_passed(self, obj):
+        return self._timing(obj)['is_passed']
+
+    def get_registration_open(self, obj):
+        return self._timing(obj)['registration_open']
 
 class EventCategorySerializer(serializers.ModelSerializer):
     event_count = serializers.ReadOnlyField()
@@ -12,10 +41,11 @@ class EventCategorySerializer(serializers.ModelSerializer):
 
 class EventImageSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = EventImage
-        fields = ['id', 'image', 'image_url', 'alt_text', 'caption', 'is_featured', 'order']
+        fields = ['id', 'image', 'image_url', 'image_srcset', 'alt_text', 'caption', 'is_featured', 'order']
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -23,15 +53,18 @@ class EventImageSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url) if request else obj.image.url
         return None
 
-class EventPreviewSerializer(serializers.ModelSerializer):
+    def get_image_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.image_renditions, obj.image)
+
+class EventPreviewSerializer(EventTimingMixin, serializers.ModelSerializer):
     """Serializer for event listings/previews"""
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_color = serializers.CharField(source='category.color', read_only=True)
-    status_display = serializers.ReadOnlyField()
-    is_upcoming = serializers.ReadOnlyField()
-    is_ongoing = serializers.ReadOnlyField()
-    is_passed = serializers.ReadOnlyField()
-    registration_open = serializers.ReadOnlyField()
+    status_display = serializers.SerializerMethodField()
+    is_upcoming = serializers.SerializerMethodField()
+    is_ongoing = serializers.SerializerMethodField()
+    is_passed = serializers.SerializerMethodField()
+    registration_open = serializers.SerializerMethodField()
     attendee_count = serializers.ReadOnlyField()
     spots_remaining = serializers.ReadOnlyField()
     duration_hours = serializers.ReadOnlyField()
@@ -56,23 +89,40 @@ class EventPreviewSerializer(serializers.ModelSerializer):
         ]
 
     def get_featured_image(self, obj):
-        featured_image = obj.images.filter(is_featured=True).first()
-        if not featured_image:
-            featured_image = obj.images.first()
-
+        featured_image = obj.featured_image
         if featured_image:
             return EventImageSerializer(featured_image, context=self.context).data
         return None
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventOccurrenceSerializer(EventPreviewSerializer):
+    """
+    Event preview for a single occurrence.
+    Serializes occurrence.event with the occurrence's start/end times, so
+    recurring events appear once per repetition with the listing shape unchanged.
+    """
+    occurrence_id = serializers.IntegerField(read_only=True, default=None)
+
+    class Meta(EventPreviewSerializer.Meta):
+        fields = EventPreviewSerializer.Meta.fields + ['occurrence_id']
+
+    def to_representation(self, instance):
+        if isinstance(instance, EventOccurrence):
+            event = instance.event
+            event.start_time = instance.start_time
+            event.end_time = instance.end_time
+            event.occurrence_id = instance.id
+            instance = event
+        return super().to_representation(instance)
+
+class EventDetailSerializer(EventTimingMixin, serializers.ModelSerializer):
     """Serializer for full event details"""
     category = EventCategorySerializer(read_only=True)
     images = EventImageSerializer(many=True, read_only=True)
-    status_display = serializers.ReadOnlyField()
-    is_upcoming = serializers.ReadOnlyField()
-    is_ongoing = serializers.ReadOnlyField()
-    is_passed = serializers.ReadOnlyField()
-    registration_open = serializers.ReadOnlyField()
+    status_display = serializers.SerializerMethodField()
+    is_upcoming = serializers.SerializerMethodField()
+    is_ongoing = serializers.SerializerMethodField()
+    is_passed = serializers.SerializerMethodField()
+    registration_open = serializers.SerializerMethodField()
     attendee_count = serializers.ReadOnlyField()
     spots_remaining = serializers.ReadOnlyField()
     duration_hours = serializers.ReadOnlyField()
@@ -87,7 +137,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
             'is_physical', 'location', 'address', 'platforms', 'platform_urls',
             'start_time', 'end_time', 'timezone_info', 'duration_hours',
             'is_recurring', 'recurrence_type', 'recurrence_interval', 'recurrence_end_date',
-            'max_attendees', 'registration_required', 'registration_deadline', 'registration_url',
+            'max_attendees', 'registration_required', 'registration_deadline', 'registration_url', 'waitlist_enabled',
             'attendee_count', 'spots_remaining', 'registration_open',
             'organizer', 'organizer_email', 'organizer_phone', 'organizer_website',
             'is_upcoming', 'is_ongoing', 'is_passed',
@@ -112,7 +162,7 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
             'is_physical', 'location', 'address', 'platforms', 'platform_urls',
             'start_time', 'end_time', 'timezone_info',
             'is_recurring', 'recurrence_type', 'recurrence_interval', 'recurrence_end_date',
-            'max_attendees', 'registration_required', 'registration_deadline', 'registration_url',
+            'max_attendees', 'registration_required', 'registration_deadline', 'registration_url', 'waitlist_enabled',
             'organizer', 'organizer_email', 'organizer_phone', 'organizer_website',
             'meta_description', 'meta_keywords', 'admin_notes'
         ]
@@ -142,6 +192,6 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = EventRegistration
-        fields = ['id', 'event', 'event_title', 'user_name', 'is_canceled',
-                 'registration_data', 'notes', 'created_at', 'updated_at']
-        read_only_fields = ['user']
+        fields = ['id', 'event', 'event_title', 'user_name', 'is_canceled', 'is_waitlisted',
+                 'promoted_at', 'registration_data', 'notes', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'is_waitlisted', 'promoted_at']
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Event
+from .recurrence import sync_occurrences
+from .registration import promote_waitlist
+from .search import SEARCH_FIELDS, update_search_vector
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_occurrences(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-expand occurrences when timing or recurrence settings may have changed"""
+    if raw:
+        return
+    timing_fields = {
+        'start_time', 'end_time', 'is_recurring', 'recurrence_type',
+        'recurrence_interval', 'recurrence_end_date',
+    }
+    if update_fields is not None and not timing_fields.intersection(update_fields):
+        return
+    sync_occurrences(instance)
+
+
+@receiver(post_save, sender=Event)
+def fill_seats_from_waitlist(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Promote waitlisted registrations when capacity is raised or removed"""
+    if raw or not instance.waitlist_enabled:
+        return
+    if update_fields is not None and 'max_attendees' not in update_fields:
+        return
+    if instance.max_attendees is not None and instance.active_registrations >= instance.max_attendees:
+        return
+    transaction.on_commit(lambda: promote_waitlist(instance.pk))
+
+
+@receiver(post_save, sender=Event)
+def refresh_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute the stored search document when searchable text changes"""
+    if raw:
+        return
+    if update_fields is not None and not set(SEARCH_FIELDS).intersection(update_fields):
+        return
+    update_search_vector(Event.objects.filter(pk=instance.pk))
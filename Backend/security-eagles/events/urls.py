@@ -7,9 +7,14 @@ from .views import (
 
     # Admin views
     EventAdminListView, EventAdminDetailView, EventPublishView, EventArchiveView,
+    EventImportView, EventBulkStatusView,
 
     # Registration views
-    EventRegistrationView, EventUnregisterView
+    EventRegistrationView, EventUnregisterView,
+
+    # Calendar feeds
+    CategoryCalendarFeedView, TagCalendarFeedView,
+    RegistrationCalendarFeedView, RegistrationCalendarLinkView
 )
 
 urlpatterns = [
@@ -22,8 +27,17 @@ urlpatterns = [
     path('past/', PastEventsView.as_view(), name='past-events'),
     path('search/', EventSearchView.as_view(), name='event-search'),
 
+    # Calendar feeds (must come before slug patterns)
+    path('calendar/category/<slug:slug>.ics', CategoryCalendarFeedView.as_view(), name='event-calendar-category'),
+    path('calendar/tag/<str:tag>.ics', TagCalendarFeedView.as_view(), name='event-calendar-tag'),
+    path('calendar/registrations/', RegistrationCalendarLinkView.as_view(), name='event-calendar-registrations-link'),
+    path('calendar/registrations/<str:token>.ics', RegistrationCalendarFeedView.as_view(), name='event-calendar-registrations'),
+
     # Admin endpoints (must come before slug patterns)
     path('admin/', EventAdminListView.as_view(), name='event-admin-list'),
+    path('admin/import/', EventImportView.as_view(), name='event-import'),
+    path('admin/bulk/publish/', EventBulkStatusView.as_view(bulk_action='publish'), name='event-bulk-publish'),
+    path('admin/bulk/archive/', EventBulkStatusView.as_view(bulk_action='archive'), name='event-bulk-archive'),
     path('admin/<slug:slug>/', EventAdminDetailView.as_view(), name='event-admin-detail'),
     path('admin/<slug:slug>/publish/', EventPublishView.as_view(), name='event-publish'),
     path('admin/<slug:slug>/archive/', EventArchiveView.as_view(), name='event-archive'),
@@ -2,41 +2,72 @@
 # events/views.py
 from rest_framework import generics, pagination, status, filters
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from django.db import models
 from django.utils import timezone
+from django.http import HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.http import parse_etags
+from django.utils.text import slugify
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import Event, EventCategory, EventRegistration, EventView
+from .models import Event, EventCategory, EventView, EventOccurrence
 from .serializers import (
     EventPreviewSerializer, EventDetailSerializer, EventCreateUpdateSerializer,
-    EventCategorySerializer, EventRegistrationSerializer
+    EventCategorySerializer, EventRegistrationSerializer, EventOccurrenceSerializer
 )
 from .filters import EventFilter
+from .search import EventSearchFilter, facet_counts
+from . import bulk, calendar, registration as registration_service
+from core.pagination import KeysetPaginationMixin
 
-class EventPagination(pagination.PageNumberPagination):
+class EventPagination(KeysetPaginationMixin, pagination.PageNumberPagination):
+    """Page-number pagination, or keyset pagination with ?cursor="""
+    cursor_ordering = ('-start_time', '-id')
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 50
 
+def published_occurrences():
+    """Occurrences of listed events, ready for EventOccurrenceSerializer"""
+    return EventOccurrence.objects.filter(
+        event__status='published',
+        event__is_active=True
+    ).for_listing()
+
 class EventCategoryListView(generics.ListAPIView):
     """List all active event categories"""
-    queryset = EventCategory.objects.filter(is_active=True)
+    queryset = EventCategory.objects.filter(is_active=True).with_event_count()
     serializer_class = EventCategorySerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-class EventListView(generics.ListAPIView):
+class EventFacetsMixin:
+    """Adds facet counts for the filtered events to paginated list responses (?facets=true)"""
+    include_facets = False
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        if self.include_facets or request.query_params.get('facets') == 'true':
+            response.data['facets'] = facet_counts(queryset)
+        return response
+
+class EventListView(EventFacetsMixin, generics.ListAPIView):
     """List published events with filtering and search"""
     serializer_class = EventPreviewSerializer
     pagination_class = EventPagination
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, EventSearchFilter]
     filterset_class = EventFilter
-    search_fields = ['title', 'description', 'long_description', 'organizer', 'tags']
     ordering_fields = ['start_time', 'created_at', 'views', 'priority']
     ordering = ['-start_time']
 
@@ -44,7 +75,7 @@ class EventListView(generics.ListAPIView):
         return Event.objects.filter(
             status='published',
             is_active=True
-        ).select_related('category', 'created_by').prefetch_related('images')
+        ).for_listing()
 
 class EventDetailView(generics.RetrieveAPIView):
     """Get detailed event information"""
@@ -57,22 +88,20 @@ class EventDetailView(generics.RetrieveAPIView):
         return Event.objects.filter(
             status='published',
             is_active=True
-        ).select_related('category', 'created_by').prefetch_related('images', 'view_records')
+        ).select_related('category', 'created_by').prefetch_related('images')
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
 
-        # Track view
-        ip_address = self.get_client_ip(request)
-        EventView.objects.get_or_create(
-            event=instance,
-            user=request.user,
-            ip_address=ip_address,
-            defaults={'user_agent': request.META.get('HTTP_USER_AGENT', '')}
+        # Track unique views; repeat viewers don't increment the counter
+        counted = EventView.record(
+            instance,
+            request.user,
+            self.get_client_ip(request),
+            request.META.get('HTTP_USER_AGENT', '')
         )
-
-        # Increment view count
-        Event.objects.filter(pk=instance.pk).update(views=models.F('views') + 1)
+        if counted:
+            instance.views += 1
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -96,67 +125,61 @@ class FeaturedEventsView(generics.ListAPIView):
             status='published',
             is_active=True,
             is_featured=True
-        ).select_related('category', 'created_by').prefetch_related('images')[:10]
+        ).for_listing()[:10]
 
 class UpcomingEventsView(generics.ListAPIView):
-    """List upcoming events"""
-    serializer_class = EventPreviewSerializer
+    """List upcoming event occurrences, including future repetitions of recurring events"""
+    serializer_class = EventOccurrenceSerializer
     pagination_class = EventPagination
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    cursor_ordering = ('start_time', 'id')
+
     def get_queryset(self):
         now = timezone.now()
-        return Event.objects.filter(
-            status='published',
-            is_active=True,
-            start_time__gt=now
-        ).select_related('category', 'created_by').prefetch_related('images').order_by('start_time')
+        return published_occurrences().filter(start_time__gt=now).order_by('start_time', 'id')
 
 class OngoingEventsView(generics.ListAPIView):
-    """List currently ongoing events"""
-    serializer_class = EventPreviewSerializer
+    """List currently ongoing event occurrences"""
+    serializer_class = EventOccurrenceSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         now = timezone.now()
-        return Event.objects.filter(
-            status='published',
-            is_active=True,
+        return published_occurrences().filter(
             start_time__lte=now,
             end_time__gte=now
-        ).select_related('category', 'created_by').prefetch_related('images').order_by('start_time')
+        ).order_by('start_time', 'id')
 
 class PastEventsView(generics.ListAPIView):
-    """List past events"""
-    serializer_class = EventPreviewSerializer
+    """List past event occurrences"""
+    serializer_class = EventOccurrenceSerializer
     pagination_class = EventPagination
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    cursor_ordering = ('-end_time', '-id')
+
     def get_queryset(self):
         now = timezone.now()
-        return Event.objects.filter(
-            status='published',
-            is_active=True,
-            end_time__lt=now
-        ).select_related('category', 'created_by').prefetch_related('images').order_by('-end_time')
+        return published_occurrences().filter(end_time__lt=now).order_by('-end_time', '-id')
 
-class EventSearchView(generics.ListAPIView):
+class EventSearchView(EventFacetsMixin, generics.ListAPIView):
     """Search events"""
     serializer_class = EventPreviewSerializer
     pagination_class = EventPagination
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'description', 'long_description', 'organizer', 'tags']
+    filter_backends = [EventSearchFilter]
+    include_facets = True
 
     def get_queryset(self):
         return Event.objects.filter(
             status='published',
             is_active=True
-        ).select_related('category', 'created_by').prefetch_related('images')
+        ).for_listing()
 
 # ADMIN VIEWS (Staff/Admin Only)
 class EventAdminListView(generics.ListCreateAPIView):
@@ -165,11 +188,11 @@ class EventAdminListView(generics.ListCreateAPIView):
     pagination_class = EventPagination
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, EventSearchFilter]
     filterset_class = EventFilter
-    search_fields = ['title', 'description', 'long_description', 'organizer', 'tags']
     ordering_fields = ['start_time', 'created_at', 'views', 'priority', 'status']
     ordering = ['-created_at']
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         # Debug logging
@@ -177,13 +200,13 @@ class EventAdminListView(generics.ListCreateAPIView):
 
         # Admin can see all events
         if self.request.user.is_staff:
-            queryset = Event.objects.all().select_related('category', 'created_by').prefetch_related('images')
+            queryset = Event.objects.all().for_listing()
             print(f"Admin queryset count: {queryset.count()}")
             return queryset
         # Regular users can only see their own events
         queryset = Event.objects.filter(
             created_by=self.request.user
-        ).select_related('category', 'created_by').prefetch_related('images')
+        ).for_listing()
         print(f"User queryset count: {queryset.count()}")
         return queryset
 
@@ -235,7 +258,7 @@ class EventPublishView(generics.UpdateAPIView):
 
         event.status = 'published'
         event.published_at = timezone.now()
-        event.save()
+        event.save(update_fields=['status', 'published_at', 'updated_at'])
 
         return Response({
             'detail': 'Event published successfully',
@@ -256,10 +279,68 @@ class EventArchiveView(generics.UpdateAPIView):
     def patch(self, request, *args, **kwargs):
         event = self.get_object()
         event.status = 'archived'
-        event.save()
+        event.save(update_fields=['status', 'updated_at'])
 
         return Response({'detail': 'Event archived successfully'})
 
+class EventImportView(APIView):
+    """Bulk-create events from a CSV or JSON upload, reporting errors per row (staff only)"""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+                rows = bulk.parse_rows(upload.read(), fmt)
+            elif isinstance(request.data, list):
+                rows = request.data
+            else:
+                rows = request.data.get('events', [])
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({'detail': f'Could not parse import file: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not rows:
+            return Response({'detail': 'No events to import'}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') == 'true'
+        result = bulk.import_events(
+            rows,
+            request.user,
+            dry_run=dry_run,
+            atomic=request.query_params.get('atomic') == 'true'
+        )
+        if dry_run:
+            response_status = status.HTTP_200_OK
+        elif result['created']:
+            response_status = status.HTTP_201_CREATED
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+class EventBulkStatusView(APIView):
+    """Publish or archive many events (by slug) with one UPDATE"""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    bulk_action = None  # 'publish' or 'archive'
+
+    def post(self, request, *args, **kwargs):
+        slugs = request.data.get('slugs')
+        if not isinstance(slugs, list) or not slugs:
+            return Response({'detail': 'Provide a non-empty list of slugs'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Event.objects.filter(slug__in=slugs)
+        if not request.user.is_staff:
+            queryset = queryset.filter(created_by=request.user)
+
+        if self.bulk_action == 'publish':
+            updated = bulk.bulk_publish(queryset)
+            return Response({'detail': f'{updated} events published successfully', 'updated': updated})
+        updated = bulk.bulk_archive(queryset)
+        return Response({'detail': f'{updated} events archived successfully', 'updated': updated})
+
 # REGISTRATION VIEWS (Optional feature)
 class EventRegistrationView(generics.CreateAPIView):
     """Register for an event"""
@@ -285,34 +366,19 @@ class EventRegistrationView(generics.CreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Check capacity
-        if event.max_attendees and event.attendee_count >= event.max_attendees:
-            return Response(
-                {'detail': 'Event is full'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Check if already registered
-        if EventRegistration.objects.filter(
-            user=request.user,
-            event=event,
-            is_canceled=False
-        ).exists():
-            return Response(
-                {'detail': 'Already registered for this event'},
-                status=status.HTTP_400_BAD_REQUEST
+        # Capacity is enforced atomically; retries return the existing registration
+        try:
+            registration, created = registration_service.register(
+                event,
+                request.user,
+                registration_data=request.data.get('registration_data', {}),
+                notes=request.data.get('notes', '')
             )
-
-        # Create registration
-        registration = EventRegistration.objects.create(
-            user=request.user,
-            event=event,
-            registration_data=request.data.get('registration_data', {}),
-            notes=request.data.get('notes', '')
-        )
+        except registration_service.RegistrationError as exc:
+            return Response({'detail': exc.detail}, status=exc.status_code)
 
         serializer = self.get_serializer(registration)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 class EventUnregisterView(generics.UpdateAPIView):
     """Unregister from an event"""
@@ -324,17 +390,85 @@ class EventUnregisterView(generics.UpdateAPIView):
         event = get_object_or_404(Event, slug=event_slug)
 
         try:
-            registration = EventRegistration.objects.get(
-                user=request.user,
-                event=event,
-                is_canceled=False
-            )
-            registration.is_canceled = True
-            registration.save()
+            registration_service.cancel(event, request.user)
+        except registration_service.RegistrationError as exc:
+            return Response({'detail': exc.detail}, status=exc.status_code)
+
+        return Response({'detail': 'Successfully unregistered from event'})
+
+# CALENDAR FEEDS
+class CalendarFeedMixin:
+    """Streams iCalendar feeds, answering 304 when the client's ETag is current"""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def not_modified(self, request, etag):
+        client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in [value.removeprefix('W/') for value in client_etags] or '*' in client_etags:
+            return self.with_cache_headers(HttpResponseNotModified(), etag)
+        return None
+
+    def stream(self, etag, occurrences, name, filename, statuses=None):
+        response = StreamingHttpResponse(
+            calendar.stream_calendar(occurrences, name, statuses),
+            content_type='text/calendar; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'inline; filename="{filename}.ics"'
+        return self.with_cache_headers(response, etag)
+
+    def with_cache_headers(self, response, etag):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=300'
+        return response
+
+class CategoryCalendarFeedView(CalendarFeedMixin, APIView):
+    """iCalendar feed of published events in a category"""
+
+    def get(self, request, slug):
+        category = get_object_or_404(EventCategory, slug=slug, is_active=True)
+        etag = calendar.feed_etag(f'category:{category.pk}', calendar.listed_events().filter(category=category))
+        cached = self.not_modified(request, etag)
+        if cached:
+            return cached
+
+        occurrences = calendar.published_feed_occurrences().filter(event__category=category)
+        return self.stream(etag, occurrences, f'{category.name} Events', f'events-{category.slug}')
+
+class TagCalendarFeedView(CalendarFeedMixin, APIView):
+    """iCalendar feed of published events with a tag"""
+
+    def get(self, request, tag):
+        etag = calendar.feed_etag(f'tag:{tag}', calendar.listed_events().filter(tags__contains=[tag]))
+        cached = self.not_modified(request, etag)
+        if cached:
+            return cached
+
+        occurrences = calendar.published_feed_occurrences().filter(event__tags__contains=[tag])
+        return self.stream(etag, occurrences, f'{tag} Events', f'events-tag-{slugify(tag)}')
+
+class RegistrationCalendarFeedView(CalendarFeedMixin, APIView):
+    """iCalendar feed of the events a user registered for (waitlisted ones are TENTATIVE)"""
+
+    def get(self, request, token):
+        user_id = calendar.read_feed_token(token)
+        if user_id is None:
+            return Response({'detail': 'Invalid calendar token'}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = calendar.registration_feed_etag(user_id)
+        cached = self.not_modified(request, etag)
+        if cached:
+            return cached
+
+        statuses = calendar.registration_statuses(user_id)
+        occurrences = calendar.published_feed_occurrences().filter(event_id__in=list(statuses))
+        return self.stream(etag, occurrences, 'My Events', 'my-events', statuses)
+
+class RegistrationCalendarLinkView(APIView):
+    """Subscription URL for the current user's registration feed"""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
 
-            return Response({'detail': 'Successfully unregistered from event'})
-        except EventRegistration.DoesNotExist:
-            return Response(
-                {'detail': 'No active registration found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+    def get(self, request):
+        token = calendar.make_feed_token(request.user)
+        url = request.build_absolute_uri(reverse('event-calendar-registrations', kwargs={'token': token}))
+        return Response({'url': url, 'webcal_url': 'webcal://' + url.split('://', 1)[-1]})
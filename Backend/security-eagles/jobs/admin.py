@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils import timezone
-from .models import JobCategory, Job, JobApplication, JobView, JobPost
+from .models import JobCategory, Job, JobApplication, JobApplicationStatusChange, JobView, JobPost, ExchangeRate
+from . import workflow
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
@@ -24,7 +25,10 @@ class JobAdmin(admin.ModelAdmin):
         'is_remote', 'remote_type', 'is_featured', 'is_urgent', 'category'
     )
     search_fields = ('title', 'company_name', 'description', 'tags')
-    readonly_fields = ('application_count', 'view_count', 'created_at', 'updated_at', 'published_at')
+    readonly_fields = (
+        'application_count', 'view_count', 'created_at', 'updated_at', 'published_at',
+        'salary_min_annual_usd', 'salary_max_annual_usd'
+    )
 
     fieldsets = (
         ('Basic Information', {
@@ -40,7 +44,10 @@ class JobAdmin(admin.ModelAdmin):
             'fields': ('location', 'is_remote', 'remote_type')
         }),
         ('Compensation', {
-            'fields': ('salary_min', 'salary_max', 'salary_currency', 'salary_period')
+            'fields': (
+                'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+                'salary_min_annual_usd', 'salary_max_annual_usd'
+            )
         }),
         ('Application Details', {
             'fields': ('application_deadline', 'contact_email', 'contact_phone', 'external_url', 'application_instructions')
@@ -76,6 +83,16 @@ class JobAdmin(admin.ModelAdmin):
         self.message_user(request, f"{count} jobs closed.")
     close_jobs.short_description = "Close selected published jobs"
 
+class JobApplicationStatusChangeInline(admin.TabularInline):
+    model = JobApplicationStatusChange
+    fields = ('from_status', 'to_status', 'changed_by', 'changed_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     list_display = (
@@ -105,6 +122,7 @@ class JobApplicationAdmin(admin.ModelAdmin):
         }),
     )
 
+    inlines = [JobApplicationStatusChangeInline]
     actions = ['mark_as_reviewing', 'mark_as_shortlisted', 'mark_as_rejected']
 
     def applicant_name(self, obj):
@@ -115,19 +133,29 @@ class JobApplicationAdmin(admin.ModelAdmin):
         return obj.job.title
     job_title.short_description = 'Job'
 
+    def save_model(self, request, obj, form, change):
+        obj._status_changed_by = request.user
+        super().save_model(request, obj, form, change)
+
+    def set_status(self, request, queryset, target, label):
+        selected = queryset.count()
+        count = workflow.transition(queryset, target, changed_by=request.user)
+        skipped = selected - count
+        message = f"{count} applications {label}."
+        if skipped:
+            message += f" {skipped} skipped because their status can't change to {target}."
+        self.message_user(request, message)
+
     def mark_as_reviewing(self, request, queryset):
-        queryset.update(status='reviewing')
-        self.message_user(request, f"{queryset.count()} applications marked as under review.")
+        self.set_status(request, queryset, 'reviewing', 'marked as under review')
     mark_as_reviewing.short_description = "Mark as under review"
 
     def mark_as_shortlisted(self, request, queryset):
-        queryset.update(status='shortlisted')
-        self.message_user(request, f"{queryset.count()} applications shortlisted.")
+        self.set_status(request, queryset, 'shortlisted', 'shortlisted')
     mark_as_shortlisted.short_description = "Mark as shortlisted"
 
     def mark_as_rejected(self, request, queryset):
-        queryset.update(status='rejected')
-        self.message_user(request, f"{queryset.count()} applications rejected.")
+        self.set_status(request, queryset, 'rejected', 'rejected')
     mark_as_rejected.short_description = "Mark as rejected"
 
 @admin.register(JobView)
@@ -140,6 +168,12 @@ class JobViewAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         return False  # Views are created automatically
 
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'usd_rate', 'updated_at')
+    search_fields = ('currency',)
+    readonly_fields = ('updated_at',)
+
 # Keep legacy JobPost admin for backward compatibility
 @admin.register(JobPost)
 class JobPostAdmin(admin.ModelAdmin):
@@ -0,0 +1,56 @@
+"""
+Submitting and withdrawing job applications.
+
+Every view that creates or withdraws an application goes through here, so
+the rules live in one place. ``Job.application_count`` counts the job's
+applications that aren't withdrawn. It is changed with an F() update in
+the same transaction as the application row: ``JobApplication.save``
+handles single applications and ``workflow.transition`` bulk moves.
+Withdrawing an application that is already withdrawn changes nothing, so
+the counter can't drift below the real number. The
+``repair_application_counts`` command fixes counts that drifted before
+this was in place.
+"""
+from django.db import IntegrityError, transaction
+
+from . import workflow
+from .models import JobApplication
+
+
+class ApplicationError(Exception):
+    """An application request that can't be carried out"""
+
+    def __init__(self, detail, status_code=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def submit(serializer, user):
+    """Save a validated JobApplicationCreateSerializer for `user` and count the application"""
+    try:
+        with transaction.atomic():
+            return serializer.save(user=user)
+    except IntegrityError:
+        # Lost a race with a second submit of the same application
+        raise ApplicationError("You have already applied to this job.")
+
+
+def withdraw(user, **lookup):
+    """
+    Withdraw the user's application matching `lookup` (pk= or job_id=).
+    Returns (application, changed); changed is False if it was already withdrawn.
+    """
+    with transaction.atomic():
+        application = JobApplication.objects.select_for_update().filter(user=user, **lookup).first()
+        if application is None:
+            raise ApplicationError("Application not found.", status_code=404)
+        if application.status == 'withdrawn':
+            return application, False
+        if not workflow.can_transition(application.status, 'withdrawn'):
+            raise ApplicationError("Cannot withdraw application that has been processed.")
+
+        application.status = 'withdrawn'
+        application._status_changed_by = user
+        application.save(update_fields=['status', 'updated_at'])
+    return application, True
@@ -0,0 +1,238 @@
+"""
+Streaming exports of job applications.
+
+Applications are read with ``.iterator(chunk_size)`` and written out row by
+row, so memory stays flat however many applications match. CSV is produced
+through an echoing ``csv.writer``; XLSX and the resume bundle are ZIP files
+written with ``zipfile`` into a buffer that is drained after every write,
+which lets the archive go out while it is being built. The XLSX writer only
+emits the handful of parts Excel/LibreOffice need (inline strings, no
+styles), so there is no extra dependency.
+"""
+import csv
+import json
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.files.storage import default_storage
+
+EXPORT_CHUNK_SIZE = 500
+FILE_CHUNK_SIZE = 64 * 1024
+
+# (header, value from an application)
+BASE_COLUMNS = [
+    ('application_id', lambda app: app.id),
+    ('job_id', lambda app: app.job_id),
+    ('job_title', lambda app: app.job.title),
+    ('company_name', lambda app: app.job.company_name),
+    ('username', lambda app: app.user.username),
+    ('applicant_name', lambda app: app.applicant_name),
+    ('email', lambda app: app.user.email),
+    ('status', lambda app: app.status),
+    ('rating', lambda app: app.rating),
+    ('applied_at', lambda app: app.created_at.isoformat()),
+    ('reviewed_at', lambda app: app.reviewed_at.isoformat() if app.reviewed_at else ''),
+    ('interview_date', lambda app: app.interview_date.isoformat() if app.interview_date else ''),
+    ('portfolio_links', lambda app: ' '.join(app.portfolio_links or [])),
+    ('resume', lambda app: app.resume_file.name if app.resume_file else ''),
+]
+COVER_LETTER_COLUMN = ('cover_letter', lambda app: app.cover_letter)
+
+# Leading characters spreadsheets treat as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+XML_ILLEGAL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def export_queryset(queryset, profile_fields=(), include_cover_letter=False):
+    """Only load the columns an export needs; the JSON profile and cover letter are often large"""
+    queryset = queryset.select_related('user', 'job').order_by('id')
+    if not profile_fields:
+        queryset = queryset.defer('applicant_profile')
+    if not include_cover_letter:
+        queryset = queryset.defer('cover_letter')
+    return queryset
+
+
+def build_columns(profile_fields=(), include_cover_letter=False):
+    columns = list(BASE_COLUMNS)
+    if include_cover_letter:
+        columns.append(COVER_LETTER_COLUMN)
+    for key in profile_fields:
+        columns.append((f'profile.{key}', lambda app, key=key: (app.applicant_profile or {}).get(key)))
+    return columns
+
+
+def cell(value):
+    """Numbers stay numbers, everything else becomes text"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+
+def _csv_safe(value):
+    # Applicant-written text could otherwise run as a formula when the CSV is opened
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_rows(queryset, columns):
+    yield [header for header, _ in columns]
+    for application in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [cell(getter(application)) for _, getter in columns]
+
+
+class Echo:
+    """File-like object that hands back what is written, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    # BOM so Excel opens the file as UTF-8
+    yield '\ufeff'
+    for row in rows:
+        yield writer.writerow([_csv_safe(value) for value in row])
+
+
+class _ZipBuffer:
+    """Unseekable sink for ZipFile; written bytes are collected until drained"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive built from (name, iterable of bytes) entries.
+    Entries are compressed as they are read, nothing is held in full.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in entries:
+            with archive.open(name, 'w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Applications" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(XML_ILLEGAL_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_sheet(rows):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    ).encode()
+    for row in rows:
+        yield ('<row>' + ''.join(_xlsx_cell(value) for value in row) + '</row>').encode()
+    yield b'</sheetData></worksheet>'
+
+
+def stream_xlsx(rows):
+    """A one-sheet workbook; XML parts written as-is, the sheet streamed row by row"""
+    return stream_zip([
+        ('[Content_Types].xml', [XLSX_CONTENT_TYPES.encode()]),
+        ('_rels/.rels', [XLSX_ROOT_RELS.encode()]),
+        ('xl/workbook.xml', [XLSX_WORKBOOK.encode()]),
+        ('xl/_rels/workbook.xml.rels', [XLSX_WORKBOOK_RELS.encode()]),
+        ('xl/worksheets/sheet1.xml', _xlsx_sheet(rows)),
+    ])
+
+
+def _read_file(name):
+    with default_storage.open(name, 'rb') as handle:
+        while True:
+            chunk = handle.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def resume_entries(queryset):
+    """ZIP entries for every uploaded resume, named after the application"""
+    resumes = queryset.exclude(resume_file='').exclude(resume_file__isnull=True).values_list(
+        'id', 'user__username', 'resume_file'
+    )
+    for application_id, username, path in resumes.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        if not default_storage.exists(path):
+            continue
+        extension = os.path.splitext(path)[1]
+        yield f'resumes/{application_id}-{username}{extension}', _read_file(path)
+
+
+def stream_bundle(rows, queryset, file_format):
+    """ZIP with the application sheet plus every resume"""
+    def entries():
+        if file_format == 'xlsx':
+            # A workbook is itself a ZIP; its bytes go into the outer archive as they are produced
+            yield 'applications.xlsx', stream_xlsx(rows)
+        else:
+            yield 'applications.csv', (chunk.encode('utf-8') for chunk in stream_csv(rows))
+        yield from resume_entries(queryset)
+
+    return stream_zip(entries())
@@ -0,0 +1,222 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.search import fuzzy_match, search_jobs, tag_facets, update_search_vector
+
+BENCHMARK_USERNAME = 'job-search-benchmark'
+# Seeded jobs are drafts carrying this tag, so they never show up on the site
+BENCHMARK_TAG = 'search-benchmark'
+PAGE_SIZE = 12
+
+TITLES = [
+    'Python Developer', 'Backend Engineer', 'Security Analyst', 'Penetration Tester', 'DevOps Engineer',
+    'Frontend Developer', 'Data Engineer', 'SOC Analyst', 'Cloud Architect', 'Site Reliability Engineer',
+    'Machine Learning Engineer', 'Incident Responder', 'Product Designer', 'QA Automation Engineer',
+]
+SENIORITY = ['Junior', 'Senior', 'Lead', 'Staff', 'Principal', '']
+COMPANIES = [
+    'Google', 'Microsoft', 'Cloudflare', 'CrowdStrike', 'Palo Alto Networks', 'Datadog', 'Shopify',
+    'Stripe', 'Atlassian', 'Okta', 'Elastic', 'GitLab', 'Snyk', 'Tenable', 'Rapid7', 'Kaspersky',
+]
+LOCATIONS = [
+    'San Francisco, USA', 'New York, USA', 'London, UK', 'Berlin, Germany', 'Paris, France',
+    'Amsterdam, Netherlands', 'Toronto, Canada', 'Dubai, UAE', 'Cairo, Egypt', 'Riyadh, Saudi Arabia',
+    'Singapore', 'Bangalore, India', 'Sydney, Australia', 'Tokyo, Japan',
+]
+TAGS = [
+    'python', 'django', 'react', 'aws', 'kubernetes', 'docker', 'terraform', 'siem', 'splunk', 'golang',
+    'rust', 'postgresql', 'redis', 'linux', 'networking', 'owasp', 'burp-suite', 'malware-analysis',
+    'threat-hunting', 'ci-cd', 'graphql', 'typescript', 'azure', 'gcp', 'iso-27001',
+]
+WORDS = (
+    'build maintain secure scalable services across teams customers infrastructure monitoring '
+    'automation detection response platform reliability performance design review deploy '
+    'collaborate mentor analyze vulnerabilities incidents pipelines observability compliance '
+    'architecture testing tooling distributed systems data privacy identity access cloud'
+).split()
+
+# (label, legacy queryset builder, new queryset builder)
+SCENARIOS = [
+    (
+        'search "python developer"',
+        lambda qs: qs.filter(
+            Q(title__icontains='python developer') | Q(description__icontains='python developer') |
+            Q(company_name__icontains='python developer') | Q(requirements__icontains='python developer') |
+            Q(responsibilities__icontains='python developer')
+        ).order_by('-created_at'),
+        lambda qs: search_jobs(qs, 'python developer').order_by('-search_rank', '-created_at'),
+    ),
+    (
+        'search "incident response"',
+        lambda qs: qs.filter(
+            Q(title__icontains='incident response') | Q(description__icontains='incident response') |
+            Q(company_name__icontains='incident response') | Q(requirements__icontains='incident response') |
+            Q(responsibilities__icontains='incident response')
+        ).order_by('-created_at'),
+        lambda qs: search_jobs(qs, 'incident response').order_by('-search_rank', '-created_at'),
+    ),
+    (
+        'company "Cloudflare"',
+        lambda qs: qs.filter(company_name__icontains='Cloudflare').order_by('-created_at'),
+        lambda qs: qs.filter(fuzzy_match('company_name', 'Cloudflare')).order_by('-created_at'),
+    ),
+    (
+        'company typo "Crowdstrik"',
+        lambda qs: qs.filter(company_name__icontains='Crowdstrik').order_by('-created_at'),
+        lambda qs: qs.filter(fuzzy_match('company_name', 'Crowdstrik')).order_by('-created_at'),
+    ),
+    (
+        'location typo "San Fransisco"',
+        lambda qs: qs.filter(location__icontains='San Fransisco').order_by('-created_at'),
+        lambda qs: qs.filter(fuzzy_match('location', 'San Fransisco')).order_by('-created_at'),
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare icontains and full-text/trigram job search latency on a seeded dataset. '
+        'Seeding is refused on the default database unless DEBUG is on.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=200_000, help='Size of the seeded dataset')
+        parser.add_argument('--seed', action='store_true', help='Create benchmark jobs up to --jobs first')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the benchmark jobs and exit')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to seed and benchmark (e.g. a dedicated benchmark database)'
+        )
+
+    def handle(self, *args, **options):
+        database = options['database']
+        if database not in connections:
+            raise CommandError(f'Unknown database "{database}"')
+        user = self.get_benchmark_user(database)
+        benchmark_jobs = Job.objects.using(database).filter(posted_by=user, tags__contains=[BENCHMARK_TAG])
+
+        if options['cleanup']:
+            deleted, _ = benchmark_jobs.delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} benchmark rows'))
+            return
+
+        if options['seed']:
+            self.check_seed_allowed(database)
+            self.seed(benchmark_jobs, user, options['jobs'], options['batch_size'])
+
+        total = benchmark_jobs.count()
+        self.stdout.write(f'Benchmarking against {total} seeded jobs, {options["repeat"]} runs per query\n')
+        self.stdout.write(f'{"scenario":34} {"variant":10} {"median ms":>10} {"p95 ms":>10} {"matches":>9}')
+
+        base = benchmark_jobs
+        for label, legacy, current in SCENARIOS:
+            for variant, build in (('icontains', legacy), ('indexed', current)):
+                timings, matches = self.measure(build(base), options['repeat'])
+                self.stdout.write(
+                    f'{label:34} {variant:10} {self.median(timings):10.2f} {self.p95(timings):10.2f} {matches:9}'
+                )
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            tag_facets(search_jobs(base, 'engineer'))
+            timings.append((time.perf_counter() - started) * 1000)
+        label = 'tag facets for "engineer"'
+        self.stdout.write(
+            f'{label:34} {"grouped":10} {self.median(timings):10.2f} {self.p95(timings):10.2f}'
+        )
+
+    def check_seed_allowed(self, database):
+        """Seeding writes a large dataset, so keep it away from a production database"""
+        name = str(connections[database].settings_dict.get('NAME') or '')
+        if settings.DEBUG or database != DEFAULT_DB_ALIAS or name.startswith('test_'):
+            return
+        raise CommandError(
+            'Refusing to seed the default database with DEBUG off. '
+            'Pass --database with a dedicated benchmark database, or run with DEBUG=True.'
+        )
+
+    def get_benchmark_user(self, database):
+        User = get_user_model()
+        user, created = User.objects.db_manager(database).get_or_create(
+            username=BENCHMARK_USERNAME,
+            defaults={'email': f'{BENCHMARK_USERNAME}@example.com', 'is_active': False}
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=['password'])
+        return user
+
+    def seed(self, benchmark_jobs, user, target, batch_size):
+        database = benchmark_jobs.db
+        existing = benchmark_jobs.count()
+        missing = target - existing
+        if missing <= 0:
+            self.stdout.write(f'{existing} benchmark jobs already present')
+            return
+
+        rng = random.Random(42)
+        now = timezone.now()
+        self.stdout.write(f'Seeding {missing} jobs...')
+        for start in range(0, missing, batch_size):
+            jobs = [self.make_job(rng, user, now) for _ in range(min(batch_size, missing - start))]
+            created = Job.objects.using(database).bulk_create(jobs, batch_size=batch_size)
+            # bulk_create skips post_save, so fill the search vectors for this batch directly
+            update_search_vector(Job.objects.using(database).filter(pk__in=[job.pk for job in created]))
+            self.stdout.write(f'  {existing + start + len(jobs)}/{target}')
+
+        connection = connections[database]
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Job._meta.db_table)}')
+
+    def make_job(self, rng, user, now):
+        def sentence(count):
+            return ' '.join(rng.choice(WORDS) for _ in range(count)).capitalize() + '.'
+
+        title = f'{rng.choice(SENIORITY)} {rng.choice(TITLES)}'.strip()
+        return Job(
+            title=title,
+            description=' '.join(sentence(rng.randint(8, 16)) for _ in range(6)),
+            requirements=' '.join(sentence(rng.randint(6, 12)) for _ in range(4)),
+            responsibilities=' '.join(sentence(rng.randint(6, 12)) for _ in range(4)),
+            company_name=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            tags=rng.sample(TAGS, rng.randint(2, 6)) + [BENCHMARK_TAG],
+            is_remote=rng.random() < 0.3,
+            status='draft',
+            application_deadline=now + timedelta(days=rng.randint(1, 90)),
+            contact_email='jobs@example.com',
+            posted_by=user,
+        )
+
+    def measure(self, queryset, repeat):
+        """Time one listing page (rows plus count) the way the API fetches it"""
+        timings = []
+        matches = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset[:PAGE_SIZE])
+            matches = queryset.count()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, matches
+
+    @staticmethod
+    def median(timings):
+        return statistics.median(timings)
+
+    @staticmethod
+    def p95(timings):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
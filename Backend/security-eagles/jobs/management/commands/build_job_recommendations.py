@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import build_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the cached skill vectors of open jobs used for recommendations'
+
+    def handle(self, *args, **options):
+        index = build_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index['vectors'])} open jobs over {len(index['vocabulary'])} skills"
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Close published jobs whose application deadline has passed (run from cron, e.g. every 15 minutes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many jobs would be closed')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options['dry_run']:
+            count = Job.objects.filter(status='published', application_deadline__lte=now).count()
+            self.stdout.write(f'{count} jobs are past their deadline')
+            return
+
+        count = Job.objects.close_expired(now)
+        self.stdout.write(self.style.SUCCESS(f'Closed {count} expired jobs'))
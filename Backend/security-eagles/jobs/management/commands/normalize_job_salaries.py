@@ -0,0 +1,44 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min, Q
+
+from jobs.models import ExchangeRate, Job
+
+
+class Command(BaseCommand):
+    help = 'Backfill the annual-USD salary columns, optionally updating exchange rates first'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rate', action='append', default=[], metavar='CUR=USD',
+            help='Set an exchange rate before converting, e.g. --rate EUR=1.08 (repeatable)'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000, help='Jobs per UPDATE, by id range')
+
+    def handle(self, *args, **options):
+        for entry in options['rate']:
+            currency, _, value = entry.partition('=')
+            try:
+                rate = Decimal(value)
+            except InvalidOperation:
+                raise CommandError(f'Invalid rate "{entry}", expected CUR=USD like EUR=1.08')
+            if len(currency.strip()) != 3 or rate <= 0:
+                raise CommandError(f'Invalid rate "{entry}", expected CUR=USD like EUR=1.08')
+            ExchangeRate.objects.update_or_create(currency=currency.strip().upper(), defaults={'usd_rate': rate})
+
+        bounds = Job.objects.aggregate(first=Min('id'), last=Max('id'))
+        updated = 0
+        if bounds['first'] is not None:
+            batch_size = options['batch_size']
+            for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+                updated += Job.objects.filter(id__gte=start, id__lt=start + batch_size).normalize_salaries()
+
+        unconverted = Job.objects.filter(
+            Q(salary_min__isnull=False, salary_min_annual_usd__isnull=True) |
+            Q(salary_max__isnull=False, salary_max_annual_usd__isnull=True)
+        ).order_by().values_list('salary_currency', flat=True).distinct()
+        self.stdout.write(self.style.SUCCESS(f'Normalized salaries for {updated} jobs'))
+        missing = sorted(set(unconverted))
+        if missing:
+            self.stdout.write(self.style.WARNING(f'No exchange rate for: {", ".join(missing)}'))
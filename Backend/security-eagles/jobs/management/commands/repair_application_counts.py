@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from jobs.models import Job, active_application_count
+
+
+class Command(BaseCommand):
+    help = "Reset Job.application_count to the number of applications that aren't withdrawn"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only list jobs whose count has drifted')
+
+    def handle(self, *args, **options):
+        drifted = Job.objects.with_active_application_counts().exclude(application_count=F('active_applications'))
+
+        if options['dry_run']:
+            count = 0
+            for job_id, title, stored, actual in drifted.values_list(
+                'id', 'title', 'application_count', 'active_applications'
+            ).iterator():
+                self.stdout.write(f'Job {job_id} "{title}": {stored} counted, {actual} active')
+                count += 1
+            self.stdout.write(f'{count} jobs have a drifted application count')
+            return
+
+        count = Job.objects.filter(pk__in=drifted.values('pk')).update(
+            application_count=active_application_count()
+        )
+        self.stdout.write(self.style.SUCCESS(f'Repaired application counts of {count} jobs'))
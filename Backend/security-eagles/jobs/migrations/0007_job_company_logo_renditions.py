@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_update_category_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='company_logo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated size variants and WebP copies'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:48
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+
+def backfill_search_vectors(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    Job.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('company_name', weight='A', config='english')
+        + SearchVector(tags, weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+        + SearchVector('requirements', weight='D', config='english')
+        + SearchVector('responsibilities', weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_company_logo_renditions'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='job_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['company_name'], name='job_company_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['location'], name='job_location_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:52
+
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Value, When
+
+PERIODS_PER_YEAR = {'hourly': 2080, 'daily': 260, 'weekly': 52, 'monthly': 12, 'yearly': 1}
+
+
+def backfill_usd_salaries(apps, schema_editor):
+    # The rate table starts empty, so only USD salaries can be converted here;
+    # run normalize_job_salaries once rates are loaded for the rest.
+    Job = apps.get_model('jobs', 'Job')
+    output = DecimalField(max_digits=16, decimal_places=2)
+    periods = Case(*[When(salary_period=period, then=Value(count)) for period, count in PERIODS_PER_YEAR.items()])
+    Job.objects.filter(salary_currency__iexact='USD').update(
+        salary_min_annual_usd=ExpressionWrapper(F('salary_min') * periods, output_field=output),
+        salary_max_annual_usd=ExpressionWrapper(F('salary_max') * periods, output_field=output),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(help_text='ISO 4217 code, e.g. EUR', max_length=3, unique=True)),
+                ('usd_rate', models.DecimalField(decimal_places=8, help_text='USD for one unit of the currency', max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_annual_usd',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_annual_usd',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=16, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_min_annual_usd'], name='job_salary_min_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_max_annual_usd'], name='job_salary_max_usd_idx'),
+        ),
+        migrations.RunPython(backfill_usd_salaries, migrations.RunPython.noop),
+    ]
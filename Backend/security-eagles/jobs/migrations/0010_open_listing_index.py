@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:05
+
+from django.db import migrations, models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def close_expired_jobs(apps, schema_editor):
+    # Start the partial index small: jobs already past their deadline are closed now
+    Job = apps.get_model('jobs', 'Job')
+    now = timezone.now()
+    Job.objects.filter(status='published', application_deadline__lte=now).update(
+        status='closed', closed_at=Coalesce(F('closed_at'), Value(now)), updated_at=now
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_salary_normalization'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_expired_jobs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=Q(('closed_at__isnull', True), ('status', 'published')), fields=['-is_featured', '-is_urgent', '-created_at', '-id'], name='job_open_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def repair_application_counts(apps, schema_editor):
+    # Counts drifted while some views skipped or repeated the update
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    active = JobApplication.objects.filter(job=OuterRef('pk')).exclude(status='withdrawn').order_by().values(
+        'job'
+    ).annotate(total=Count('pk')).values('total')
+    Job.objects.update(application_count=Coalesce(Subquery(active), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_application_status_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('status', 'withdrawn'), _negated=True), fields=['job'], name='jobapp_active_job_idx'),
+        ),
+        migrations.RunPython(repair_application_counts, migrations.RunPython.noop),
+    ]
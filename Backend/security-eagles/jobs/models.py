@@ -1,8 +1,22 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Case, Count, DecimalField, Exists, F, OuterRef, Prefetch, Q, Subquery, Value, When
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import Coalesce, Greatest, Upper
 from django.utils import timezone
 
+from core.counters import CounterFieldsMixin
+from core.images import register_renditions
+
+class JobCategoryQuerySet(models.QuerySet):
+
+    def with_job_count(self):
+        return self.annotate(published_job_count=Count('jobs', filter=Q(jobs__status='published')))
+
 class JobCategory(models.Model):
     """Job categories for better organization"""
     name = models.CharField(max_length=100, unique=True)
@@ -10,6 +24,8 @@ class JobCategory(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = JobCategoryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Job Categories"
         ordering = ['name']
@@ -17,7 +33,124 @@ class JobCategory(models.Model):
     def __str__(self):
         return self.name
 
-class Job(models.Model):
+# Pay periods in a working year, used to annualize salaries
+PERIODS_PER_YEAR = {
+    'hourly': 2080,
+    'daily': 260,
+    'weekly': 52,
+    'monthly': 12,
+    'yearly': 1,
+}
+
+class ExchangeRate(models.Model):
+    """Local currency table used to normalize salaries to USD"""
+    currency = models.CharField(max_length=3, unique=True, help_text="ISO 4217 code, e.g. EUR")
+    usd_rate = models.DecimalField(max_digits=18, decimal_places=8, help_text="USD for one unit of the currency")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['currency']
+
+    def __str__(self):
+        return f"1 {self.currency} = {self.usd_rate} USD"
+
+    def save(self, *args, **kwargs):
+        self.currency = self.currency.upper()
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def rate_for(cls, currency):
+        """USD per unit of `currency`, or None when no rate is known"""
+        currency = (currency or '').upper()
+        if currency == 'USD':
+            return Decimal(1)
+        return cls.objects.filter(currency=currency).values_list('usd_rate', flat=True).first()
+
+def annual_usd(amount, period, rate):
+    """`amount` per `period` at `rate` USD per unit as yearly USD, or None if it can't be converted"""
+    if amount is None or rate is None or period not in PERIODS_PER_YEAR:
+        return None
+    return (Decimal(amount) * PERIODS_PER_YEAR[period] * rate).quantize(Decimal('0.01'))
+
+def active_application_count():
+    """Per-job count of applications that aren't withdrawn, read from the jobapp_active_job_idx partial index"""
+    active = JobApplication.objects.filter(job=OuterRef('pk')).exclude(status='withdrawn').order_by().values(
+        'job'
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(active), Value(0))
+
+
+class JobQuerySet(models.QuerySet):
+    """Query helpers for the job board"""
+
+    def open(self, now=None):
+        """Published jobs still taking applications, served by the job_open_listing_idx partial index"""
+        return self.filter(
+            status='published', closed_at__isnull=True, application_deadline__gt=now or timezone.now()
+        )
+
+    def close_expired(self, now=None):
+        """Close published jobs past their deadline in one UPDATE; returns the count"""
+        now = now or timezone.now()
+        return self.filter(status='published', application_deadline__lte=now).update(
+            status='closed', closed_at=Coalesce(F('closed_at'), Value(now)), updated_at=now
+        )
+
+    def normalize_salaries(self):
+        """
+        Recompute the annual-USD salary columns in one UPDATE, reading rates
+        from ExchangeRate. Jobs in a currency without a rate get NULL and
+        drop out of salary filters rather than matching wrongly.
+        """
+        output = DecimalField(max_digits=16, decimal_places=2)
+        periods = Case(
+            *[When(salary_period=period, then=Value(count)) for period, count in PERIODS_PER_YEAR.items()],
+            default=None,
+        )
+        rate = Case(
+            When(salary_currency__iexact='USD', then=Value(Decimal(1))),
+            default=Subquery(
+                ExchangeRate.objects.filter(currency=Upper(OuterRef('salary_currency'))).values('usd_rate')[:1]
+            ),
+            output_field=DecimalField(max_digits=18, decimal_places=8),
+        )
+        return self.update(
+            salary_min_annual_usd=models.ExpressionWrapper(F('salary_min') * periods * rate, output_field=output),
+            salary_max_annual_usd=models.ExpressionWrapper(F('salary_max') * periods * rate, output_field=output),
+        )
+
+    def shift_application_count(self, delta):
+        """Add `delta` to application_count in place; never drops below zero"""
+        return self.update(application_count=Greatest(F('application_count') + delta, Value(0)))
+
+    def with_active_application_counts(self):
+        """Annotate `active_applications`, the number application_count should hold"""
+        return self.annotate(active_applications=active_application_count())
+
+    def with_user_state(self, user, include_application=False):
+        """
+        Annotate whether `user` applied (`user_has_applied`), or with
+        `include_application` prefetch their application as `user_applications`,
+        so job serializers don't query per job.
+        """
+        queryset = self.select_related('category', 'posted_by')
+        if not user or not user.is_authenticated:
+            return queryset.annotate(user_has_applied=Value(False))
+
+        if include_application:
+            # One query per page; is_applied is derived from the prefetched rows
+            return queryset.prefetch_related(Prefetch(
+                'applications',
+                queryset=JobApplication.objects.filter(user=user).only(
+                    'id', 'job_id', 'status', 'created_at', 'updated_at'
+                ),
+                to_attr='user_applications',
+            ))
+        return queryset.annotate(
+            user_has_applied=Exists(JobApplication.objects.filter(job=OuterRef('pk'), user=user))
+        )
+
+class Job(CounterFieldsMixin, models.Model):
     # Job Type Choices
     JOB_TYPE_CHOICES = [
         ('job', 'Job'),
@@ -72,6 +205,7 @@ class Job(models.Model):
     company_description = models.TextField(blank=True, help_text="About the company")
     company_website = models.URLField(blank=True, null=True)
     company_logo = models.ImageField(upload_to='company_logos/', blank=True, null=True)
+    company_logo_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     company_size = models.CharField(max_length=50, blank=True, help_text="e.g., 1-10, 11-50, 51-200, 200+")
 
     # Location and Remote
@@ -94,6 +228,9 @@ class Job(models.Model):
         ('monthly', 'Per Month'),
         ('yearly', 'Per Year'),
     ], default='yearly')
+    # salary_min/max converted to yearly USD; kept in sync on save for range filters
+    salary_min_annual_usd = models.DecimalField(max_digits=16, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max_annual_usd = models.DecimalField(max_digits=16, decimal_places=2, null=True, blank=True, editable=False)
 
     # Application Details
     application_deadline = models.DateTimeField()
@@ -118,12 +255,33 @@ class Job(models.Model):
     published_at = models.DateTimeField(null=True, blank=True)
     closed_at = models.DateTimeField(blank=True, null=True)
 
+    # Weighted full-text document, maintained by jobs.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    SALARY_FIELDS = ('salary_min', 'salary_max', 'salary_currency', 'salary_period')
+    # Maintained with F() updates (applications, detail views); see core/counters.py
+    COUNTER_FIELDS = ('application_count', 'view_count')
+
     class Meta:
         ordering = ['-is_featured', '-is_urgent', '-created_at']
         indexes = [
             models.Index(fields=['status', 'job_type']),
             models.Index(fields=['category', 'experience_level']),
             models.Index(fields=['is_remote', 'location']),
+            GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+            GinIndex(fields=['tags'], name='job_tags_gin'),
+            GinIndex(fields=['company_name'], name='job_company_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='job_location_trgm', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['salary_min_annual_usd'], name='job_salary_min_usd_idx'),
+            models.Index(fields=['salary_max_annual_usd'], name='job_salary_max_usd_idx'),
+            # Open listings in default order; expired jobs leave it once close_expired_jobs runs
+            models.Index(
+                fields=['-is_featured', '-is_urgent', '-created_at', '-id'],
+                name='job_open_listing_idx',
+                condition=Q(status='published', closed_at__isnull=True),
+            ),
         ]
 
     def __str__(self):
@@ -132,8 +290,22 @@ class Job(models.Model):
     def save(self, *args, **kwargs):
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.SALARY_FIELDS):
+            self.normalize_salary()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'salary_min_annual_usd', 'salary_max_annual_usd'}
         super().save(*args, **kwargs)
 
+    def normalize_salary(self):
+        """Fill the annual-USD columns from the posted salary"""
+        rate = None
+        if self.salary_min is not None or self.salary_max is not None:
+            rate = ExchangeRate.rate_for(self.salary_currency)
+        self.salary_min_annual_usd = annual_usd(self.salary_min, self.salary_period, rate)
+        self.salary_max_annual_usd = annual_usd(self.salary_max, self.salary_period, rate)
+
     @property
     def is_active(self):
         """Check if job is currently active for applications"""
@@ -213,6 +385,8 @@ class JobApplication(models.Model):
         indexes = [
             models.Index(fields=['job', 'status']),
             models.Index(fields=['user', 'status']),
+            # Applications counted in Job.application_count
+            models.Index(fields=['job'], name='jobapp_active_job_idx', condition=~Q(status='withdrawn')),
         ]
 
     def __str__(self):
@@ -238,13 +412,51 @@ class JobApplication(models.Model):
                 'applied_at': timezone.now().isoformat(),
             }
 
-        # Set reviewed_at when status changes from pending
-        if self.pk:
-            old_instance = JobApplication.objects.get(pk=self.pk)
-            if old_instance.status == 'pending' and self.status != 'pending' and not self.reviewed_at:
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        writes_status = update_fields is None or 'status' in update_fields
+
+        with transaction.atomic():
+            previous = None
+            if not adding and writes_status:
+                # Lock the row and read the stored status: this instance may have been loaded
+                # before another change (e.g. a withdrawal), and the counter must follow the row
+                previous = (
+                    JobApplication.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list('status', flat=True)
+                    .first()
+                )
+
+            changed = previous is not None and previous != self.status
+            if changed and previous == 'pending' and not self.reviewed_at:
                 self.reviewed_at = timezone.now()
-
-        super().save(*args, **kwargs)
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {'reviewed_at'}
+
+            # Job.application_count counts applications that aren't withdrawn
+            if adding or (writes_status and previous is None):
+                # New row, or one that no longer exists and is inserted again
+                delta = int(self.is_counted(self.status))
+            elif changed:
+                delta = int(self.is_counted(self.status)) - int(self.is_counted(previous))
+            else:
+                delta = 0
+
+            super().save(*args, **kwargs)
+            if delta:
+                Job.objects.filter(pk=self.job_id).shift_application_count(delta)
+            if changed:
+                JobApplicationStatusChange.objects.create(
+                    application=self,
+                    from_status=previous,
+                    to_status=self.status,
+                    changed_by=getattr(self, '_status_changed_by', None),
+                )
+
+    @staticmethod
+    def is_counted(status):
+        return status != 'withdrawn'
 
     @property
     def applicant_name(self):
@@ -260,6 +472,24 @@ class JobApplication(models.Model):
         return delta.days
 
 
+class JobApplicationStatusChange(models.Model):
+    """One status transition of an application (see jobs/workflow.py)"""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_changes')
+    from_status = models.CharField(max_length=30, choices=JobApplication.STATUS_CHOICES)
+    to_status = models.CharField(max_length=30, choices=JobApplication.STATUS_CHOICES)
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-changed_at']
+        indexes = [
+            models.Index(fields=['application', 'changed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+
 class JobView(models.Model):
     """Track job page views for analytics"""
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='view_records')
@@ -289,3 +519,6 @@ class JobPost(models.Model):
 
     def __str__(self):
         return f"{self.user.username} applied to {self.job.title}"
+
+
+register_renditions(Job, 'company_logo', 'company_logo_renditions')
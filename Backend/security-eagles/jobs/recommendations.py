@@ -0,0 +1,338 @@
+"""
+Skill-based job recommendations.
+
+Jobs and users are described by sparse skill vectors ({skill: weight},
+L2-normalized):
+- a job's skills come from its tags, plus known skills mentioned in its
+  requirements
+- a user's skills come from completed labs (category and tags), tags of
+  learning paths they finished or are following, and any ``skills`` /
+  ``interests`` listed in their ``meta_data``
+
+Each open job's vector is cached under its own key, next to a version key
+naming the current state of the index. A job change writes only that job's
+key and a new version (see jobs/signals.py), so concurrent changes never
+overwrite each other. Each process keeps its own copy of the index, and of
+the dense job x skill matrix built from it, until the version changes; it
+then reloads the open job ids from the database and their vectors with one
+``get_many``, computing only the missing ones. Changes reach other workers
+only through a shared cache backend (Redis/Memcached); with the default
+per-process LocMemCache they see a change once INDEX_TTL has passed.
+Scoring a user is then one matrix-vector product: NumPy when it is
+installed, a plain sparse dot product otherwise. A user's top-K is cached
+against the index version and their vector, so it is recomputed only when
+either changes.
+"""
+import hashlib
+import json
+import math
+import re
+import threading
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Q
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional speed-up
+    numpy = None
+
+from labs.models import Lab, UserLab
+from learnings.models import UserLearningProgress
+
+from .models import Job, JobApplication
+
+VERSION_KEY = 'jobs:recommend:version'
+VOCABULARY_KEY = 'jobs:recommend:vocabulary'
+JOB_VECTOR_KEY = 'jobs:recommend:job:{job_id}'
+INDEX_TTL = 60 * 60
+USER_VECTOR_KEY = 'jobs:recommend:user:{user_id}'
+USER_VECTOR_TTL = 60 * 60
+TOP_K_KEY = 'jobs:recommend:top:{user_id}:{index_version}:{user_hash}'
+TOP_K_TTL = 15 * 60
+# Scored jobs kept per user; applied-to and expired jobs are dropped when serving
+MAX_RECOMMENDATIONS = 100
+
+TAG_WEIGHT = 1.0
+REQUIREMENT_WEIGHT = 0.5
+LAB_CATEGORY_WEIGHT = 1.0
+LAB_TAG_WEIGHT = 0.5
+PATH_COMPLETED_WEIGHT = 1.0
+PATH_IN_PROGRESS_WEIGHT = 0.5
+PROFILE_WEIGHT = 1.0
+
+WORD = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+
+def skill(term):
+    """Canonical skill name: 'Web Security' and 'web_security' both become 'web-security'"""
+    return re.sub(r'[\s_]+', '-', str(term).strip().lower()).strip('-.')
+
+
+def normalized(weights):
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in weights.items() if weight}
+
+
+def mentioned_skills(text, vocabulary):
+    """Known skills appearing in free text, as single words or two-word phrases"""
+    words = WORD.findall((text or '').lower())
+    found = Counter(word.strip('.') for word in words if word.strip('.') in vocabulary)
+    found.update(f'{first}-{second}' for first, second in zip(words, words[1:]) if f'{first}-{second}' in vocabulary)
+    return found
+
+
+def job_vector(tags, requirements, vocabulary):
+    weights = Counter()
+    for tag in tags or []:
+        weights[skill(tag)] += TAG_WEIGHT
+    for term, count in mentioned_skills(requirements, vocabulary).items():
+        weights[term] += min(count * REQUIREMENT_WEIGHT, TAG_WEIGHT)
+    return normalized(weights)
+
+
+def skill_vocabulary(tag_lists=()):
+    """Skills worth spotting in requirements: every job tag and lab category"""
+    vocabulary = {skill(value) for value, _ in Lab.CATEGORY_CHOICES}
+    for tags in tag_lists:
+        vocabulary.update(skill(tag) for tag in tags or [])
+    vocabulary.discard('')
+    return vocabulary
+
+
+# Job index
+
+def _job_key(job_id):
+    return JOB_VECTOR_KEY.format(job_id=job_id)
+
+
+def _new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def _bump_version():
+    version = _new_version()
+    cache.set(VERSION_KEY, version, INDEX_TTL)
+    return version
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = _new_version()
+        cache.add(VERSION_KEY, version, INDEX_TTL)
+        version = cache.get(VERSION_KEY) or version
+    return version
+
+
+def get_vocabulary():
+    vocabulary = cache.get(VOCABULARY_KEY)
+    if vocabulary is None:
+        vocabulary = skill_vocabulary(Job.objects.open().values_list('tags', flat=True))
+        cache.set(VOCABULARY_KEY, vocabulary, INDEX_TTL)
+    return vocabulary
+
+
+def build_index():
+    """Recompute the vectors of all open jobs and start a new index version"""
+    rows = list(Job.objects.open().values_list('id', 'tags', 'requirements'))
+    vocabulary = skill_vocabulary(tags for _, tags, _ in rows)
+    vectors = {job_id: job_vector(tags, requirements, vocabulary) for job_id, tags, requirements in rows}
+    cache.set(VOCABULARY_KEY, vocabulary, INDEX_TTL)
+    cache.set_many({_job_key(job_id): vector for job_id, vector in vectors.items()}, INDEX_TTL)
+    return {'version': _bump_version(), 'vocabulary': sorted(vocabulary), 'vectors': vectors}
+
+
+def _load_index(version):
+    """Vectors of the open jobs from their cache keys, computing only the missing ones"""
+    job_ids = list(Job.objects.open().values_list('id', flat=True))
+    cached = cache.get_many([_job_key(job_id) for job_id in job_ids])
+    vectors = {}
+    missing = []
+    for job_id in job_ids:
+        vector = cached.get(_job_key(job_id))
+        if vector is None:
+            missing.append(job_id)
+        else:
+            vectors[job_id] = vector
+
+    if missing:
+        vocabulary = get_vocabulary()
+        computed = {
+            job_id: job_vector(tags, requirements, vocabulary)
+            for job_id, tags, requirements in Job.objects.filter(pk__in=missing).values_list(
+                'id', 'tags', 'requirements'
+            )
+        }
+        cache.set_many({_job_key(job_id): vector for job_id, vector in computed.items()}, INDEX_TTL)
+        vectors.update(computed)
+    return {'version': version, 'vectors': vectors}
+
+
+class _LocalIndex:
+    """This process's copy of the index, reloaded when the shared version changes"""
+    lock = threading.Lock()
+    index = None
+
+
+def get_index():
+    version = current_version()
+    with _LocalIndex.lock:
+        if _LocalIndex.index is None or _LocalIndex.index['version'] != version:
+            _LocalIndex.index = _load_index(version)
+        return _LocalIndex.index
+
+
+def refresh_job(job):
+    """Rewrite one job's cached vector (or drop it once the job is no longer open)"""
+    key = _job_key(job.pk)
+    if Job.objects.open().filter(pk=job.pk).exists():
+        vocabulary = get_vocabulary() | {skill(tag) for tag in job.tags or []}
+        vector = job_vector(job.tags, job.requirements, vocabulary)
+        if cache.get(key) == vector:
+            return
+        cache.set(key, vector, INDEX_TTL)
+    elif not cache.delete(key):
+        return
+    _bump_version()
+
+
+def forget_job(job_id):
+    if cache.delete(_job_key(job_id)):
+        _bump_version()
+
+
+class _Matrix:
+    """Dense job x skill matrix for one index version, kept per process"""
+    lock = threading.Lock()
+    version = None
+    job_ids = []
+    columns = {}
+    values = None
+
+    @classmethod
+    def for_index(cls, index):
+        with cls.lock:
+            if cls.version != index['version']:
+                cls.job_ids = list(index['vectors'])
+                cls.columns = {term: column for column, term in enumerate(
+                    sorted({term for vector in index['vectors'].values() for term in vector})
+                )}
+                if numpy is not None:
+                    values = numpy.zeros((len(cls.job_ids), len(cls.columns)), dtype=numpy.float32)
+                    for row, job_id in enumerate(cls.job_ids):
+                        for term, weight in index['vectors'][job_id].items():
+                            values[row, cls.columns[term]] = weight
+                    cls.values = values
+                cls.version = index['version']
+            return cls.job_ids, cls.columns, cls.values
+
+
+def score_jobs(index, user_vector):
+    """(job id, score) for every indexed job sharing at least one skill with the user"""
+    if not user_vector:
+        return []
+    if numpy is None:
+        return [
+            (job_id, score)
+            for job_id, vector in index['vectors'].items()
+            if (score := sum(weight * vector.get(term, 0.0) for term, weight in user_vector.items())) > 0
+        ]
+
+    job_ids, columns, values = _Matrix.for_index(index)
+    query = numpy.zeros(len(columns), dtype=numpy.float32)
+    for term, weight in user_vector.items():
+        if term in columns:
+            query[columns[term]] = weight
+    scores = values @ query
+    matches = numpy.nonzero(scores > 0)[0]
+    return [(job_ids[row], float(scores[row])) for row in matches]
+
+
+# Users
+
+def compute_user_vector(user):
+    weights = Counter()
+
+    completed_labs = UserLab.objects.filter(user=user).filter(
+        Q(status='completed') | Q(is_passed=True)
+    ).values_list('lab_id', 'lab__category', 'lab__tags').distinct()
+    for _, category, tags in completed_labs:
+        weights[skill(category)] += LAB_CATEGORY_WEIGHT
+        for tag in tags or []:
+            weights[skill(tag)] += LAB_TAG_WEIGHT
+
+    paths = UserLearningProgress.objects.filter(user=user).exclude(status='not_started').values_list(
+        'status', 'learning_path__tags', 'learning_path__category'
+    )
+    for status, tags, category in paths:
+        weight = PATH_COMPLETED_WEIGHT if status == 'completed' else PATH_IN_PROGRESS_WEIGHT
+        weights[skill(category)] += weight
+        for tag in tags or []:
+            weights[skill(tag)] += weight
+
+    meta_data = user.meta_data if isinstance(user.meta_data, dict) else {}
+    for key in ('skills', 'interests'):
+        values = meta_data.get(key) or []
+        if isinstance(values, str):
+            values = values.split(',')
+        if isinstance(values, list):
+            for value in values:
+                if isinstance(value, str) and value.strip():
+                    weights[skill(value)] += PROFILE_WEIGHT
+
+    weights.pop('', None)
+    # Dampen long histories so one heavily practised skill doesn't drown the rest
+    return normalized({term: math.log1p(weight) for term, weight in weights.items()})
+
+
+def get_user_vector(user):
+    key = USER_VECTOR_KEY.format(user_id=user.pk)
+    vector = cache.get(key)
+    if vector is None:
+        vector = compute_user_vector(user)
+        cache.set(key, vector, USER_VECTOR_TTL)
+    return vector
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_VECTOR_KEY.format(user_id=user_id))
+
+
+def top_matches(user):
+    """Best matching indexed jobs as [(job id, score)], highest first, from cache when current"""
+    index = get_index()
+    user_vector = get_user_vector(user)
+    user_hash = hashlib.sha1(json.dumps(user_vector, sort_keys=True).encode()).hexdigest()[:12]
+    key = TOP_K_KEY.format(user_id=user.pk, index_version=index['version'], user_hash=user_hash)
+
+    top = cache.get(key)
+    if top is None:
+        scored = score_jobs(index, user_vector)
+        scored.sort(key=lambda item: (-item[1], -item[0]))
+        top = scored[:MAX_RECOMMENDATIONS]
+        cache.set(key, top, TOP_K_TTL)
+    return top
+
+
+def recommend(user, limit=10):
+    """
+    Open jobs the user hasn't applied to, best match first, each with a
+    `match_score` attribute.
+    """
+    scores = dict(top_matches(user))
+    if not scores:
+        return []
+    applied = set(JobApplication.objects.filter(user=user, job_id__in=scores).values_list('job_id', flat=True))
+    # A few spares in case some jobs expired since the index was built
+    candidates = [job_id for job_id in scores if job_id not in applied][:limit * 2]
+
+    jobs = Job.objects.open().filter(pk__in=candidates).with_user_state(user)
+    ranked = sorted(jobs, key=lambda job: (-scores[job.pk], -job.pk))[:limit]
+    for job in ranked:
+        job.match_score = round(scores[job.pk], 4)
+    return ranked
@@ -0,0 +1,71 @@
+"""
+Full-text job search.
+
+Each job keeps a weighted ``search_vector`` (title and company name >
+tags > description > requirements/responsibilities), refreshed after save
+(see jobs/signals.py) and matched through a GIN index. Company and location
+filters combine substring and trigram similarity, both served by trigram
+GIN indexes, so near-miss spellings ("Gogle", "San Fransisco") still match.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import F, Func, Q, TextField, Value
+
+SEARCH_CONFIG = 'english'
+
+# Fields that feed the search vector; saving any of them refreshes it
+SEARCH_FIELDS = ('title', 'company_name', 'tags', 'description', 'requirements', 'responsibilities')
+
+TAG_FACET_LIMIT = 20
+
+
+def search_vector_expression():
+    tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('company_name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(tags, weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        + SearchVector('requirements', weight='D', config=SEARCH_CONFIG)
+        + SearchVector('responsibilities', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(queryset):
+    """Recompute stored search vectors in a single UPDATE"""
+    return queryset.update(search_vector=search_vector_expression())
+
+
+def search_jobs(queryset, terms):
+    """Jobs matching web-search style `terms`, annotated with `search_rank`"""
+    query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F('search_vector'), query))
+
+
+def fuzzy_match(field_name, value):
+    """Substring or trigram-similar match on a trigram-indexed column"""
+    return Q(**{f'{field_name}__icontains': value}) | Q(**{f'{field_name}__trigram_similar': value})
+
+
+def tag_facets(queryset, limit=TAG_FACET_LIMIT):
+    """Most common tags among the filtered jobs, counted in one grouped query"""
+    try:
+        sql, params = queryset.order_by().values('tags').query.sql_with_params()
+    except EmptyResultSet:
+        # e.g. .none(), or a filter that can never match; there is nothing to count
+        return []
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT tag, COUNT(*) FROM (
+                SELECT unnest(matched.tags) AS tag FROM ({sql}) AS matched
+            ) AS job_tags
+            GROUP BY tag
+            ORDER BY COUNT(*) DESC, tag
+            LIMIT %s
+            """,
+            [*params, limit],
+        )
+        return [{'value': tag, 'count': count} for tag, count in cursor.fetchall()]
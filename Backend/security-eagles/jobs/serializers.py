@@ -1,9 +1,48 @@
 from rest_framework import serializers
+from core.images import build_srcset
+from core.uploads import completed_file
 from .models import JobCategory, Job, JobApplication, JobView, JobPost
+from . import workflow
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+class UserApplicationMixin:
+    """
+    is_applied / user_application from JobQuerySet.with_user_state annotations,
+    falling back to a query for querysets that weren't annotated.
+    """
+
+    def _user(self):
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return request.user
+        return None
+
+    def get_is_applied(self, obj):
+        if hasattr(obj, 'user_applications'):
+            return bool(obj.user_applications)
+        if hasattr(obj, 'user_has_applied'):
+            return obj.user_has_applied
+        user = self._user()
+        return bool(user) and JobApplication.objects.filter(job=obj, user=user).exists()
+
+    def get_user_application(self, obj):
+        if hasattr(obj, 'user_applications'):
+            application = obj.user_applications[0] if obj.user_applications else None
+        else:
+            user = self._user()
+            application = JobApplication.objects.filter(job=obj, user=user).first() if user else None
+
+        if application is None:
+            return None
+        return {
+            'id': application.id,
+            'status': application.status,
+            'created_at': application.created_at,
+            'updated_at': application.updated_at,
+        }
+
 class JobCategorySerializer(serializers.ModelSerializer):
     job_count = serializers.SerializerMethodField()
 
@@ -12,13 +51,17 @@ class JobCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'job_count', 'is_active']
 
     def get_job_count(self, obj):
+        # Annotated by JobCategoryQuerySet.with_job_count
+        if hasattr(obj, 'published_job_count'):
+            return obj.published_job_count
         return obj.jobs.filter(status='published').count()
 
-class JobListSerializer(serializers.ModelSerializer):
+class JobListSerializer(UserApplicationMixin, serializers.ModelSerializer):
     """Serializer for job list view with essential fields"""
     is_applied = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     company_logo_url = serializers.SerializerMethodField()
+    company_logo_srcset = serializers.SerializerMethodField()
     salary_range_display = serializers.ReadOnlyField()
     days_until_deadline = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
@@ -26,19 +69,13 @@ class JobListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = [
-            'id', 'title', 'company_name', 'company_logo_url', 'location',
+            'id', 'title', 'company_name', 'company_logo_url', 'company_logo_srcset', 'location',
             'job_type', 'employment_type', 'experience_level', 'category_name',
             'is_remote', 'remote_type', 'salary_range_display', 'tags',
             'application_deadline', 'days_until_deadline', 'is_featured', 'is_urgent',
             'application_count', 'view_count', 'is_applied', 'is_active', 'created_at'
         ]
 
-    def get_is_applied(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return JobApplication.objects.filter(job=obj, user=request.user).exists()
-        return False
-
     def get_company_logo_url(self, obj):
         if obj.company_logo and hasattr(obj.company_logo, 'url'):
             request = self.context.get('request')
@@ -47,12 +84,16 @@ class JobListSerializer(serializers.ModelSerializer):
             return obj.company_logo.url
         return None
 
-class JobDetailSerializer(serializers.ModelSerializer):
+    def get_company_logo_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.company_logo_renditions, obj.company_logo)
+
+class JobDetailSerializer(UserApplicationMixin, serializers.ModelSerializer):
     """Serializer for detailed job view"""
     is_applied = serializers.SerializerMethodField()
     user_application = serializers.SerializerMethodField()
     category_name = serializers.CharField(source='category.name', read_only=True)
     company_logo_url = serializers.SerializerMethodField()
+    company_logo_srcset = serializers.SerializerMethodField()
     salary_range_display = serializers.ReadOnlyField()
     days_until_deadline = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
@@ -60,33 +101,13 @@ class JobDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ['search_vector', 'salary_min_annual_usd', 'salary_max_annual_usd']
+        read_only_fields = ['application_count', 'view_count']
         extra_fields = [
-            'is_applied', 'user_application', 'category_name', 'company_logo_url',
+            'is_applied', 'user_application', 'category_name', 'company_logo_url', 'company_logo_srcset',
             'salary_range_display', 'days_until_deadline', 'is_active', 'posted_by_name'
         ]
 
-    def get_is_applied(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return JobApplication.objects.filter(job=obj, user=request.user).exists()
-        return False
-
-    def get_user_application(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            try:
-                application = JobApplication.objects.get(job=obj, user=request.user)
-                return {
-                    'id': application.id,
-                    'status': application.status,
-                    'created_at': application.created_at,
-                    'updated_at': application.updated_at,
-                }
-            except JobApplication.DoesNotExist:
-                pass
-        return None
-
     def get_company_logo_url(self, obj):
         if obj.company_logo and hasattr(obj.company_logo, 'url'):
             request = self.context.get('request')
@@ -95,6 +116,9 @@ class JobDetailSerializer(serializers.ModelSerializer):
             return obj.company_logo.url
         return None
 
+    def get_company_logo_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.company_logo_renditions, obj.company_logo)
+
 class JobApplicationSerializer(serializers.ModelSerializer):
     """Serializer for job applications"""
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -113,10 +137,25 @@ class JobApplicationSerializer(serializers.ModelSerializer):
 
 class JobApplicationCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating job applications"""
+    # A completed chunked upload (see /api/users/uploads/), used instead of a multipart resume_file
+    resume_upload = serializers.UUIDField(write_only=True, required=False)
 
     class Meta:
         model = JobApplication
-        fields = ['job', 'cover_letter', 'resume_file', 'portfolio_links']
+        fields = ['job', 'cover_letter', 'resume_file', 'portfolio_links', 'resume_upload']
+
+    def validate_resume_upload(self, value):
+        stored = completed_file(value, self.context['request'].user)
+        if stored is None:
+            raise serializers.ValidationError("Upload not found or not completed.")
+        return stored
+
+    def create(self, validated_data):
+        stored = validated_data.pop('resume_upload', None)
+        if stored is not None:
+            # Point at the shared content-addressed file instead of storing another copy
+            validated_data['resume_file'] = stored.file.name
+        return super().create(validated_data)
 
     def validate_job(self, value):
         """Validate that user hasn't already applied to this job"""
@@ -141,22 +180,34 @@ class JobApplicationAdminSerializer(serializers.ModelSerializer):
         model = JobApplication
         fields = '__all__'
 
+    def validate_status(self, value):
+        if self.instance and not workflow.can_transition(self.instance.status, value):
+            raise serializers.ValidationError(
+                f"Can't move an application from {self.instance.status} to {value}."
+            )
+        return value
+
+    def update(self, instance, validated_data):
+        instance._status_changed_by = self.context['request'].user
+        return super().update(instance, validated_data)
+
+class JobApplicationBulkStatusSerializer(serializers.Serializer):
+    """Move many applications to one status"""
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES)
+
 # Legacy serializers for backward compatibility
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(UserApplicationMixin, serializers.ModelSerializer):
     """Legacy serializer - use JobListSerializer or JobDetailSerializer instead"""
     is_applied = serializers.SerializerMethodField()
     application_count = serializers.IntegerField(read_only=True)
     logo_url = serializers.SerializerMethodField()
+    company_logo_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Job
-        fields = '__all__'
-
-    def get_is_applied(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return JobApplication.objects.filter(job=obj, user=request.user).exists()
-        return False
+        exclude = ['search_vector', 'salary_min_annual_usd', 'salary_max_annual_usd']
+        read_only_fields = ['view_count']
 
     def get_logo_url(self, obj):
         if obj.company_logo and hasattr(obj.company_logo, 'url'):
@@ -166,6 +217,9 @@ class JobSerializer(serializers.ModelSerializer):
             return obj.company_logo.url
         return None
 
+    def get_company_logo_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.company_logo_renditions, obj.company_logo)
+
 class JobPostSerializer(serializers.ModelSerializer):
     """Legacy serializer - use JobApplicationSerializer instead"""
     class Meta:
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from labs.models import UserLab
+from learnings.models import UserLearningProgress
+
+from . import recommendations
+from .models import ExchangeRate, Job, JobApplication
+from .search import SEARCH_FIELDS, update_search_vector
+
+
+@receiver(post_save, sender=Job)
+def refresh_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute the stored search document when searchable text changes"""
+    if raw:
+        return
+    if update_fields is not None and not set(SEARCH_FIELDS).intersection(update_fields):
+        return
+    update_search_vector(Job.objects.filter(pk=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=ExchangeRate)
+def renormalize_salaries(sender, instance, raw=False, **kwargs):
+    """Re-convert salaries posted in a currency whose rate changed"""
+    if raw:
+        return
+    Job.objects.filter(salary_currency__iexact=instance.currency).normalize_salaries()
+
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_deleted_application(sender, instance, **kwargs):
+    """Deleting an application that was still counted lowers its job's application_count"""
+    if JobApplication.is_counted(instance.status):
+        Job.objects.filter(pk=instance.job_id).shift_application_count(-1)
+
+
+# Recommendation vectors
+
+@receiver(post_save, sender=Job)
+def refresh_job_recommendations(sender, instance, raw=False, **kwargs):
+    if not raw:
+        recommendations.refresh_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def drop_job_recommendations(sender, instance, **kwargs):
+    recommendations.forget_job(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserLab)
+@receiver([post_save, post_delete], sender=UserLearningProgress)
+def refresh_user_skills(sender, instance, raw=False, **kwargs):
+    """Lab attempts and learning progress change the user's skill vector"""
+    if not raw:
+        recommendations.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_profile_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'meta_data' not in update_fields):
+        return
+    recommendations.invalidate_user(instance.pk)
@@ -1,10 +1,11 @@
 from django.urls import path
 from .views import (
     # New comprehensive views
-    JobCategoryListView, JobListView, JobDetailView,
+    JobCategoryListView, JobListView, JobDetailView, JobRecommendationView,
     JobApplicationCreateView, JobApplicationListView, JobApplicationDetailView,
     JobApplicationWithdrawView, JobAdminListView, JobAdminDetailView,
-    JobApplicationAdminListView, JobApplicationAdminDetailView,
+    JobApplicationAdminListView, JobApplicationAdminDetailView, JobApplicationExportView,
+    JobApplicationBulkStatusView,
     # Legacy views for backward compatibility
     JobListCreateView, JobApplyView, JobUnapplyView
 )
@@ -15,6 +16,7 @@ urlpatterns = [
 
     # Public Job Views
     path('', JobListView.as_view(), name='job-list'),
+    path('recommended/', JobRecommendationView.as_view(), name='job-recommended'),
     path('<int:id>/', JobDetailView.as_view(), name='job-detail'),
 
     # Job Applications
@@ -28,6 +30,8 @@ urlpatterns = [
     path('admin/jobs/<int:pk>/', JobAdminDetailView.as_view(), name='job-admin-detail'),
     path('admin/applications/', JobApplicationAdminListView.as_view(), name='job-application-admin-list'),
     path('admin/applications/<int:pk>/', JobApplicationAdminDetailView.as_view(), name='job-application-admin-detail'),
+    path('admin/applications/bulk-status/', JobApplicationBulkStatusView.as_view(), name='job-application-bulk-status'),
+    path('admin/applications/export/', JobApplicationExportView.as_view(), name='job-application-export'),
 
     # Legacy endpoints for backward compatibility
     path('legacy/', JobListCreateView.as_view(), name='job-list-create-legacy'),
@@ -1,19 +1,29 @@
+from datetime import datetime, time
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, generics
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Q, F
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 from rest_framework.pagination import PageNumberPagination
 
-from .models import JobCategory, Job, JobApplication, JobView, JobPost
+from core.pagination import KeysetPaginationMixin
+from core.streaming import stream_json_array
+
+from . import applications, export, recommendations, workflow
+from .search import fuzzy_match, search_jobs, tag_facets
+
+from .models import JobCategory, Job, JobApplication, JobView, JobPost, ExchangeRate, annual_usd
 from .serializers import (
     JobCategorySerializer, JobListSerializer, JobDetailSerializer,
     JobApplicationSerializer, JobApplicationCreateSerializer, 
-    JobApplicationAdminSerializer, JobSerializer, JobPostSerializer
+    JobApplicationAdminSerializer, JobApplicationBulkStatusSerializer, JobSerializer, JobPostSerializer
 )
 
 def get_client_ip(request):
@@ -38,9 +48,14 @@ class JobFilter(django_filters.FilterSet):
         ('hybrid', 'Hybrid'),
         ('on_site', 'On-Site'),
     ])
-    location = django_filters.CharFilter(lookup_expr='icontains')
-    salary_min = django_filters.NumberFilter(field_name='salary_min', lookup_expr='gte')
-    salary_max = django_filters.NumberFilter(field_name='salary_max', lookup_expr='lte')
+    location = django_filters.CharFilter(method='filter_location')
+    company = django_filters.CharFilter(method='filter_company')
+    # Salary bounds are yearly USD unless salary_currency/salary_period say otherwise,
+    # and are compared with the normalized columns so currencies and periods don't mix
+    salary_min = django_filters.NumberFilter(method='filter_salary_min')
+    salary_max = django_filters.NumberFilter(method='filter_salary_max')
+    salary_currency = django_filters.CharFilter(method='filter_noop')
+    salary_period = django_filters.ChoiceFilter(choices=Job._meta.get_field('salary_period').choices, method='filter_noop')
     tags = django_filters.CharFilter(method='filter_tags')
     is_featured = django_filters.BooleanFilter()
     is_urgent = django_filters.BooleanFilter()
@@ -50,19 +65,45 @@ class JobFilter(django_filters.FilterSet):
         fields = []
     
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            Q(title__icontains=value) |
-            Q(description__icontains=value) |
-            Q(company_name__icontains=value) |
-            Q(requirements__icontains=value) |
-            Q(responsibilities__icontains=value)
+        # Most relevant first, keeping featured/urgent jobs on top among equals
+        return search_jobs(queryset, value).order_by(
+            '-search_rank', '-is_featured', '-is_urgent', '-created_at'
         )
+
+    # Trigram matching tolerates typos in company and location names
+    def filter_company(self, queryset, name, value):
+        return queryset.filter(fuzzy_match('company_name', value))
+
+    def filter_location(self, queryset, name, value):
+        return queryset.filter(fuzzy_match('location', value))
     
     def filter_tags(self, queryset, name, value):
         tags = [tag.strip() for tag in value.split(',')]
         return queryset.filter(tags__overlap=tags)
 
-class StandardResultsSetPagination(PageNumberPagination):
+    def filter_noop(self, queryset, name, value):
+        return queryset
+
+    def salary_bound(self, value):
+        currency = self.form.cleaned_data.get('salary_currency') or 'USD'
+        period = self.form.cleaned_data.get('salary_period') or 'yearly'
+        return annual_usd(value, period, ExchangeRate.rate_for(currency))
+
+    def filter_salary_min(self, queryset, name, value):
+        bound = self.salary_bound(value)
+        if bound is None:
+            return queryset.none()
+        return queryset.filter(salary_min_annual_usd__gte=bound)
+
+    def filter_salary_max(self, queryset, name, value):
+        bound = self.salary_bound(value)
+        if bound is None:
+            return queryset.none()
+        return queryset.filter(salary_max_annual_usd__lte=bound)
+
+class StandardResultsSetPagination(KeysetPaginationMixin, PageNumberPagination):
+    """Page-number pagination, or keyset pagination with ?cursor="""
+    cursor_ordering = ('-created_at', '-id')
     page_size = 12
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -70,7 +111,7 @@ class StandardResultsSetPagination(PageNumberPagination):
 # Job Category Views
 class JobCategoryListView(generics.ListAPIView):
     """List all job categories"""
-    queryset = JobCategory.objects.filter(is_active=True).order_by('name')
+    queryset = JobCategory.objects.filter(is_active=True).with_job_count().order_by('name')
     serializer_class = JobCategorySerializer
     permission_classes = [IsAuthenticated]
 
@@ -82,20 +123,50 @@ class JobListView(generics.ListAPIView):
     filter_backends = [DjangoFilterBackend]
     filterset_class = JobFilter
     pagination_class = StandardResultsSetPagination
-    
+    cursor_ordering = ('-is_featured', '-is_urgent', '-created_at', '-id')
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        # Tag facets accompany searches, or any listing with ?facets=true
+        if request.query_params.get('search') or request.query_params.get('facets') == 'true':
+            response.data['facets'] = {'tags': tag_facets(queryset)}
+        return response
+
     def get_queryset(self):
-        return Job.objects.filter(
-            status='published'
-        ).select_related('category', 'posted_by').order_by(
+        return Job.objects.open().with_user_state(self.request.user).order_by(
             '-is_featured', '-is_urgent', '-created_at'
         )
 
+class JobRecommendationView(APIView):
+    """Open jobs matching the user's skills (labs, learning paths, profile), best match first"""
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), self.max_limit)
+        except ValueError:
+            limit = 10
+
+        jobs = recommendations.recommend(request.user, limit)
+        data = JobListSerializer(jobs, many=True, context={'request': request}).data
+        for item, job in zip(data, jobs):
+            item['match_score'] = job.match_score
+        return Response({'results': data})
+
 class JobDetailView(generics.RetrieveAPIView):
     """Get detailed job information"""
-    queryset = Job.objects.filter(status='published')
     serializer_class = JobDetailSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
+
+    def get_queryset(self):
+        return Job.objects.filter(status='published').with_user_state(self.request.user, include_application=True)
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -120,10 +191,14 @@ class JobApplicationCreateView(generics.CreateAPIView):
     serializer_class = JobApplicationCreateSerializer
     permission_classes = [IsAuthenticated]
     
-    def perform_create(self, serializer):
-        application = serializer.save(user=self.request.user)
-        # Increment application count
-        Job.objects.filter(id=application.job.id).update(application_count=F('application_count') + 1)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            applications.submit(serializer, request.user)
+        except applications.ApplicationError as error:
+            return Response({"detail": error.detail}, status=error.status_code)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 class JobApplicationListView(generics.ListAPIView):
     """List user's job applications"""
@@ -150,28 +225,10 @@ class JobApplicationWithdrawView(APIView):
     
     def post(self, request, pk):
         try:
-            application = JobApplication.objects.get(pk=pk, user=request.user)
-            if application.status in ['accepted', 'rejected']:
-                return Response(
-                    {"detail": "Cannot withdraw application that has been processed."}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            application.status = 'withdrawn'
-            application.save()
-            
-            # Decrement application count
-            Job.objects.filter(id=application.job.id).update(
-                application_count=F('application_count') - 1
-            )
-            
-            return Response({"detail": "Application withdrawn successfully."})
-            
-        except JobApplication.DoesNotExist:
-            return Response(
-                {"detail": "Application not found."}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+            applications.withdraw(request.user, pk=pk)
+        except applications.ApplicationError as error:
+            return Response({"detail": error.detail}, status=error.status_code)
+        return Response({"detail": "Application withdrawn successfully."})
 
 # Admin Views for Job Management
 class JobAdminListView(generics.ListCreateAPIView):
@@ -183,17 +240,19 @@ class JobAdminListView(generics.ListCreateAPIView):
     pagination_class = StandardResultsSetPagination
     
     def get_queryset(self):
-        return Job.objects.all().select_related('category', 'posted_by').order_by('-created_at')
+        return Job.objects.all().with_user_state(self.request.user, include_application=True).order_by('-created_at')
     
     def perform_create(self, serializer):
         serializer.save(posted_by=self.request.user)
 
 class JobAdminDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Admin view for managing specific job"""
-    queryset = Job.objects.all()
     serializer_class = JobDetailSerializer
     permission_classes = [IsAdminUser]
 
+    def get_queryset(self):
+        return Job.objects.all().with_user_state(self.request.user, include_application=True)
+
 class JobApplicationAdminListView(generics.ListAPIView):
     """Admin view for managing job applications"""
     serializer_class = JobApplicationAdminSerializer
@@ -214,6 +273,68 @@ class JobApplicationAdminDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = JobApplicationAdminSerializer
     permission_classes = [IsAdminUser]
 
+class JobApplicationBulkStatusView(APIView):
+    """Move many applications to one status in a single update"""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = JobApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data['ids'])
+        target = serializer.validated_data['status']
+
+        updated = workflow.transition(
+            JobApplication.objects.filter(pk__in=ids), target, changed_by=request.user
+        )
+        return Response({
+            "status": target,
+            "updated": updated,
+            "skipped": len(ids) - updated,
+        })
+
+class JobApplicationExportView(generics.GenericAPIView):
+    """Stream filtered applications as CSV or XLSX, optionally zipped with resumes"""
+    queryset = JobApplication.objects.all()
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'job', 'job__category', 'job__job_type']
+
+    CONTENT_TYPES = {
+        'csv': 'text/csv; charset=utf-8',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'zip': 'application/zip',
+    }
+
+    def get(self, request):
+        # Not ?format=, which DRF reserves for renderer selection
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in ('csv', 'xlsx'):
+            return Response({"detail": "file_format must be csv or xlsx."}, status=status.HTTP_400_BAD_REQUEST)
+
+        profile_fields = [
+            key.strip() for key in request.query_params.get('profile_fields', '').split(',') if key.strip()
+        ]
+        include_cover_letter = request.query_params.get('include_cover_letter') == 'true'
+        include_resumes = request.query_params.get('resumes') == 'true'
+
+        queryset = export.export_queryset(
+            self.filter_queryset(self.get_queryset()), profile_fields, include_cover_letter
+        )
+        rows = export.iter_rows(queryset, export.build_columns(profile_fields, include_cover_letter))
+
+        if include_resumes:
+            content, extension = export.stream_bundle(rows, queryset, file_format), 'zip'
+        elif file_format == 'xlsx':
+            content, extension = export.stream_xlsx(rows), 'xlsx'
+        else:
+            content, extension = export.stream_csv(rows), 'csv'
+
+        response = StreamingHttpResponse(content, content_type=self.CONTENT_TYPES[extension])
+        response['Content-Disposition'] = (
+            f'attachment; filename="applications-{timezone.localdate():%Y%m%d}.{extension}"'
+        )
+        return response
+
 # Legacy Views (for backward compatibility)
 class JobListCreateView(APIView):
     """Legacy view - use JobListView and JobAdminListView instead"""
@@ -228,20 +349,14 @@ class JobListCreateView(APIView):
         experience_level = request.query_params.get('experience_level')
         is_remote = request.query_params.get('is_remote')
 
-        jobs = Job.objects.filter(status='published').order_by('-created_at')
+        jobs = Job.objects.open().with_user_state(request.user).order_by('-created_at')
 
         if search:
-            jobs = jobs.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(requirements__icontains=search) |
-                Q(responsibilities__icontains=search) |
-                Q(company_name__icontains=search)
-            )
+            jobs = search_jobs(jobs, search).order_by('-search_rank', '-created_at')
         if category:
             jobs = jobs.filter(category__name__iexact=category)
         if location:
-            jobs = jobs.filter(location__icontains=location)
+            jobs = jobs.filter(fuzzy_match('location', location))
         if job_type:
             jobs = jobs.filter(job_type__iexact=job_type)
         if experience_level:
@@ -252,8 +367,32 @@ class JobListCreateView(APIView):
             elif is_remote.lower() == 'false':
                 jobs = jobs.filter(is_remote=False)
 
-        serializer = JobSerializer(jobs, many=True, context={'request': request})
-        return Response(serializer.data)
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since_at = parse_datetime(since)
+                if since_at is None and parse_date(since):
+                    since_at = datetime.combine(parse_date(since), time.min)
+            except ValueError:
+                since_at = None
+            if since_at is None:
+                return Response({"detail": "since must be an ISO date or datetime."}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since_at):
+                since_at = timezone.make_aware(since_at)
+            jobs = jobs.filter(updated_at__gte=since_at)
+
+        limit = request.query_params.get('limit')
+        if limit:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return Response({"detail": "limit must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
+            jobs = jobs[:limit]
+
+        # Same array JobSerializer(many=True) would produce, streamed row by row
+        return stream_json_array(jobs, JobSerializer(context={'request': request}))
 
     def post(self, request):
         if not request.user.is_staff:
@@ -288,7 +427,10 @@ class JobApplyView(APIView):
         
         serializer = JobApplicationCreateSerializer(data=application_data, context={'request': request})
         if serializer.is_valid():
-            serializer.save(user=user)
+            try:
+                applications.submit(serializer, user)
+            except applications.ApplicationError as error:
+                return Response({"detail": error.detail}, status=error.status_code)
             return Response({"detail": "Application submitted."}, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -298,18 +440,10 @@ class JobUnapplyView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, job_id):
-        user = request.user
         try:
-            application = JobApplication.objects.get(user=user, job_id=job_id)
-            application.status = 'withdrawn'
-            application.save()
-            
-            # Decrement application count
-            Job.objects.filter(id=job_id).update(
-                application_count=F('application_count') - 1
-            )
-            
-            return Response({"detail": "Application removed."}, status=status.HTTP_200_OK)
-            
-        except JobApplication.DoesNotExist:
-            return Response({"detail": "You have not applied to this job."}, status=status.HTTP_404_NOT_FOUND)
+            applications.withdraw(request.user, job_id=job_id)
+        except applications.ApplicationError as error:
+            if error.status_code == status.HTTP_404_NOT_FOUND:
+                return Response({"detail": "You have not applied to this job."}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"detail": error.detail}, status=error.status_code)
+        return Response({"detail": "Application removed."}, status=status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LearningsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'learnings'
+
+    def ready(self):
+        from . import signals  # noqa: F401
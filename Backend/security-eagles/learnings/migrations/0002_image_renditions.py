@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learnings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningpath',
+            name='thumbnail_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated size variants and WebP copies'),
+        ),
+        migrations.AddField(
+            model_name='track',
+            name='thumbnail_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated size variants and WebP copies'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    LearningPath = apps.get_model('learnings', 'LearningPath')
+    LearningSection = apps.get_model('learnings', 'LearningSection')
+    UserLearningProgress = apps.get_model('learnings', 'UserLearningProgress')
+    through = UserLearningProgress.completed_sections.through
+
+    required = LearningSection.objects.filter(
+        learning_path=OuterRef('pk'), is_required=True, is_active=True
+    ).order_by().values('learning_path').annotate(total=Count('pk')).values('total')
+    LearningPath.objects.update(required_section_count=Coalesce(Subquery(required), Value(0)))
+
+    completed = through.objects.filter(
+        userlearningprogress=OuterRef('pk'),
+        learningsection__is_required=True,
+        learningsection__is_active=True,
+    ).order_by().values('userlearningprogress').annotate(total=Count('pk')).values('total')
+    UserLearningProgress.objects.update(completed_required_count=Coalesce(Subquery(completed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learnings', '0002_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningpath',
+            name='required_section_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userlearningprogress',
+            name='completed_required_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
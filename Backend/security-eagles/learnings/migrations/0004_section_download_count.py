@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learnings', '0003_progress_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningsection',
+            name='download_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,11 +1,18 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import connection, models, transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Prefetch, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 
+from core.counters import CounterFieldsMixin
+from core.images import register_renditions
+
 
-class Track(models.Model):
+class Track(CounterFieldsMixin, models.Model):
     """PDF tracks organized by category - no auth required"""
 
     CATEGORY_CHOICES = [
@@ -27,6 +34,7 @@ class Track(models.Model):
     level = models.CharField(max_length=15, choices=LEVEL_CHOICES, default='beginner')
     pdf_file = models.FileField(upload_to='tracks/pdfs/')
     thumbnail = models.ImageField(upload_to='tracks/thumbnails/', blank=True, null=True)
+    thumbnail_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     tags = ArrayField(models.CharField(max_length=50), blank=True, default=list)
     duration_hours = models.PositiveIntegerField(help_text="Estimated completion time in hours")
     prerequisites = models.TextField(blank=True, help_text="Required knowledge or skills")
@@ -37,6 +45,9 @@ class Track(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Written by buffered F() increments (see learnings/views.py)
+    COUNTER_FIELDS = ('download_count',)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -48,6 +59,41 @@ class Track(models.Model):
         return f"{self.title} ({self.get_category_display()})"
 
 
+def active_section_count(path_ref):
+    """Subquery counting the active sections of the learning path `path_ref` points at"""
+    active = LearningSection.objects.filter(learning_path=path_ref, is_active=True).order_by().values(
+        'learning_path'
+    ).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(active), Value(0))
+
+
+class LearningPathQuerySet(models.QuerySet):
+    """
+    Query helpers so path serializers don't query per path: section counts
+    are annotated and the user's progress is prefetched.
+    """
+
+    def with_section_count(self):
+        return self.annotate(active_section_count=active_section_count(OuterRef('pk')))
+
+    def with_user_progress(self, user):
+        """Prefetch `user`'s progress on each path as `user_progress_list` (zero or one rows)"""
+        if not user or not user.is_authenticated:
+            return self
+        return self.prefetch_related(Prefetch(
+            'user_progress',
+            queryset=UserLearningProgress.objects.filter(user=user),
+            to_attr='user_progress_list',
+        ))
+
+    def recount_required_sections(self):
+        """Reset required_section_count from the sections table in one UPDATE"""
+        required = LearningSection.objects.filter(
+            learning_path=OuterRef('pk'), is_required=True, is_active=True
+        ).order_by().values('learning_path').annotate(total=Count('pk')).values('total')
+        return self.update(required_section_count=Coalesce(Subquery(required), Value(0)))
+
+
 class LearningPath(models.Model):
     """Main learning paths like Udemy courses - requires auth"""
 
@@ -75,6 +121,7 @@ class LearningPath(models.Model):
 
     # Media
     thumbnail = models.ImageField(upload_to='learning_paths/thumbnails/', blank=True, null=True)
+    thumbnail_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     intro_video_url = models.URLField(blank=True, null=True, help_text="YouTube or other video URL")
 
     # Learning details
@@ -93,12 +140,16 @@ class LearningPath(models.Model):
     completion_count = models.PositiveIntegerField(default=0)
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     total_ratings = models.PositiveIntegerField(default=0)
+    # Active required sections; kept current by learnings/signals.py
+    required_section_count = models.PositiveIntegerField(default=0, editable=False)
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
 
+    objects = LearningPathQuerySet.as_manager()
+
     class Meta:
         ordering = ['-is_featured', '-created_at']
         indexes = [
@@ -116,7 +167,7 @@ class LearningPath(models.Model):
         super().save(*args, **kwargs)
 
 
-class LearningSection(models.Model):
+class LearningSection(CounterFieldsMixin, models.Model):
     """Sections within a learning path"""
 
     CONTENT_TYPE_CHOICES = [
@@ -144,9 +195,13 @@ class LearningSection(models.Model):
 
     # Metadata
     is_active = models.BooleanField(default=True)
+    download_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Written by buffered F() increments (see learnings/views.py)
+    COUNTER_FIELDS = ('download_count',)
+
     class Meta:
         ordering = ['learning_path', 'order']
         unique_together = ['learning_path', 'order']
@@ -159,6 +214,42 @@ class LearningSection(models.Model):
         return f"{self.learning_path.title} - {self.title}"
 
 
+def percentage_of(completed, total):
+    """SQL expression for completed / total as a 0-100 percentage, given expressions for both"""
+    output = DecimalField(max_digits=5, decimal_places=2)
+    return Least(
+        models.ExpressionWrapper(completed * Decimal(100) / total, output_field=output),
+        Value(Decimal(100), output_field=output),
+    )
+
+
+class UserLearningProgressQuerySet(models.QuerySet):
+
+    def with_section_count(self):
+        """Annotate `path_section_count`, the learning path's active sections"""
+        return self.annotate(path_section_count=active_section_count(OuterRef('learning_path')))
+
+    def recount(self):
+        """
+        Recompute completed_required_count and progress_percentage from the
+        completed sections, for when sections are edited or removed.
+        """
+        through = UserLearningProgress.completed_sections.through
+        completed = through.objects.filter(
+            userlearningprogress=OuterRef('pk'),
+            learningsection__is_required=True,
+            learningsection__is_active=True,
+        ).order_by().values('userlearningprogress').annotate(total=Count('pk')).values('total')
+        required = LearningPath.objects.filter(pk=OuterRef('learning_path')).values('required_section_count')
+
+        with transaction.atomic():
+            count = self.update(completed_required_count=Coalesce(Subquery(completed), Value(0)))
+            self.filter(learning_path__required_section_count__gt=0).update(
+                progress_percentage=percentage_of(F('completed_required_count'), Subquery(required))
+            )
+        return count
+
+
 class UserLearningProgress(models.Model):
     """Track user progress in learning paths"""
 
@@ -177,6 +268,8 @@ class UserLearningProgress(models.Model):
     current_section = models.ForeignKey(LearningSection, on_delete=models.SET_NULL, null=True, blank=True)
     completed_sections = models.ManyToManyField(LearningSection, blank=True, related_name='completed_by_users')
     progress_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+    # Completed sections that are active and required; see complete_section()
+    completed_required_count = models.PositiveIntegerField(default=0, editable=False)
 
     # Timestamps
     enrolled_at = models.DateTimeField(auto_now_add=True)
@@ -184,6 +277,8 @@ class UserLearningProgress(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     last_accessed_at = models.DateTimeField(auto_now=True)
 
+    objects = UserLearningProgressQuerySet.as_manager()
+
     class Meta:
         unique_together = ['user', 'learning_path']
         ordering = ['-last_accessed_at']
@@ -196,11 +291,12 @@ class UserLearningProgress(models.Model):
         return f"{self.user.username} - {self.learning_path.title} ({self.status})"
 
     def update_progress(self):
-        """Calculate and update progress percentage"""
-        total_sections = self.learning_path.sections.filter(is_active=True, is_required=True).count()
+        """Recalculate progress from the maintained counters"""
+        total_sections = self.learning_path.required_section_count
         if total_sections > 0:
-            completed_count = self.completed_sections.filter(is_required=True).count()
-            self.progress_percentage = (completed_count / total_sections) * 100
+            self.progress_percentage = min(
+                Decimal(self.completed_required_count * 100) / total_sections, Decimal(100)
+            ).quantize(Decimal('0.01'))
 
             if self.progress_percentage >= 100 and self.status != 'completed':
                 self.status = 'completed'
@@ -211,6 +307,56 @@ class UserLearningProgress(models.Model):
 
         self.save()
 
+    def completed_section_ids(self):
+        """IDs of every completed section, in one query"""
+        through = UserLearningProgress.completed_sections.through
+        return set(through.objects.filter(userlearningprogress=self).values_list('learningsection_id', flat=True))
+
+    def complete_section(self, section):
+        """
+        Record `section` as completed and move the progress on in one UPDATE.
+        Completing a section twice changes nothing but current_section.
+        Returns whether the section was newly completed.
+        """
+        through = UserLearningProgress.completed_sections.through
+        now = timezone.now()
+        with transaction.atomic():
+            # INSERT … ON CONFLICT tells us whether this is a first completion without a prior SELECT
+            columns = [through._meta.get_field(name).column for name in ('userlearningprogress', 'learningsection')]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {through._meta.db_table} ({columns[0]}, {columns[1]}) '
+                    'VALUES (%s, %s) ON CONFLICT DO NOTHING',
+                    [self.pk, section.pk],
+                )
+                inserted = cursor.rowcount == 1
+
+            updates = {'current_section': section, 'last_accessed_at': now}
+            total = section.learning_path.required_section_count
+            if inserted and section.is_required and section.is_active and total > 0:
+                completed = F('completed_required_count') + 1
+                finished = Q(completed_required_count__gte=total - 1)
+                updates.update(
+                    completed_required_count=completed,
+                    progress_percentage=percentage_of(completed, Value(Decimal(total))),
+                    status=Case(
+                        When(finished, then=Value('completed')),
+                        When(status='not_started', then=Value('in_progress')),
+                        default=F('status'),
+                    ),
+                    started_at=Case(When(status='not_started', then=Value(now)), default=F('started_at')),
+                    completed_at=Case(
+                        When(finished & ~Q(status='completed'), then=Value(now)), default=F('completed_at')
+                    ),
+                )
+            UserLearningProgress.objects.filter(pk=self.pk).update(**updates)
+
+        self.refresh_from_db(fields=[
+            'current_section', 'completed_required_count', 'progress_percentage',
+            'status', 'started_at', 'completed_at', 'last_accessed_at',
+        ])
+        return inserted
+
 
 class LearningComment(models.Model):
     """Comments on learning sections (not learning paths)"""
@@ -293,3 +439,7 @@ class LearningRating(models.Model):
         self.learning_path.average_rating = rating_stats['avg_rating'] or 0.00
         self.learning_path.total_ratings = rating_stats['total_ratings'] or 0
         self.learning_path.save(update_fields=['average_rating', 'total_ratings'])
+
+
+register_renditions(Track, 'thumbnail', 'thumbnail_renditions')
+register_renditions(LearningPath, 'thumbnail', 'thumbnail_renditions')
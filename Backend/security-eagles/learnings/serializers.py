@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
 from django.contrib.auth import get_user_model
+from core.images import build_srcset
 from .models import (
     Track, LearningPath, LearningSection, UserLearningProgress,
     LearningComment, LearningRating
@@ -8,10 +10,45 @@ from .models import (
 User = get_user_model()
 
 
+def pdf_download_url(request, pdf_file, view_name, kwargs):
+    """Counted, range-capable download endpoint for a PDF; pdf_url stays the plain media URL"""
+    if not pdf_file:
+        return None
+    url = reverse(view_name, kwargs=kwargs)
+    return request.build_absolute_uri(url) if request else url
+
+
+class UserProgressMixin:
+    """
+    The requesting user's progress on a path, from the `user_progress_list`
+    prefetch (LearningPathQuerySet.with_user_progress), falling back to a
+    query for paths that weren't prefetched.
+    """
+
+    def _user(self):
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return request.user
+        return None
+
+    def _progress(self, obj):
+        if hasattr(obj, 'user_progress_list'):
+            return obj.user_progress_list[0] if obj.user_progress_list else None
+        user = self._user()
+        if user is None:
+            return None
+        return UserLearningProgress.objects.filter(user=user, learning_path=obj).first()
+
+    def get_is_enrolled(self, obj):
+        return self._progress(obj) is not None
+
+
 class TrackSerializer(serializers.ModelSerializer):
     """Serializer for Track model - no auth required"""
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
     pdf_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     level_display = serializers.CharField(source='get_level_display', read_only=True)
 
@@ -19,7 +56,7 @@ class TrackSerializer(serializers.ModelSerializer):
         model = Track
         fields = [
             'id', 'title', 'description', 'category', 'category_display',
-            'level', 'level_display', 'thumbnail_url', 'pdf_url', 'tags',
+            'level', 'level_display', 'thumbnail_url', 'thumbnail_srcset', 'pdf_url', 'download_url', 'tags',
             'duration_hours', 'prerequisites', 'download_count', 'created_at'
         ]
 
@@ -31,6 +68,9 @@ class TrackSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
+    def get_thumbnail_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.thumbnail_renditions, obj.thumbnail)
+
     def get_pdf_url(self, obj):
         if obj.pdf_file and hasattr(obj.pdf_file, 'url'):
             request = self.context.get('request')
@@ -39,10 +79,14 @@ class TrackSerializer(serializers.ModelSerializer):
             return obj.pdf_file.url
         return None
 
+    def get_download_url(self, obj):
+        return pdf_download_url(self.context.get('request'), obj.pdf_file, 'track-download', {'id': obj.id})
+
 
-class LearningPathListSerializer(serializers.ModelSerializer):
+class LearningPathListSerializer(UserProgressMixin, serializers.ModelSerializer):
     """Serializer for learning path list view"""
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     level_display = serializers.CharField(source='get_level_display', read_only=True)
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
@@ -54,7 +98,7 @@ class LearningPathListSerializer(serializers.ModelSerializer):
         model = LearningPath
         fields = [
             'id', 'title', 'short_description', 'category', 'category_display',
-            'level', 'level_display', 'thumbnail_url', 'estimated_duration_hours',
+            'level', 'level_display', 'thumbnail_url', 'thumbnail_srcset', 'estimated_duration_hours',
             'instructor_name', 'sections_count', 'enrollment_count', 'average_rating',
             'total_ratings', 'is_featured', 'is_enrolled', 'user_progress', 'created_at'
         ]
@@ -67,45 +111,38 @@ class LearningPathListSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
+    def get_thumbnail_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.thumbnail_renditions, obj.thumbnail)
+
     def get_sections_count(self, obj):
+        # Annotated by LearningPathQuerySet.with_section_count
+        if hasattr(obj, 'active_section_count'):
+            return obj.active_section_count
         return obj.sections.filter(is_active=True).count()
 
-    def get_is_enrolled(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return UserLearningProgress.objects.filter(
-                user=request.user, learning_path=obj
-            ).exists()
-        return False
-
     def get_user_progress(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            try:
-                progress = UserLearningProgress.objects.get(
-                    user=request.user, learning_path=obj
-                )
-                return {
-                    'status': progress.status,
-                    'progress_percentage': float(progress.progress_percentage),
-                    'last_accessed_at': progress.last_accessed_at
-                }
-            except UserLearningProgress.DoesNotExist:
-                pass
-        return None
+        progress = self._progress(obj)
+        if progress is None:
+            return None
+        return {
+            'status': progress.status,
+            'progress_percentage': float(progress.progress_percentage),
+            'last_accessed_at': progress.last_accessed_at
+        }
 
 
 class LearningSectionSerializer(serializers.ModelSerializer):
     """Serializer for learning sections"""
     content_type_display = serializers.CharField(source='get_content_type_display', read_only=True)
     pdf_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
     is_completed = serializers.SerializerMethodField()
 
     class Meta:
         model = LearningSection
         fields = [
             'id', 'title', 'description', 'order', 'content_type', 'content_type_display',
-            'video_url', 'pdf_url', 'markdown_content', 'estimated_duration_minutes',
+            'video_url', 'pdf_url', 'download_url', 'markdown_content', 'estimated_duration_minutes',
             'is_required', 'is_completed'
         ]
 
@@ -117,22 +154,25 @@ class LearningSectionSerializer(serializers.ModelSerializer):
             return obj.pdf_file.url
         return None
 
+    def get_download_url(self, obj):
+        return pdf_download_url(self.context.get('request'), obj.pdf_file, 'section-download', {'section_id': obj.id})
+
     def get_is_completed(self, obj):
+        # Loaded once per request by the view
+        if 'completed_section_ids' in self.context:
+            return obj.id in self.context['completed_section_ids']
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                progress = UserLearningProgress.objects.get(
-                    user=request.user, learning_path=obj.learning_path
-                )
-                return obj in progress.completed_sections.all()
-            except UserLearningProgress.DoesNotExist:
-                pass
+            return UserLearningProgress.objects.filter(
+                user=request.user, learning_path_id=obj.learning_path_id, completed_sections=obj
+            ).exists()
         return False
 
 
-class LearningPathDetailSerializer(serializers.ModelSerializer):
+class LearningPathDetailSerializer(UserProgressMixin, serializers.ModelSerializer):
     """Detailed serializer for learning path with sections"""
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     level_display = serializers.CharField(source='get_level_display', read_only=True)
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
@@ -145,7 +185,7 @@ class LearningPathDetailSerializer(serializers.ModelSerializer):
         model = LearningPath
         fields = [
             'id', 'title', 'description', 'short_description', 'category', 'category_display',
-            'level', 'level_display', 'thumbnail_url', 'intro_video_url',
+            'level', 'level_display', 'thumbnail_url', 'thumbnail_srcset', 'intro_video_url',
             'estimated_duration_hours', 'prerequisites', 'learning_objectives', 'tags',
             'instructor_name', 'enrollment_count', 'completion_count', 'average_rating',
             'total_ratings', 'is_featured', 'sections', 'is_enrolled', 'user_progress',
@@ -160,34 +200,27 @@ class LearningPathDetailSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
 
-    def get_is_enrolled(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return UserLearningProgress.objects.filter(
-                user=request.user, learning_path=obj
-            ).exists()
-        return False
+    def get_thumbnail_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.thumbnail_renditions, obj.thumbnail)
 
     def get_user_progress(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            try:
-                progress = UserLearningProgress.objects.get(
-                    user=request.user, learning_path=obj
-                )
-                return {
-                    'status': progress.status,
-                    'progress_percentage': float(progress.progress_percentage),
-                    'current_section_id': progress.current_section.id if progress.current_section else None,
-                    'completed_sections_count': progress.completed_sections.count(),
-                    'enrolled_at': progress.enrolled_at,
-                    'started_at': progress.started_at,
-                    'completed_at': progress.completed_at,
-                    'last_accessed_at': progress.last_accessed_at
-                }
-            except UserLearningProgress.DoesNotExist:
-                pass
-        return None
+        progress = self._progress(obj)
+        if progress is None:
+            return None
+        if 'completed_section_ids' in self.context:
+            completed_count = len(self.context['completed_section_ids'])
+        else:
+            completed_count = progress.completed_sections.count()
+        return {
+            'status': progress.status,
+            'progress_percentage': float(progress.progress_percentage),
+            'current_section_id': progress.current_section_id,
+            'completed_sections_count': completed_count,
+            'enrolled_at': progress.enrolled_at,
+            'started_at': progress.started_at,
+            'completed_at': progress.completed_at,
+            'last_accessed_at': progress.last_accessed_at
+        }
 
     def get_user_rating(self, obj):
         request = self.context.get('request')
@@ -221,11 +254,19 @@ class UserLearningProgressSerializer(serializers.ModelSerializer):
             'started_at', 'completed_at', 'last_accessed_at'
         ]
 
+    def to_representation(self, instance):
+        # The nested path serializer finds this progress and the section count here instead of querying
+        path = instance.learning_path
+        path.user_progress_list = [instance]
+        if hasattr(instance, 'path_section_count'):
+            path.active_section_count = instance.path_section_count
+        return super().to_representation(instance)
+
     def get_completed_sections_count(self, obj):
-        return obj.completed_sections.count()
+        return obj.completed_required_count
 
     def get_total_sections_count(self, obj):
-        return obj.learning_path.sections.filter(is_active=True, is_required=True).count()
+        return obj.learning_path.required_section_count
 
 
 class LearningCommentSerializer(serializers.ModelSerializer):
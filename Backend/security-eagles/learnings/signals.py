@@ -0,0 +1,28 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LearningPath, LearningSection, UserLearningProgress
+
+
+@receiver([post_save, post_delete], sender=LearningSection)
+def recount_path_sections(sender, instance, raw=False, **kwargs):
+    """Adding, removing or (un)requiring a section changes every learner's totals"""
+    if raw:
+        return
+    LearningPath.objects.filter(pk=instance.learning_path_id).recount_required_sections()
+    UserLearningProgress.objects.filter(learning_path_id=instance.learning_path_id).recount()
+
+
+@receiver(m2m_changed, sender=UserLearningProgress.completed_sections.through)
+def recount_completed_sections(sender, instance, action, reverse, pk_set, **kwargs):
+    """Completed sections edited outside complete_section(), e.g. in the admin"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse and pk_set:
+        progress = UserLearningProgress.objects.filter(pk__in=pk_set)
+    elif reverse:
+        # Cleared from the section's side; the affected learners are no longer linked
+        progress = UserLearningProgress.objects.filter(learning_path_id=instance.learning_path_id)
+    else:
+        progress = UserLearningProgress.objects.filter(pk=instance.pk)
+    progress.recount()
@@ -1,11 +1,11 @@
 from django.urls import path
 from .views import (
     # Track views (no auth required)
-    TrackListView, TrackDetailView, TrackByCategoryView,
+    TrackListView, TrackDetailView, TrackDownloadView, TrackByCategoryView,
     
     # Learning path views (auth required)
     LearningPathListView, LearningPathDetailView, LearningPathEnrollView,
-    LearningPathUnenrollView, MarkSectionCompleteView, UserLearningProgressListView,
+    LearningPathUnenrollView, MarkSectionCompleteView, SectionDownloadView, UserLearningProgressListView,
     
     # Comment views
     LearningCommentListCreateView, LearningCommentDetailView, LearningCommentRepliesView,
@@ -18,6 +18,7 @@ urlpatterns = [
     # Track endpoints (no authentication required)
     path('tracks/', TrackListView.as_view(), name='track-list'),
     path('tracks/<int:id>/', TrackDetailView.as_view(), name='track-detail'),
+    path('tracks/<int:id>/download/', TrackDownloadView.as_view(), name='track-download'),
     path('tracks/category/<str:category>/', TrackByCategoryView.as_view(), name='track-by-category'),
     
     # Learning path endpoints (authentication required)
@@ -28,6 +29,7 @@ urlpatterns = [
     
     # Section completion
     path('sections/<int:section_id>/complete/', MarkSectionCompleteView.as_view(), name='section-complete'),
+    path('sections/<int:section_id>/download/', SectionDownloadView.as_view(), name='section-download'),
     
     # User progress
     path('my-progress/', UserLearningProgressListView.as_view(), name='user-learning-progress'),
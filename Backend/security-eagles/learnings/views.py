@@ -7,8 +7,12 @@ from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, F
 from django.shortcuts import get_object_or_404
+from django.utils.text import slugify
 import django_filters
 
+from core.counters import BufferedCounter
+from core.downloads import serve_file, starts_download
+
 from .models import (
     Track, LearningPath, LearningSection, UserLearningProgress,
     LearningComment, LearningRating
@@ -20,6 +24,10 @@ from .serializers import (
 )
 
 
+track_downloads = BufferedCounter(Track, 'download_count')
+section_downloads = BufferedCounter(LearningSection, 'download_count')
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = 'page_size'
@@ -91,7 +99,7 @@ class TrackListView(generics.ListAPIView):
 
 
 class TrackDetailView(generics.RetrieveAPIView):
-    """Get track details and increment download count"""
+    """Get track details"""
     serializer_class = TrackSerializer
     permission_classes = [AllowAny]
     lookup_field = 'id'
@@ -99,12 +107,35 @@ class TrackDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         return Track.objects.filter(is_active=True)
 
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        # Increment download count
-        Track.objects.filter(id=instance.id).update(download_count=F('download_count') + 1)
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+
+class PDFDownloadMixin:
+    """Serve a PDF with range support; only the request starting a download is counted"""
+    counter = None
+
+    def perform_content_negotiation(self, request, force=False):
+        # The file isn't rendered by DRF, so an Accept of application/pdf must not get a 406
+        return super().perform_content_negotiation(request, force=True)
+
+    def download(self, request, obj):
+        if not obj.pdf_file:
+            return Response({'detail': 'No PDF available.'}, status=status.HTTP_404_NOT_FOUND)
+        filename = f"{slugify(obj.title) or 'download'}.pdf"
+        response = serve_file(request, obj.pdf_file, filename=filename)
+        if response is None:
+            return Response({'detail': 'File not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if starts_download(request, response):
+            self.counter.increment(obj.pk)
+        return response
+
+
+class TrackDownloadView(PDFDownloadMixin, APIView):
+    """Download a track's PDF"""
+    permission_classes = [AllowAny]
+    counter = track_downloads
+
+    def get(self, request, id):
+        track = get_object_or_404(Track, id=id, is_active=True)
+        return self.download(request, track)
 
 
 class TrackByCategoryView(generics.ListAPIView):
@@ -133,7 +164,9 @@ class LearningPathListView(generics.ListAPIView):
     ordering = ['-is_featured', '-created_at']
 
     def get_queryset(self):
-        return LearningPath.objects.filter(status='published').select_related('instructor')
+        return LearningPath.objects.filter(status='published').select_related(
+            'instructor'
+        ).with_section_count().with_user_progress(self.request.user)
 
 
 class LearningPathDetailView(generics.RetrieveAPIView):
@@ -143,7 +176,18 @@ class LearningPathDetailView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
     def get_queryset(self):
-        return LearningPath.objects.filter(status='published').select_related('instructor').prefetch_related('sections')
+        return LearningPath.objects.filter(status='published').select_related('instructor').prefetch_related(
+            'sections'
+        ).with_user_progress(self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        progress = next(iter(getattr(instance, 'user_progress_list', [])), None)
+        context = self.get_serializer_context()
+        # Every section's is_completed is answered from this set
+        context['completed_section_ids'] = progress.completed_section_ids() if progress else set()
+        serializer = self.get_serializer_class()(instance, context=context)
+        return Response(serializer.data)
 
 
 class LearningPathEnrollView(APIView):
@@ -206,7 +250,9 @@ class MarkSectionCompleteView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, section_id):
-        section = get_object_or_404(LearningSection, id=section_id, is_active=True)
+        section = get_object_or_404(
+            LearningSection.objects.select_related('learning_path'), id=section_id, is_active=True
+        )
 
         try:
             progress = UserLearningProgress.objects.get(
@@ -219,10 +265,7 @@ class MarkSectionCompleteView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Add section to completed sections
-        progress.completed_sections.add(section)
-        progress.current_section = section
-        progress.update_progress()
+        progress.complete_section(section)
 
         return Response({
             'detail': 'Section marked as complete',
@@ -230,6 +273,18 @@ class MarkSectionCompleteView(APIView):
         })
 
 
+class SectionDownloadView(PDFDownloadMixin, APIView):
+    """Download a learning section's PDF"""
+    permission_classes = [IsAuthenticated]
+    counter = section_downloads
+
+    def get(self, request, section_id):
+        section = get_object_or_404(
+            LearningSection, id=section_id, is_active=True, learning_path__status='published'
+        )
+        return self.download(request, section)
+
+
 class UserLearningProgressListView(generics.ListAPIView):
     """Get user's learning progress"""
     serializer_class = UserLearningProgressSerializer
@@ -243,7 +298,7 @@ class UserLearningProgressListView(generics.ListAPIView):
     def get_queryset(self):
         return UserLearningProgress.objects.filter(
             user=self.request.user
-        ).select_related('learning_path', 'current_section')
+        ).select_related('learning_path__instructor').with_section_count()
 
 
 # Comment Views
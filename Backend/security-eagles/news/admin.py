@@ -3,7 +3,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
 from django.db.models import Count
-from .models import News, NewsImage, NewsCategory, NewsComment, NewsLike, NewsView
+from .models import News, NewsImage, NewsCategory, NewsComment, NewsLike, NewsView, NewsDailyStats
 
 class NewsImageInline(admin.TabularInline):
     """Inline admin for news images"""
@@ -56,7 +56,7 @@ class NewsAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = (
         'created_by', 'created_at', 'updated_at', 'views', 'likes',
-        'reading_time', 'view_link'
+        'word_count', 'reading_time', 'view_link'
     )
     inlines = [NewsImageInline, NewsCommentInline]
 
@@ -81,7 +81,7 @@ class NewsAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Statistics', {
-            'fields': ('views', 'likes', 'reading_time'),
+            'fields': ('views', 'likes', 'word_count', 'reading_time'),
             'classes': ('collapse',)
         }),
         ('System Information', {
@@ -218,3 +218,13 @@ class NewsViewAdmin(admin.ModelAdmin):
 
     def has_change_permission(self, request, obj=None):
         return False  # Don't allow editing of view records
+
+@admin.register(NewsDailyStats)
+class NewsDailyStatsAdmin(admin.ModelAdmin):
+    """Admin interface for daily news rollups (analytics)"""
+    list_display = ('date', 'views', 'likes')
+    date_hierarchy = 'date'
+    readonly_fields = ('date', 'views', 'likes')
+
+    def has_add_permission(self, request):
+        return False  # Rollups are maintained by the views
@@ -0,0 +1,90 @@
+"""
+Cached analytics snapshot for the news admin dashboard.
+
+The snapshot is computed with a handful of aggregate queries, kept in the
+cache for ANALYTICS_CACHE_TTL seconds and dropped whenever an article or
+category changes (see news/signals.py).
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import News, NewsCategory, NewsDailyStats
+
+ANALYTICS_CACHE_KEY = 'news:analytics:snapshot'
+ANALYTICS_CACHE_TTL = 300
+TIME_SERIES_DAYS = 30
+
+ARTICLE_SUMMARY_FIELDS = (
+    'id', 'title', 'slug', 'status', 'author', 'views', 'likes',
+    'published_at', 'created_at', 'category__name', 'category__color',
+)
+
+
+def _article_summaries(queryset):
+    """Flat rows for dashboard tables, without per-article serializer queries"""
+    return [
+        {
+            'id': row['id'],
+            'title': row['title'],
+            'slug': row['slug'],
+            'status': row['status'],
+            'author': row['author'],
+            'views': row['views'],
+            'likes': row['likes'],
+            'published_at': row['published_at'],
+            'created_at': row['created_at'],
+            'category_name': row['category__name'],
+            'category_color': row['category__color'],
+        }
+        for row in queryset.values(*ARTICLE_SUMMARY_FIELDS)
+    ]
+
+
+def compute_analytics_snapshot():
+    """Compute the dashboard payload from the database"""
+    totals = News.objects.aggregate(
+        total_news=Count('id'),
+        published_news=Count('id', filter=Q(status='published')),
+        draft_news=Count('id', filter=Q(status='draft')),
+        total_views=Sum('views'),
+        total_likes=Sum('likes'),
+    )
+
+    top_viewed = News.objects.filter(status='published').order_by('-views')[:10]
+    recent_news = News.objects.order_by('-created_at')[:10]
+
+    category_stats = NewsCategory.objects.annotate(
+        news_count=Count('news_articles')
+    ).values('name', 'news_count')
+
+    since = timezone.localdate() - timedelta(days=TIME_SERIES_DAYS - 1)
+    daily = NewsDailyStats.objects.filter(date__gte=since).order_by('date').values('date', 'views', 'likes')
+
+    return {
+        'total_news': totals['total_news'],
+        'published_news': totals['published_news'],
+        'draft_news': totals['draft_news'],
+        'total_views': totals['total_views'] or 0,
+        'total_likes': totals['total_likes'] or 0,
+        'top_viewed_articles': _article_summaries(top_viewed),
+        'recent_articles': _article_summaries(recent_news),
+        'category_stats': list(category_stats),
+        'daily_stats': list(daily),
+        'generated_at': timezone.now(),
+    }
+
+
+def get_analytics_snapshot():
+    """Return the cached snapshot, computing it on a cache miss"""
+    snapshot = cache.get(ANALYTICS_CACHE_KEY)
+    if snapshot is None:
+        snapshot = compute_analytics_snapshot()
+        cache.set(ANALYTICS_CACHE_KEY, snapshot, ANALYTICS_CACHE_TTL)
+    return snapshot
+
+
+def invalidate_analytics_snapshot():
+    cache.delete(ANALYTICS_CACHE_KEY)
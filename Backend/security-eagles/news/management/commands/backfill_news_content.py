@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Backfill word count, reading time and rendered HTML for news articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows written per bulk update')
+        parser.add_argument('--missing-only', action='store_true', help='Only process articles without rendered HTML')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = News.objects.only('id', 'content').order_by('id')
+        if options['missing_only']:
+            queryset = queryset.filter(content_html='')
+
+        batch = []
+        updated = 0
+        for news in queryset.iterator(chunk_size=batch_size):
+            news.refresh_content_metrics()
+            batch.append(news)
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+
+        if batch:
+            updated += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled content metrics for {updated} articles'))
+
+    def _flush(self, batch):
+        News.objects.bulk_update(batch, ['content_html', 'word_count', 'reading_time'])
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, help_text='Rendered HTML of the content'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Estimated reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
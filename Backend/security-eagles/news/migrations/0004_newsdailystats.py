@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:33
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def seed_daily_stats(apps, schema_editor):
+    """Build rollups for past days from existing view and like records"""
+    NewsView = apps.get_model('news', 'NewsView')
+    NewsLike = apps.get_model('news', 'NewsLike')
+    NewsDailyStats = apps.get_model('news', 'NewsDailyStats')
+
+    rollups = {}
+    for row in NewsView.objects.annotate(day=TruncDate('created_at')).values('day').annotate(total=Count('id')):
+        rollups.setdefault(row['day'], {'views': 0, 'likes': 0})['views'] = row['total']
+    for row in NewsLike.objects.annotate(day=TruncDate('created_at')).values('day').annotate(total=Count('id')):
+        rollups.setdefault(row['day'], {'views': 0, 'likes': 0})['likes'] = row['total']
+
+    NewsDailyStats.objects.bulk_create(
+        [NewsDailyStats(date=day, **counts) for day, counts in rollups.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('likes', models.IntegerField(default=0, help_text='Net likes (likes minus unlikes) on this day')),
+            ],
+            options={
+                'verbose_name': 'News Daily Stats',
+                'verbose_name_plural': 'News Daily Stats',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.RunPython(seed_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,30 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.postgres.fields import ArrayField
 from django.conf import settings
 from django.utils import timezone
 from django.urls import reverse
 from django.utils.text import slugify
+from django.utils.html import escape, linebreaks
+
+from core.counters import BufferedCounter
+from core.images import register_renditions
+from core.slugs import save_with_unique_slug
+
+try:
+    import markdown
+except ImportError:  # optional dependency, fall back to plain paragraphs
+    markdown = None
+
+WORDS_PER_MINUTE = 200
+
+
+def render_markdown(text):
+    """Render article markdown to HTML, or escaped paragraphs when markdown is unavailable"""
+    if not text:
+        return ''
+    if markdown is not None:
+        return markdown.markdown(text, extensions=['extra', 'sane_lists'])
+    return linebreaks(escape(text))
 
 class NewsCategory(models.Model):
     """Categories for organizing news articles"""
@@ -56,6 +77,11 @@ class News(models.Model):
     content = models.TextField(help_text="Full article content (supports markdown)")
     excerpt = models.TextField(max_length=300, blank=True, help_text="Auto-generated or custom excerpt")
 
+    # Precomputed from content on save (see refresh_content_metrics)
+    content_html = models.TextField(blank=True, editable=False, help_text="Rendered HTML of the content")
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=1, editable=False, help_text="Estimated reading time in minutes")
+
     # Categorization
     category = models.ForeignKey(NewsCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='news_articles')
     tags = ArrayField(
@@ -96,19 +122,23 @@ class News(models.Model):
         ]
 
     def save(self, *args, **kwargs):
-        # Auto-generate slug from title
-        if not self.slug:
-            self.slug = slugify(self.title)
-
         # Auto-generate excerpt if not provided
         if not self.excerpt and self.summary:
             self.excerpt = self.summary[:297] + "..." if len(self.summary) > 300 else self.summary
 
+        # Keep derived content fields in sync unless this is a partial save that skips content
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.refresh_content_metrics()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_html', 'word_count', 'reading_time'}
+
         # Set published_at when status changes to published
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
 
-        super().save(*args, **kwargs)
+        # Auto-generate a unique slug from title
+        save_with_unique_slug(self, super().save, self.title, *args, **kwargs)
 
     def increment_views(self):
         """Increment view count atomically"""
@@ -125,11 +155,12 @@ class News(models.Model):
         """Check if article is published"""
         return self.status == 'published' and self.published_at is not None
 
-    @property
-    def reading_time(self):
-        """Estimate reading time in minutes"""
-        word_count = len(self.content.split())
-        return max(1, word_count // 200)  # Assuming 200 words per minute
+    def refresh_content_metrics(self):
+        """Recompute word count, reading time and rendered HTML from content"""
+        content = self.content or ''
+        self.word_count = len(content.split())
+        self.reading_time = max(1, self.word_count // WORDS_PER_MINUTE)
+        self.content_html = render_markdown(content)
 
     def get_absolute_url(self):
         """Get the absolute URL for this news article"""
@@ -142,6 +173,7 @@ class NewsImage(models.Model):
     """Enhanced model for news article images"""
     news = models.ForeignKey(News, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='news_images/%Y/%m/', help_text="Upload news article images")
+    image_renditions = models.JSONField(blank=True, default=dict, editable=False, help_text="Generated size variants and WebP copies")
     caption = models.CharField(max_length=255, blank=True, help_text="Image caption")
     alt_text = models.CharField(max_length=255, blank=True, help_text="Alt text for accessibility")
     is_featured = models.BooleanField(default=False, help_text="Use as featured image")
@@ -207,3 +239,64 @@ class NewsView(models.Model):
     def __str__(self):
         user_info = self.user.username if self.user else self.ip_address
         return f"View by {user_info} on {self.news.title}"
+
+
+class NewsDailyStats(models.Model):
+    """
+    Site-wide daily rollup of news views and likes for analytics time series.
+    Views and likes are recorded through per-process buffers, so the day's
+    single row takes one UPDATE per flush instead of one per request.
+    """
+    date = models.DateField(unique=True)
+    views = models.PositiveIntegerField(default=0)
+    likes = models.IntegerField(default=0, help_text="Net likes (likes minus unlikes) on this day")
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = "News Daily Stats"
+        verbose_name_plural = "News Daily Stats"
+
+    def __str__(self):
+        return f"{self.date}: {self.views} views, {self.likes} likes"
+
+    @classmethod
+    def record(cls, views=0, likes=0):
+        """Buffer views and likes for today; written within COUNTER_FLUSH_SECONDS"""
+        today = timezone.localdate()
+        if views:
+            daily_views.increment(today, views)
+        if likes:
+            daily_likes.increment(today, likes)
+
+    @classmethod
+    def increment(cls, views=0, likes=0, date=None):
+        """Add to a day's counters (today by default) with a single UPDATE, creating the row on first use"""
+        date = date or timezone.localdate()
+        changes = {'views': models.F('views') + views, 'likes': models.F('likes') + likes}
+        if cls.objects.filter(date=date).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(date=date, views=views, likes=likes)
+        except IntegrityError:
+            # Another process created the day's row first
+            cls.objects.filter(date=date).update(**changes)
+
+
+class DailyStatsCounter(BufferedCounter):
+    """Buffered increments of one NewsDailyStats column, keyed by date"""
+
+    def __init__(self, field):
+        super().__init__(NewsDailyStats, field)
+
+    def write(self, dates, amount):
+        for date in dates:
+            NewsDailyStats.increment(date=date, **{self.field: amount})
+        return len(dates)
+
+
+daily_views = DailyStatsCounter('views')
+daily_likes = DailyStatsCounter('likes')
+
+
+register_renditions(NewsImage, 'image', 'image_renditions')
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from core.images import build_srcset
 from .models import News, NewsImage, NewsCategory, NewsComment, NewsLike, NewsView
 
 User = get_user_model()
@@ -18,10 +19,11 @@ class NewsCategorySerializer(serializers.ModelSerializer):
 class NewsImageSerializer(serializers.ModelSerializer):
     """Enhanced serializer for news images"""
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = NewsImage
-        fields = ['id', 'image_url', 'caption', 'alt_text', 'is_featured', 'order']
+        fields = ['id', 'image_url', 'image_srcset', 'caption', 'alt_text', 'is_featured', 'order']
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -29,6 +31,9 @@ class NewsImageSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url)
         return obj.image.url if obj.image else None
 
+    def get_image_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.image_renditions, obj.image)
+
 class NewsCommentSerializer(serializers.ModelSerializer):
     """Serializer for news comments"""
     author_name = serializers.CharField(source='author.username', read_only=True)
@@ -105,10 +110,10 @@ class NewsDetailSerializer(serializers.ModelSerializer):
         model = News
         fields = [
             'id', 'title', 'slug', 'subtitle', 'author', 'summary', 'content',
-            'excerpt', 'category', 'tags', 'status', 'priority', 'is_featured',
+            'content_html', 'excerpt', 'category', 'tags', 'status', 'priority', 'is_featured',
             'is_breaking', 'published_at', 'created_at', 'updated_at', 'views',
             'likes', 'meta_description', 'meta_keywords', 'images', 'comments',
-            'author_name', 'reading_time', 'is_liked_by_user', 'comment_count',
+            'author_name', 'word_count', 'reading_time', 'is_liked_by_user', 'comment_count',
             'like_count'
         ]
 
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .analytics import invalidate_analytics_snapshot
+from .models import News, NewsCategory
+
+
+@receiver([post_save, post_delete], sender=News)
+@receiver([post_save, post_delete], sender=NewsCategory)
+def drop_analytics_snapshot(sender, **kwargs):
+    """Article or category changes make the cached dashboard stale"""
+    invalidate_analytics_snapshot()
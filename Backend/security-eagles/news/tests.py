@@ -1,3 +1,54 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from .models import News, NewsDailyStats, daily_likes, daily_views
+
+
+class NewsSlugTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='editor', password='pass')
+
+    def create(self, title):
+        return News.objects.create(title=title, summary='s', content='c', author='a', created_by=self.user)
+
+    def test_slug_from_title(self):
+        self.assertEqual(self.create('Hello World').slug, 'hello-world')
+
+    def test_colliding_titles_get_suffixes(self):
+        self.create('Hello')
+        self.assertEqual(self.create('Hello').slug, 'hello-1')
+        self.assertEqual(self.create('Hello').slug, 'hello-2')
+
+    def test_partial_saves_keep_slug(self):
+        news = self.create('Hello')
+        news.increment_views()
+        news.refresh_from_db()
+        self.assertEqual((news.slug, news.views), ('hello', 1))
+
+
+class NewsDailyStatsTests(TestCase):
+
+    def flush(self):
+        daily_views.flush()
+        daily_likes.flush()
+
+    def test_recorded_counts_are_written_on_flush(self):
+        self.flush()
+        NewsDailyStats.record(views=1)
+        NewsDailyStats.record(views=1)
+        NewsDailyStats.record(likes=1)
+        NewsDailyStats.record(likes=-1)
+        NewsDailyStats.record(likes=1)
+        self.assertFalse(NewsDailyStats.objects.exists())
+
+        self.flush()
+        stats = NewsDailyStats.objects.get(date=timezone.localdate())
+        self.assertEqual((stats.views, stats.likes), (2, 1))
+
+        NewsDailyStats.record(views=3)
+        self.flush()
+        stats.refresh_from_db()
+        self.assertEqual(stats.views, 5)
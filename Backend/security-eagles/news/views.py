@@ -9,17 +9,23 @@ from django.db.models import Q, F
 from django.http import Http404
 from datetime import timedelta
 
-from .models import News, NewsCategory, NewsComment, NewsLike, NewsView
+from .models import News, NewsCategory, NewsComment, NewsLike, NewsView, NewsDailyStats
+from .analytics import get_analytics_snapshot, invalidate_analytics_snapshot
 from .serializers import (
     NewsPreviewSerializer, NewsDetailSerializer, NewsCreateUpdateSerializer,
     NewsAdminSerializer, NewsCategorySerializer, NewsCommentSerializer,
     NewsCommentCreateSerializer, NewsLikeSerializer, NewsImageUploadSerializer
 )
 from core.permissions import IsAdminOrReadOnly
+from core.pagination import KeysetPaginationMixin
+
+# Article bodies are never needed by preview serializers
+PREVIEW_DEFERRED_FIELDS = ('content', 'content_html')
 
 # Custom pagination classes
-class NewsPreviewPagination(pagination.PageNumberPagination):
-    """Pagination for news previews"""
+class NewsPreviewPagination(KeysetPaginationMixin, pagination.PageNumberPagination):
+    """Pagination for news previews (page numbers, or keyset with ?cursor=)"""
+    cursor_ordering = ('-published_at', '-id')
     page_size = 12
     page_size_query_param = 'page_size'
     max_page_size = 50
@@ -51,7 +57,7 @@ class NewsPreviewListView(generics.ListAPIView):
     ordering = ['-published_at']
 
     def get_queryset(self):
-        queryset = News.objects.filter(status='published').select_related('category', 'created_by').prefetch_related('images', 'user_likes', 'comments')
+        queryset = News.objects.filter(status='published').defer(*PREVIEW_DEFERRED_FIELDS).select_related('category', 'created_by').prefetch_related('images', 'user_likes', 'comments')
 
         # Filter by category slug if provided
         category_slug = self.request.query_params.get('category_slug')
@@ -97,6 +103,7 @@ class NewsDetailView(generics.RetrieveAPIView):
 
         # Increment view count
         News.objects.filter(pk=instance.pk).update(views=F('views') + 1)
+        NewsDailyStats.record(views=1)
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -140,7 +147,7 @@ class FeaturedNewsListView(generics.ListAPIView):
         return News.objects.filter(
             status='published',
             is_featured=True
-        ).select_related('category', 'created_by').prefetch_related('images')
+        ).defer(*PREVIEW_DEFERRED_FIELDS).select_related('category', 'created_by').prefetch_related('images')
 
 class BreakingNewsListView(generics.ListAPIView):
     """Get breaking news articles - Authentication required"""
@@ -151,7 +158,7 @@ class BreakingNewsListView(generics.ListAPIView):
         return News.objects.filter(
             status='published',
             is_breaking=True
-        ).select_related('category', 'created_by').prefetch_related('images')[:5]
+        ).defer(*PREVIEW_DEFERRED_FIELDS).select_related('category', 'created_by').prefetch_related('images')[:5]
 
 class LatestNewsListView(generics.ListAPIView):
     """Get latest news from last few days - Authentication required"""
@@ -165,7 +172,7 @@ class LatestNewsListView(generics.ListAPIView):
         return News.objects.filter(
             status='published',
             published_at__gte=cutoff_date
-        ).select_related('category', 'created_by').prefetch_related('images')
+        ).defer(*PREVIEW_DEFERRED_FIELDS).select_related('category', 'created_by').prefetch_related('images')
 
 # User Interaction Views (Require Authentication)
 class NewsLikeToggleView(APIView):
@@ -183,10 +190,12 @@ class NewsLikeToggleView(APIView):
             # Unlike - remove the like
             like.delete()
             News.objects.filter(pk=news.pk).update(likes=F('likes') - 1)
+            NewsDailyStats.record(likes=-1)
             return Response({'liked': False, 'message': 'News unliked'})
         else:
             # Like - increment counter
             News.objects.filter(pk=news.pk).update(likes=F('likes') + 1)
+            NewsDailyStats.record(likes=1)
             return Response({'liked': True, 'message': 'News liked'})
 
 class NewsCommentListCreateView(generics.ListCreateAPIView):
@@ -292,42 +301,13 @@ class NewsImageUploadView(APIView):
 
 # Analytics Views (Admin Only)
 class NewsAnalyticsView(APIView):
-    """Admin endpoint for news analytics"""
+    """Admin endpoint for news analytics, served from a cached snapshot"""
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
 
     def get(self, request):
-        from django.db.models import Count, Sum
-
-        # Basic stats
-        total_news = News.objects.count()
-        published_news = News.objects.filter(status='published').count()
-        draft_news = News.objects.filter(status='draft').count()
-        total_views = News.objects.aggregate(Sum('views'))['views__sum'] or 0
-        total_likes = News.objects.aggregate(Sum('likes'))['likes__sum'] or 0
-
-        # Top viewed articles
-        top_viewed = News.objects.filter(status='published').order_by('-views')[:10]
-        top_viewed_data = NewsPreviewSerializer(top_viewed, many=True, context={'request': request}).data
-
-        # Recent activity
-        recent_news = News.objects.order_by('-created_at')[:10]
-        recent_data = NewsPreviewSerializer(recent_news, many=True, context={'request': request}).data
-
-        # Category stats
-        category_stats = NewsCategory.objects.annotate(
-            news_count=Count('news_articles')
-        ).values('name', 'news_count')
-
-        return Response({
-            'total_news': total_news,
-            'published_news': published_news,
-            'draft_news': draft_news,
-            'total_views': total_views,
-            'total_likes': total_likes,
-            'top_viewed_articles': top_viewed_data,
-            'recent_articles': recent_data,
-            'category_stats': list(category_stats)
-        })
+        if request.query_params.get('refresh') == 'true':
+            invalidate_analytics_snapshot()
+        return Response(get_analytics_snapshot())
 
 # Utility Views
 @api_view(['GET'])
@@ -344,7 +324,7 @@ def news_search(request):
         Q(content__icontains=query) |
         Q(tags__overlap=[query]),
         status='published'
-    ).distinct()[:20]
+    ).defer(*PREVIEW_DEFERRED_FIELDS).distinct()[:20]
 
     serializer = NewsPreviewSerializer(news_results, many=True, context={'request': request})
     return Response({'results': serializer.data})
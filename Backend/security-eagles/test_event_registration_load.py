@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Load test for event registration capacity.
+
+Creates a capacity-limited event and a batch of users, then fires
+concurrent registration requests (each one sent twice to exercise
+idempotent retries) and a round of unregistrations at the running server.
+Afterwards the database is checked: confirmed registrations never exceed
+max_attendees, the seat counter matches the rows, and the waitlist was
+promoted into freed seats.
+
+Run from Backend/security-eagles with the dev server on localhost:8000:
+    python test_event_registration_load.py --users 200 --capacity 25
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import django
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.utils import timezone
+
+from core.models import User
+from events.models import Event, EventRegistration
+
+BASE_URL = "http://localhost:8000/api"
+PASSWORD = 'loadtest123'
+
+def create_fixtures(user_count, capacity):
+    """Create (or reuse) load-test users and a fresh capacity-limited event"""
+    users = []
+    for i in range(user_count):
+        user, created = User.objects.get_or_create(
+            username=f'loadtest{i}',
+            defaults={'email': f'loadtest{i}@example.com'}
+        )
+        if created:
+            user.set_password(PASSWORD)
+            user.save()
+        users.append(user)
+
+    # Kept apart from the attendees so it never registers itself
+    organizer, _ = User.objects.get_or_create(
+        username='loadtest-organizer',
+        defaults={'email': 'loadtest-organizer@example.com'}
+    )
+
+    now = timezone.now()
+    event = Event.objects.create(
+        title=f'Registration Load Test {now:%Y%m%d%H%M%S}',
+        description='Capacity load test',
+        event_type='webinar',
+        status='published',
+        platforms=['zoom'],
+        organizer='Load Test',
+        start_time=now + timedelta(days=7),
+        end_time=now + timedelta(days=7, hours=2),
+        max_attendees=capacity,
+        registration_required=True,
+        waitlist_enabled=True,
+        created_by=organizer,
+    )
+    return users, event
+
+def get_jwt_token(username):
+    response = requests.post(f'{BASE_URL}/auth/login/', json={'username': username, 'password': PASSWORD})
+    if response.status_code == 200:
+        return response.json()['access']
+    print(f"Login failed for {username}: {response.status_code} - {response.text}")
+    return None
+
+def register(slug, token):
+    """Register, then retry the same request as a client would after a timeout"""
+    headers = {'Authorization': f'Bearer {token}'}
+    first = requests.post(f'{BASE_URL}/events/{slug}/register/', json={}, headers=headers)
+    retry = requests.post(f'{BASE_URL}/events/{slug}/register/', json={}, headers=headers)
+    return first, retry
+
+def unregister(slug, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    return requests.patch(f'{BASE_URL}/events/{slug}/unregister/', headers=headers)
+
+def check_invariants(event):
+    event.refresh_from_db()
+    confirmed = EventRegistration.objects.filter(event=event, is_canceled=False, is_waitlisted=False).count()
+    waitlisted = EventRegistration.objects.filter(event=event, is_canceled=False, is_waitlisted=True).count()
+
+    print(f"Seat counter: {event.active_registrations}, confirmed rows: {confirmed}, "
+          f"waitlisted: {waitlisted}, capacity: {event.max_attendees}")
+
+    ok = True
+    if confirmed > event.max_attendees:
+        print("FAIL: event is oversold")
+        ok = False
+    if event.active_registrations != confirmed:
+        print("FAIL: seat counter does not match registrations")
+        ok = False
+    if waitlisted and confirmed < event.max_attendees:
+        print("FAIL: free seats left while registrations are waitlisted")
+        ok = False
+    return ok
+
+def run_registration_load(user_count, capacity, workers, cancel_count):
+    print("=" * 60)
+    print("EVENT REGISTRATION LOAD TEST")
+    print("=" * 60)
+
+    users, event = create_fixtures(user_count, capacity)
+    print(f"\nEvent: {event.slug} (capacity {capacity}), users: {user_count}, workers: {workers}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = pool.map(get_jwt_token, [u.username for u in users])
+        # Keep each token paired with its user; a failed login must not shift the pairs
+        user_tokens = [(user, token) for user, token in zip(users, fetched) if token]
+    tokens = [token for _, token in user_tokens]
+
+    # 1. Everyone registers at once, each request retried
+    print("\n1. Concurrent registrations")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda token: register(event.slug, token), tokens))
+    elapsed = time.monotonic() - started
+
+    statuses = {}
+    mismatched_retries = 0
+    for first, retry in results:
+        statuses[first.status_code] = statuses.get(first.status_code, 0) + 1
+        if first.status_code == 201 and (retry.status_code != 200 or retry.json()['id'] != first.json()['id']):
+            mismatched_retries += 1
+    print(f"{len(results) * 2} requests in {elapsed:.2f}s, first-attempt statuses: {statuses}")
+    print(f"Retries that did not return the original registration: {mismatched_retries}")
+    ok = check_invariants(event) and mismatched_retries == 0
+
+    # 2. Confirmed attendees cancel concurrently; the waitlist should fill their seats
+    print(f"\n2. Concurrent unregistrations ({cancel_count})")
+    seated_users = set(EventRegistration.objects.filter(
+        event=event, is_canceled=False, is_waitlisted=False
+    ).values_list('user__username', flat=True)[:cancel_count])
+    cancel_tokens = [token for user, token in user_tokens if user.username in seated_users]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        cancels = list(pool.map(lambda token: unregister(event.slug, token), cancel_tokens))
+    print(f"Unregister statuses: {sorted(set(r.status_code for r in cancels))}")
+    ok = check_invariants(event) and ok
+
+    print("\n" + "=" * 60)
+    print("LOAD TEST PASSED" if ok else "LOAD TEST FAILED")
+    print("=" * 60)
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--capacity', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--cancel', type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(0 if run_registration_load(args.users, args.capacity, args.workers, args.cancel) else 1)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from core import uploads
+from core.models import UploadSession
+
 User = get_user_model()
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -8,3 +11,30 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
         read_only_fields = ['id', 'username', 'email']
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+    file = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'content_type', 'total_size', 'received_size', 'chunk_size', 'status', 'error', 'file', 'created_at']
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        return uploads.CHUNK_SIZE
+
+    def get_file(self, obj):
+        stored = obj.stored_file
+        if not stored:
+            return None
+        request = self.context.get('request')
+        url = stored.file.url
+        return {
+            'id': stored.id,
+            'sha256': stored.sha256,
+            'size': stored.size,
+            'content_type': stored.content_type,
+            'url': request.build_absolute_uri(url) if request else url,
+            'text_status': stored.text_status,
+        }
@@ -1,6 +1,12 @@
 from django.urls import path
-from .views import UserProfileView
+from .views import (
+    UserProfileView, UploadSessionCreateView, UploadSessionDetailView, UploadChunkView, UploadCompleteView
+)
 
 urlpatterns = [
     path('profile/', UserProfileView.as_view(), name='user-profile'),
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-create'),
+    path('uploads/<uuid:pk>/', UploadSessionDetailView.as_view(), name='upload-detail'),
+    path('uploads/<uuid:pk>/chunk/', UploadChunkView.as_view(), name='upload-chunk'),
+    path('uploads/<uuid:pk>/complete/', UploadCompleteView.as_view(), name='upload-complete'),
 ]
@@ -1,9 +1,16 @@
 
+import io
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 from django.contrib.auth import get_user_model
-from .serializers import UserProfileSerializer
+from django.shortcuts import get_object_or_404
+
+from core import uploads
+from core.models import UploadSession
+from .serializers import UserProfileSerializer, UploadSessionSerializer
 
 User = get_user_model()
 
@@ -20,3 +27,68 @@ class UserProfileView(APIView):
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=400)
+
+
+# Chunked resume/CV uploads
+class UploadSessionCreateView(APIView):
+    """Start a chunked upload: {"filename": "cv.pdf", "size": 5242880}"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            total_size = int(request.data.get('size'))
+        except (TypeError, ValueError):
+            return Response({'detail': 'size must be the file size in bytes.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = uploads.start(request.user, request.data.get('filename', ''), total_size)
+        except uploads.UploadError as exc:
+            return Response({'detail': exc.detail}, status=exc.status_code)
+        serializer = UploadSessionSerializer(session, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class UploadSessionDetailView(APIView):
+    """Upload progress; a client resuming after a dropped connection continues from received_size"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        session = get_object_or_404(UploadSession.objects.select_related('stored_file'), pk=pk, user=request.user)
+        return Response(UploadSessionSerializer(session, context={'request': request}).data)
+
+class UploadChunkView(APIView):
+    """Append one chunk; the raw body is the chunk, placed by its Content-Range header"""
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, pk):
+        content_range = request.headers.get('Content-Range')
+        if not content_range:
+            return Response({'detail': 'Content-Range header is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Read straight from the request stream rather than request.data, so the chunk isn't buffered
+        stream = request.stream or io.BytesIO()
+        try:
+            session = uploads.append_chunk(pk, request.user, content_range, stream)
+        except uploads.UploadError as exc:
+            received = UploadSession.objects.filter(pk=pk, user=request.user).values_list(
+                'received_size', flat=True
+            ).first()
+            return Response({'detail': exc.detail, 'received_size': received}, status=exc.status_code)
+        return Response(UploadSessionSerializer(session, context={'request': request}).data)
+
+class UploadCompleteView(APIView):
+    """Assemble the received chunks; {"attach_as": "cv"} also makes the file the user's CV"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        try:
+            session, deduplicated = uploads.complete(pk, request.user)
+        except uploads.UploadError as exc:
+            return Response({'detail': exc.detail}, status=exc.status_code)
+
+        if request.data.get('attach_as') == 'cv':
+            request.user.cv = session.stored_file.file.name
+            request.user.save(update_fields=['cv'])
+
+        data = UploadSessionSerializer(session, context={'request': request}).data
+        data['deduplicated'] = deduplicated
+        return Response(data)